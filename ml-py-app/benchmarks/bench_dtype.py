@@ -0,0 +1,84 @@
+"""
+float32 与 float64 数据路径的峰值内存、耗时和数组复制次数对比
+
+每种类型在独立子进程中运行 预处理 -> 划分 -> 训练 -> 预测 的完整流程，
+原始数据在测量基线之前生成，峰值内存只包含流水线本身的分配。
+复制次数和大小来自 copy_audit 的记录。
+生成数据时已释放的内存会被分配器复用，行数较少时峰值增量偏低，10M行时接近实际数组大小。
+
+用法:
+    python -m benchmarks.bench_dtype --rows 10000000 --dtypes float32 float64
+"""
+
+import argparse
+import contextlib
+import io
+
+import numpy as np
+
+from benchmarks.common import Timer, current_rss_mb, emit_result, peak_rss_mb, reset_peak_rss, run_isolated
+from src.data.data_processor import PowerGridDataProcessor
+from src.data.synthetic import make_dataset
+from src.models.lgbm_model import LightGBMComplaintPredictor
+from src.utils import copy_audit
+
+TRAIN_PARAMS = {'objective': 'binary', 'n_estimators': 20, 'learning_rate': 0.1,
+                'num_leaves': 31, 'verbose': -1}
+
+
+def run_pipeline(data, dtype):
+    processor = PowerGridDataProcessor(dtype=dtype)
+    model = LightGBMComplaintPredictor()
+    model.set_params(TRAIN_PARAMS)
+    with Timer() as timer:
+        X = processor.preprocess_features(data)
+        y = data[processor.target_column].values
+        X_train, X_test, y_train, y_test = processor.split_data(X, y)
+        del X, y
+        model.train(X_train, y_train, X_test, y_test, processor.feature_columns)
+        del X_train, y_train
+        model.predict(X_test)
+    return model, timer.elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='float32与float64数据路径对比')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--dtypes', nargs='+', choices=['float32', 'float64'], default=['float32', 'float64'])
+    parser.add_argument('--dtype', choices=['float32', 'float64'])
+    args = parser.parse_args()
+
+    if args.dtype is not None:
+        # 子进程：只运行一种类型，峰值内存扣除原始数据生成后的基线
+        data = make_dataset(args.rows, dtype=np.float32)
+        reset_peak_rss()
+        baseline_mb = current_rss_mb()
+        with copy_audit.audit(), contextlib.redirect_stdout(io.StringIO()):
+            model, seconds = run_pipeline(data, np.dtype(args.dtype))
+        summary = copy_audit.summary()
+        emit_result({'seconds': seconds, 'peak_rss_delta_mb': peak_rss_mb() - baseline_mb,
+                     'copies': summary['copies'], 'copy_mb': summary['bytes'] / (1024 * 1024),
+                     'stages': {stage: item['copies'] for stage, item in summary['stages'].items()},
+                     'best_iteration': model.get_best_iteration()})
+        return
+
+    print(f"行数: {args.rows}")
+    print(f"{'dtype':>8} {'seconds':>9} {'peak_delta_mb':>14} {'copies':>7} {'copy_mb':>9} {'best_iter':>10}")
+    results = {}
+    for dtype in args.dtypes:
+        result = run_isolated('benchmarks.bench_dtype', ['--rows', args.rows, '--dtype', dtype])
+        results[dtype] = result
+        print(f"{dtype:>8} {result['seconds']:>9.2f} {result['peak_rss_delta_mb']:>14.1f} {result['copies']:>7} "
+              f"{result['copy_mb']:>9.1f} {result['best_iteration']:>10}")
+    for dtype, result in results.items():
+        stages = ', '.join(f'{stage}={count}' for stage, count in result['stages'].items())
+        print(f"{dtype} 复制: {stages}")
+
+    if {'float32', 'float64'} <= set(results):
+        saved = results['float64']['peak_rss_delta_mb'] - results['float32']['peak_rss_delta_mb']
+        print(f"float32节省峰值内存: {saved:.1f} MB "
+              f"({saved / results['float64']['peak_rss_delta_mb']:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+融合评估与evaluate的耗时对比
+
+evaluate 调用五个sklearn指标和混淆矩阵，只得到一个阈值下的结果；
+evaluate_fused 只排序一次，同时得到所有阈值的曲线和最优阈值。
+另外对比用sklearn分别计算同样内容（单点指标 + precision_recall_curve + roc_curve）的耗时。
+
+用法:
+    python -m benchmarks.bench_evaluate --rows 1000000
+"""
+
+import argparse
+import contextlib
+import io
+
+from sklearn.metrics import precision_recall_curve, roc_curve
+
+from benchmarks.bench_predict_stream import build_model
+from benchmarks.common import Timer
+from src.data.data_processor import PowerGridDataProcessor
+from src.data.synthetic import make_dataset
+from src.models.evaluation import evaluate_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description='融合评估耗时对比')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    model = build_model()
+    # 与build_model相同的样本数据拟合scaler，再转换评估数据
+    processor = PowerGridDataProcessor()
+    processor.fit(processor.generate_sample_data(n_samples=20000))
+    data = make_dataset(args.rows, seed=7)
+    X = processor.transform(data)
+    y = data[processor.target_column].values
+    proba, _ = model.predict(X)
+
+    def best_of(func):
+        elapsed = []
+        for _ in range(args.repeat):
+            with Timer() as timer:
+                func()
+            elapsed.append(timer.elapsed)
+        return min(elapsed)
+
+    def run_evaluate():
+        with contextlib.redirect_stdout(io.StringIO()):
+            model.evaluate(X, y)
+
+    def run_sklearn_curves():
+        model._classification_metrics(y, proba, (proba >= 0.5).astype(int))
+        precision_recall_curve(y, proba)
+        roc_curve(y, proba)
+
+    print(f"行数: {args.rows}")
+    print(f"{'方法':>32} {'耗时(s)':>10}")
+    print(f"{'evaluate（含预测）':>32} {best_of(run_evaluate):>10.3f}")
+    print(f"{'evaluate_fused（含预测）':>32} {best_of(lambda: model.evaluate_fused(X, y)):>10.3f}")
+    print(f"{'sklearn 单点指标 + 曲线（不含预测）':>32} {best_of(run_sklearn_curves):>10.3f}")
+    print(f"{'evaluate_scores（不含预测）':>32} {best_of(lambda: evaluate_scores(y, proba)):>10.3f}")
+
+    fused = evaluate_scores(y, proba)
+    reference = model._classification_metrics(y, proba, (proba >= 0.5).astype(int))
+    max_diff = max(abs(fused['metrics'][name] - reference[name]) for name in reference)
+    print(f"\n与sklearn指标的最大差异: {max_diff:.2e}")
+    print(f"最优阈值 ({fused['objective']}): {fused['best_threshold']:.4f}, "
+          f"F1 {fused['best_metrics']['f1']:.4f}（阈值0.5时 {fused['metrics']['f1']:.4f}）")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+逐行解释的耗时：全部行、只解释高风险行的快速模式、缓存命中，以及不同线程数
+
+用法:
+    python -m benchmarks.bench_explain --rows 100000 --workers 1 4 --min-probability 0.7
+"""
+
+import argparse
+import contextlib
+import io
+
+import numpy as np
+
+from benchmarks.bench_predict_stream import build_model
+from benchmarks.common import Timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='逐行解释耗时测试')
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--min-probability', type=float, default=0.7, help='快速模式的概率阈值')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = build_model()
+    X = np.random.default_rng(42).random((args.rows, len(model.feature_names)))
+
+    with Timer() as timer:
+        model.predict(X)
+    print(f"行数: {args.rows}, 仅预测: {timer.elapsed:.3f} s")
+
+    print(f"{'mode':>10} {'workers':>8} {'explained':>10} {'seconds':>9} {'rows/s':>12}")
+    for n_workers in args.workers:
+        for mode, min_probability in (('full', None), ('fast', args.min_probability)):
+            with Timer() as timer:
+                explanation = model.explain(X, top_k=args.top_k, min_probability=min_probability,
+                                            n_workers=n_workers)
+            print(f"{mode:>10} {n_workers:>8} {int(explanation['explained'].sum()):>10} "
+                  f"{timer.elapsed:>9.3f} {args.rows / timer.elapsed:>12,.0f}")
+
+    # 启用缓存后重复解释同一批数据
+    model.enable_prediction_cache(max_entries=args.rows)
+    for mode in ('cold', 'warm'):
+        with Timer() as timer:
+            model.explain(X, top_k=args.top_k)
+        print(f"{'cache_' + mode:>10} {'-':>8} {args.rows:>10} {timer.elapsed:>9.3f} "
+              f"{args.rows / timer.elapsed:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+扁平数组推理引擎与 Booster.predict 的延迟对比
+
+对不同批大小分别测量两种后端的单次调用延迟，并校验两者输出一致。
+扁平引擎只在单行时逐树遍历并快于 Booster.predict，多行时按层遍历，比 Booster.predict 慢
+
+用法:
+    python -m benchmarks.bench_flat_tree --batch-sizes 1 2 4 8 32 128 1024
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_predict_stream import build_model
+
+
+def measure(func, X, repeat):
+    """
+    测量函数的平均调用延迟（微秒）
+    """
+    func(X)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(X)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='扁平数组推理引擎延迟测试')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 2, 4, 8, 32, 128, 1024])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+    
+    model = build_model()
+    flat_model = model.get_flat_model()
+    print(flat_model)
+    
+    rng = np.random.default_rng(42)
+    X = rng.random((max(args.batch_sizes), len(model.feature_names)))
+    
+    native = model.predict(X, backend='native')[0]
+    flat = model.predict(X, backend='flat')[0]
+    print(f"最大绝对误差: {np.abs(native - flat).max():.2e}")
+    
+    print(f"{'batch':>6} {'native(us)':>12} {'flat(us)':>12} {'加速比':>8}")
+    for batch_size in args.batch_sizes:
+        X_batch = X[:batch_size]
+        repeat = max(10, args.repeat // batch_size)
+        native_us = measure(lambda data: model.predict(data, backend='native'), X_batch, repeat)
+        flat_us = measure(lambda data: model.predict(data, backend='flat'), X_batch, repeat)
+        print(f"{batch_size:>6} {native_us:>12.1f} {flat_us:>12.1f} {native_us / flat_us:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
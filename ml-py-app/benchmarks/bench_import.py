@@ -0,0 +1,129 @@
+"""
+导入耗时和内存基准：检查推理路径是否保持精简
+
+每个场景在独立的 `python -X importtime` 子进程中运行，报告导入耗时
+（importtime输出中顶层模块的累计耗时）、RSS以及加载了哪些重量级依赖。
+--check 时若精简推理场景加载了禁止的依赖则以非零状态退出，可放入CI。
+
+用法:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --model models/lgbm_complaint_predictor.lgbm --check
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import PROJECT_ROOT
+
+# 推理路径不应加载的依赖
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'matplotlib', 'seaborn', 'joblib', 'lightgbm')
+
+# 精简推理场景允许的依赖（native后端需要lightgbm及其自身的依赖）
+ALLOWED = {
+    'inference_module': set(),
+    'inference_flat': set(),
+    'inference_native': {'lightgbm', 'pandas', 'sklearn', 'scipy', 'joblib'},
+}
+
+SCENARIO_CODE = {
+    'inference_module': 'import src.models.inference',
+    'inference_flat': 'from src.models import inference; inference.load(MODEL, backend="flat")',
+    'inference_native': 'from src.models import inference; inference.load(MODEL, backend="native")',
+    'lgbm_model': 'import src.models.lgbm_model',
+    'utils': 'import src.utils.utils',
+    'data_processor': 'import src.data.data_processor',
+}
+
+_REPORT = '''
+import json, sys
+rss = 0
+with open('/proc/self/status') as f:
+    for line in f:
+        if line.startswith('VmRSS:'):
+            rss = int(line.split()[1]) / 1024
+print('IMPORT_RESULT ' + json.dumps({'rss_mb': rss,
+      'loaded': [m for m in HEAVY if m in sys.modules]}))
+'''
+
+
+def run_scenario(name, model_path):
+    """
+    在 -X importtime 子进程中运行场景
+
+    Returns:
+        Dict: 导入耗时（毫秒）、RSS（MB）和已加载的重量级依赖
+    """
+    code = f'MODEL = {model_path!r}\nHEAVY = {HEAVY_MODULES!r}\n' + SCENARIO_CODE[name] + '\n' + _REPORT
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                               cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+
+    # importtime输出格式: "import time: self [us] | cumulative | imported package"，
+    # 顶层导入（无缩进）的累计耗时之和即为总导入耗时
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| (\S.*)$', line)
+        if match and not match.group(2).startswith(' '):
+            total_us += int(match.group(1))
+
+    for line in completed.stdout.splitlines():
+        if line.startswith('IMPORT_RESULT '):
+            result = json.loads(line[len('IMPORT_RESULT '):])
+            result['import_ms'] = total_us / 1000
+            return result
+    raise RuntimeError(f"子进程未输出结果: {completed.stderr[-2000:]}")
+
+
+def build_native_model(model_dir):
+    """
+    训练一个小模型并以原生格式保存，供加载场景使用
+    """
+    from src.data.data_processor import PowerGridDataProcessor
+    from src.models.lgbm_model import LightGBMComplaintPredictor
+
+    processor = PowerGridDataProcessor()
+    data = processor.generate_sample_data(n_samples=5000)
+    X = processor.preprocess_features(data)
+    y = data[processor.target_column].values
+    model = LightGBMComplaintPredictor()
+    model.set_params({'objective': 'binary', 'n_estimators': 100, 'verbose': -1})
+    model.train(X, y, feature_names=processor.feature_columns)
+    model.save_model(model_dir, scaler_state=processor.get_scaler_state())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='导入耗时和内存基准')
+    parser.add_argument('--model', help='原生格式模型目录，默认临时训练一个')
+    parser.add_argument('--check', action='store_true', help='精简推理场景加载了禁止的依赖时失败')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = args.model
+        if model_path is None:
+            model_path = os.path.join(tmp_dir, 'model.lgbm')
+            build_native_model(model_path)
+
+        print(f"\n{'场景':>18} {'导入(ms)':>10} {'RSS(MB)':>9}  已加载的重量级依赖")
+        violations = []
+        for name in SCENARIO_CODE:
+            result = run_scenario(name, model_path)
+            print(f"{name:>18} {result['import_ms']:>10.1f} {result['rss_mb']:>9.1f}  "
+                  f"{', '.join(result['loaded']) or '-'}")
+            if name in ALLOWED:
+                extra = set(result['loaded']) - ALLOWED[name]
+                if extra:
+                    violations.append((name, sorted(extra)))
+
+    if violations:
+        for name, modules in violations:
+            print(f"{name} 加载了不应加载的依赖: {', '.join(modules)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+load_data 流式读取与整表读取的峰值内存对比
+
+用法:
+    python -m benchmarks.bench_load_data --rows 1000000 --chunksize 100000
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import Timer, emit_result, peak_rss_mb, run_isolated
+from src.data.data_processor import PowerGridDataProcessor
+
+
+def run_full(file_path):
+    """
+    现有路径：整表读取、清洗、预处理
+    """
+    processor = PowerGridDataProcessor()
+    with Timer() as timer:
+        data = processor.load_data(file_path)
+        cleaned = processor.clean_data(data)
+        features = processor.preprocess_features(cleaned)
+        target = cleaned[processor.target_column].values
+    return {'rows': int(len(features)), 'labels': int(len(target)), 'seconds': timer.elapsed}
+
+
+def run_stream(file_path, chunksize):
+    """
+    流式路径：第一遍拟合scaler，第二遍逐块清洗和预处理
+    """
+    processor = PowerGridDataProcessor()
+    rows = 0
+    with Timer() as timer:
+        processor.fit(processor.clean_data(processor.load_data(file_path, chunksize=chunksize)))
+        
+        chunks = processor.load_data(file_path, chunksize=chunksize)
+        for features, target in processor.preprocess_features(processor.clean_data(chunks)):
+            rows += len(features)
+    return {'rows': rows, 'seconds': timer.elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='load_data 峰值内存对比')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--mode', choices=['full', 'stream'])
+    parser.add_argument('--file')
+    args = parser.parse_args()
+    
+    if args.mode is not None:
+        # 子进程：只执行一种路径并输出测量结果
+        if args.mode == 'full':
+            result = run_full(args.file)
+        else:
+            result = run_stream(args.file, args.chunksize)
+        result['peak_rss_mb'] = peak_rss_mb()
+        emit_result(result)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'bench_data.csv')
+        PowerGridDataProcessor().generate_sample_data(n_samples=args.rows).to_csv(
+            file_path, index=False, encoding='utf-8'
+        )
+        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        print(f"测试文件: {args.rows} 行, {size_mb:.1f} MB")
+        
+        for mode in ('full', 'stream'):
+            result = run_isolated('benchmarks.bench_load_data',
+                                  ['--mode', mode, '--file', file_path,
+                                   '--chunksize', args.chunksize])
+            print(f"{mode:>6}: 峰值RSS {result['peak_rss_mb']:.1f} MB, "
+                  f"耗时 {result['seconds']:.2f} s, 行数 {result['rows']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+原生模型格式与joblib格式的启动时间和文件大小对比
+
+启动时间在独立子进程中测量（包含导入和加载），分别报告
+load_model返回的耗时和首次预测完成的耗时
+
+用法:
+    python -m benchmarks.bench_model_format --n-estimators 500
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import Timer, emit_result, run_isolated
+
+
+def directory_size(path):
+    """
+    计算文件或目录的总字节数
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def run_startup(model_path):
+    """
+    子进程：测量导入、加载和首次预测的耗时
+    """
+    with Timer() as import_timer:
+        from src.models.lgbm_model import LightGBMComplaintPredictor
+    with Timer() as load_timer:
+        model = LightGBMComplaintPredictor().load_model(model_path)
+    X = np.zeros((1, len(model.feature_names)))
+    with Timer() as predict_timer:
+        model.predict(X)
+    return {
+        'import_ms': import_timer.elapsed * 1000,
+        'load_ms': load_timer.elapsed * 1000,
+        'first_predict_ms': predict_timer.elapsed * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='模型格式对比')
+    parser.add_argument('--n-estimators', type=int, default=500)
+    parser.add_argument('--startup', help='子进程模式：测量指定模型的启动耗时')
+    args = parser.parse_args()
+    
+    if args.startup:
+        emit_result(run_startup(args.startup))
+        return
+    
+    from src.data.data_processor import PowerGridDataProcessor
+    from src.models.lgbm_model import LightGBMComplaintPredictor
+    
+    processor = PowerGridDataProcessor()
+    data = processor.generate_sample_data(n_samples=50000)
+    X = processor.preprocess_features(data)
+    y = data[processor.target_column].values
+    X_train, X_valid, y_train, y_valid = processor.split_data(X, y)
+    
+    model = LightGBMComplaintPredictor()
+    model.set_params({'objective': 'binary', 'n_estimators': args.n_estimators,
+                      'learning_rate': 0.02, 'num_leaves': 63, 'verbose': -1})
+    model.train(X_train, y_train, X_valid, y_valid)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {
+            'joblib': os.path.join(tmp_dir, 'model.joblib'),
+            'native': os.path.join(tmp_dir, 'model.lgbm')
+        }
+        for path in paths.values():
+            model.save_model(path, scaler_state=processor.get_scaler_state())
+        
+        print(f"\n最佳迭代: {model.get_best_iteration()}, 总树数: {model.get_booster().num_trees()}")
+        print(f"{'格式':>8} {'大小(KB)':>10} {'导入(ms)':>10} {'加载(ms)':>10} {'首次预测(ms)':>14}")
+        for name, path in paths.items():
+            result = run_isolated('benchmarks.bench_model_format', ['--startup', path])
+            print(f"{name:>8} {directory_size(path) / 1024:>10.1f} {result['import_ms']:>10.1f} "
+                  f"{result['load_ms']:>10.2f} {result['first_predict_ms']:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+核外训练与内存训练的峰值内存和耗时对比
+
+内存训练：读取全部分区、拼接为完整特征矩阵后调用 train；
+核外训练：流式拟合scaler后调用 train_out_of_core，按块读取分区。
+两者都在独立子进程中运行，最后一个分区作为验证集。
+峰值内存为相对导入依赖后基线的增量，包含分配器已释放但未归还系统的内存
+（CSV解析和构建Dataset时的大量小块分配），核外训练的实际常驻数据更少。
+
+用法:
+    python -m benchmarks.bench_out_of_core --rows 2000000 --partition-rows 250000 \
+        --formats csv parquet npy
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import Timer, current_rss_mb, emit_result, peak_rss_mb, reset_peak_rss, run_isolated
+from src.data.data_processor import PowerGridDataProcessor, DEFAULT_FEATURE_COLUMNS
+from src.data.synthetic import generate_partitioned
+from src.models.lgbm_model import LightGBMComplaintPredictor
+from src.models.out_of_core import iter_partition_frames
+
+TRAIN_PARAMS = {'objective': 'binary', 'n_estimators': 50, 'learning_rate': 0.1,
+                'num_leaves': 31, 'verbose': -1}
+
+
+def run_memory(paths):
+    processor = PowerGridDataProcessor()
+    model = LightGBMComplaintPredictor()
+    model.set_params(TRAIN_PARAMS)
+    with Timer() as timer:
+        train = pd.concat(iter_partition_frames(paths[:-1], DEFAULT_FEATURE_COLUMNS), ignore_index=True)
+        valid = pd.concat(iter_partition_frames(paths[-1:], DEFAULT_FEATURE_COLUMNS), ignore_index=True)
+        X_train = processor.preprocess_features(train)
+        X_valid = processor.transform(valid)
+        target = processor.target_column
+        model.train(X_train, train[target].values, X_valid, valid[target].values,
+                    feature_names=DEFAULT_FEATURE_COLUMNS)
+    return model, timer.elapsed
+
+
+def run_sequence(paths, block_size):
+    processor = PowerGridDataProcessor()
+    model = LightGBMComplaintPredictor()
+    model.set_params(TRAIN_PARAMS)
+    with Timer() as timer:
+        processor.fit(iter_partition_frames(paths[:-1], DEFAULT_FEATURE_COLUMNS))
+        model.set_scaler_state(processor.get_scaler_state())
+        model.train_out_of_core(paths[:-1], paths[-1:], block_size=block_size)
+    return model, timer.elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='核外训练内存与耗时对比')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--partition-rows', type=int, default=250_000)
+    parser.add_argument('--formats', nargs='+', choices=['csv', 'parquet', 'npy'], default=['csv', 'npy'])
+    parser.add_argument('--block-size', type=int, default=65536)
+    parser.add_argument('--mode', choices=['memory', 'sequence'])
+    parser.add_argument('--paths', nargs='+')
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        # 子进程：只执行一种训练路径并输出测量结果，峰值内存扣除导入依赖后的基线
+        # 先导入读取Parquet的依赖，避免导入本身计入峰值
+        with contextlib.suppress(ImportError):
+            import pyarrow.parquet  # noqa: F401
+        reset_peak_rss()
+        baseline_mb = current_rss_mb()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if args.mode == 'memory':
+                model, seconds = run_memory(args.paths)
+            else:
+                model, seconds = run_sequence(args.paths, args.block_size)
+        emit_result({'seconds': seconds, 'peak_rss_delta_mb': peak_rss_mb() - baseline_mb,
+                     'best_iteration': model.get_best_iteration()})
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"行数: {args.rows}, 每个分区: {args.partition_rows}, 块大小: {args.block_size}")
+        print(f"{'format':>8} {'mode':>9} {'seconds':>9} {'peak_delta_mb':>14} {'best_iter':>10}")
+        for file_format in args.formats:
+            with contextlib.redirect_stdout(io.StringIO()):
+                paths = generate_partitioned(args.rows, os.path.join(tmp_dir, file_format),
+                                             chunk_size=args.partition_rows, file_format=file_format)
+            for mode in ('memory', 'sequence'):
+                result = run_isolated('benchmarks.bench_out_of_core',
+                                      ['--mode', mode, '--block-size', args.block_size, '--paths'] + paths)
+                print(f"{file_format:>8} {mode:>9} {result['seconds']:>9.2f} {result['peak_rss_delta_mb']:>14.1f} "
+                      f"{result['best_iteration']:>10}")
+
+        matrix_mb = args.rows * len(DEFAULT_FEATURE_COLUMNS) * np.dtype(np.float64).itemsize / (1024 * 1024)
+        print(f"完整float64特征矩阵: {matrix_mb:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+predict_stream 吞吐量随块大小和线程数的变化
+
+用法:
+    python -m benchmarks.bench_predict_stream --rows 2000000 \
+        --chunk-sizes 10000 100000 500000 --workers 1 2 4
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from src.data.data_processor import PowerGridDataProcessor
+from src.models.lgbm_model import LightGBMComplaintPredictor
+
+
+def build_model():
+    """
+    在样本数据上训练一个用于测试的模型
+    """
+    processor = PowerGridDataProcessor()
+    data = processor.generate_sample_data(n_samples=20000)
+    X = processor.preprocess_features(data)
+    y = data[processor.target_column].values
+    X_train, X_valid, y_train, y_valid = processor.split_data(X, y)
+    
+    model = LightGBMComplaintPredictor()
+    model.set_params({'objective': 'binary', 'n_estimators': 200, 'learning_rate': 0.05,
+                      'num_leaves': 31, 'verbose': -1})
+    model.train(X_train, y_train, X_valid, y_valid)
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='predict_stream 吞吐量测试')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--output', choices=['none', 'csv', 'parquet'], default='none')
+    args = parser.parse_args()
+    
+    model = build_model()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 以内存映射数组作为输入，模拟大于内存的特征文件
+        features_path = os.path.join(tmp_dir, 'features.npy')
+        rng = np.random.default_rng(42)
+        np.save(features_path, rng.random((args.rows, len(model.feature_names))))
+        X = np.load(features_path, mmap_mode='r')
+        
+        print(f"行数: {args.rows}, 输出: {args.output}")
+        print(f"{'chunk_size':>10} {'workers':>8} {'rows/s':>14}")
+        for chunk_size in args.chunk_sizes:
+            for n_workers in args.workers:
+                output_path = None
+                if args.output != 'none':
+                    output_path = os.path.join(tmp_dir, f'predictions.{args.output}')
+                stats = model.predict_stream(X, output_path=output_path,
+                                             n_workers=n_workers, chunk_size=chunk_size)
+                print(f"{chunk_size:>10} {n_workers:>8} {stats['rows_per_sec']:>14,.0f}")
+        
+        # 对照：一次性predict整个数组
+        stats = model.predict_stream(X, n_workers=1, chunk_size=args.rows)
+        print(f"{'全量':>10} {'-':>8} {stats['rows_per_sec']:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+多模型注册表：不同内存预算下按Zipf分布访问各区域模型的命中率、加载耗时和请求延迟
+
+用法:
+    python -m benchmarks.bench_registry --models 50 --requests 5000 --threads 8 \
+        --budget-fractions 0.1 0.3 1.0
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.bench_predict_stream import build_model
+from src.models.registry import ModelRegistry, path_size
+
+
+def run(root_dir, budget_mb, keys, n_threads, prewarm_keys=None):
+    def request(key):
+        start_time = time.perf_counter()
+        registry.get(key)
+        return time.perf_counter() - start_time
+
+    # 屏蔽每次加载模型时的打印
+    with contextlib.redirect_stdout(io.StringIO()):
+        registry = ModelRegistry(root_dir, memory_budget_mb=budget_mb)
+        if prewarm_keys is not None:
+            registry.prewarm(prewarm_keys)
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            latencies = np.array(list(executor.map(request, keys)))
+    return registry.stats(), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='多模型注册表测试')
+    parser.add_argument('--models', type=int, default=50, help='区域模型数量')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--zipf', type=float, default=1.2, help='访问分布的Zipf参数')
+    parser.add_argument('--budget-fractions', type=float, nargs='+', default=[0.1, 0.3, 1.0],
+                        help='内存预算占全部模型估计内存的比例')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = build_model()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template = os.path.join(tmp_dir, 'template.lgbm')
+        with contextlib.redirect_stdout(io.StringIO()):
+            model.save_model(template)
+        district_keys = [f'district_{i:03d}' for i in range(args.models)]
+        for key in district_keys:
+            os.makedirs(os.path.join(tmp_dir, 'models', key))
+            shutil.copytree(template, os.path.join(tmp_dir, 'models', key, 'v1.lgbm'))
+
+        # 与注册表默认估计一致：文件大小的2倍
+        model_mb = path_size(template) * 2 / (1024 * 1024)
+        rng = np.random.default_rng(42)
+        ranks = np.minimum(rng.zipf(args.zipf, args.requests), args.models) - 1
+        keys = [district_keys[rank] for rank in ranks]
+
+        print(f"模型数: {args.models}, 单个模型估计 {model_mb:.2f} MB, "
+              f"请求数: {args.requests}, 线程数: {args.threads}")
+        print(f"{'budget':>8} {'prewarm':>8} {'hit_rate':>9} {'loads':>6} {'evict':>6} "
+              f"{'coalesce':>9} {'load_ms':>8} {'p50_ms':>8} {'p99_ms':>8}")
+        root_dir = os.path.join(tmp_dir, 'models')
+        for fraction in args.budget_fractions:
+            budget_mb = model_mb * args.models * fraction
+            for prewarm in (False, True):
+                # 预热按访问次数从高到低，这里直接用Zipf排名
+                prewarm_keys = district_keys if prewarm else None
+                stats, latencies = run(root_dir, budget_mb, keys, args.threads, prewarm_keys)
+                print(f"{fraction:>8.0%} {str(prewarm):>8} {stats['hit_rate']:>9.3f} {stats['loads']:>6} "
+                      f"{stats['evictions']:>6} {stats['coalesced']:>9} "
+                      f"{stats['load_seconds_mean'] * 1000:>8.1f} "
+                      f"{np.percentile(latencies, 50) * 1000:>8.3f} {np.percentile(latencies, 99) * 1000:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+评估报告渲染：顺序与进程池并行渲染多份报告的耗时对比
+
+用法:
+    python -m benchmarks.bench_report --reports 40 --rows 200000
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import Timer
+from src.utils.report import render_reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='报告渲染耗时对比')
+    parser.add_argument('--reports', type=int, default=20, help='报告数量（如供电区域数）')
+    parser.add_argument('--rows', type=int, default=200_000, help='每份报告的样本数')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    feature_names = [f'feature_{i}' for i in range(10)]
+    importances = rng.random(10)
+
+    cpu_count = os.cpu_count() or 1
+    print(f"报告数: {args.reports}, 每份行数: {args.rows}, CPU: {cpu_count}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jobs = []
+        for i in range(args.reports):
+            y_true = rng.integers(0, 2, args.rows)
+            y_score = 1 / (1 + np.exp(-(rng.normal(0, 1, args.rows) + y_true)))
+            jobs.append({'y_true': y_true, 'y_score': y_score,
+                         'output_dir': os.path.join(tmp_dir, f'district_{i:03d}'),
+                         'feature_names': feature_names, 'importances': importances})
+
+        for n_workers in sorted({1, cpu_count}):
+            with Timer() as timer:
+                results = render_reports(jobs, n_workers=n_workers)
+            print(f"进程数 {n_workers}: {timer.elapsed:.2f} s, 每份 {timer.elapsed / len(jobs) * 1000:.0f} ms")
+
+        sizes = [os.path.getsize(path) for path in results[0]['files'].values()]
+        print(f"每份报告 {len(sizes)} 个文件，共 {sum(sizes) / 1024:.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
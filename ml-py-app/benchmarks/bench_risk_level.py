@@ -0,0 +1,64 @@
+"""
+风险等级计算：向量化版本与逐行标量循环的对比
+
+用法:
+    python -m benchmarks.bench_risk_level --rows 1000000
+"""
+
+import argparse
+
+import numpy as np
+
+from benchmarks.common import Timer
+from src.utils.utils import (
+    calculate_risk_level, calculate_risk_levels,
+    format_percentage, format_percentages
+)
+
+
+def run_scalar(probabilities):
+    """
+    现有路径：逐行调用标量函数
+    """
+    levels, classes, percentages = [], [], []
+    for probability in probabilities:
+        level, risk_class = calculate_risk_level(probability)
+        levels.append(level)
+        classes.append(risk_class)
+        percentages.append(format_percentage(probability))
+    return levels, classes, percentages
+
+
+def run_vectorized(probabilities):
+    """
+    向量化路径
+    """
+    levels, classes = calculate_risk_levels(probabilities)
+    return levels, classes, format_percentages(probabilities)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='风险等级计算性能对比')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    probabilities = np.random.default_rng(42).random(args.rows)
+    
+    with Timer() as scalar_timer:
+        scalar_levels, scalar_classes, _ = run_scalar(probabilities)
+    with Timer() as vector_timer:
+        levels, classes, _ = run_vectorized(probabilities)
+    with Timer() as bucket_timer:
+        calculate_risk_levels(probabilities)
+    
+    assert list(levels) == scalar_levels and list(classes) == scalar_classes
+    
+    print(f"行数: {args.rows}")
+    print(f"标量循环（等级+格式化）: {scalar_timer.elapsed:.3f} s")
+    print(f"向量化（等级+格式化）:   {vector_timer.elapsed:.3f} s "
+          f"({scalar_timer.elapsed / vector_timer.elapsed:.1f}x)")
+    print(f"向量化（仅等级）:        {bucket_timer.elapsed:.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+共享内存多进程打分的扩展效率：1到N个进程与线程池 predict 的吞吐量对比
+
+特征矩阵预先分配在共享内存中，工作进程的启动和模型加载单独计时，不计入打分耗时。
+
+用法:
+    python -m benchmarks.bench_shared_scoring --rows 2000000 --workers 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+
+import numpy as np
+
+from benchmarks.bench_predict_stream import build_model
+from benchmarks.common import Timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='共享内存多进程打分测试')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = build_model()
+    X = np.random.default_rng(42).random((args.rows, len(model.feature_names)))
+
+    def best_of(func):
+        timings = []
+        for _ in range(args.repeats):
+            with Timer() as timer:
+                result = func()
+            timings.append(timer.elapsed)
+        return min(timings), result
+
+    threaded_seconds, reference = best_of(lambda: model.predict(X)[0])
+    print(f"行数: {args.rows}, CPU: {os.cpu_count()}")
+    print(f"线程池 predict: {threaded_seconds:.3f} s, {args.rows / threaded_seconds:,.0f} 行/秒")
+
+    print(f"{'workers':>8} {'startup_s':>10} {'seconds':>9} {'rows/s':>13} {'speedup':>8} "
+          f"{'efficiency':>11} {'vs_threads':>11}")
+    # 以单进程为基准计算加速比
+    single_seconds = None
+    for n_workers in sorted(set(args.workers) | {1}):
+        with Timer() as startup:
+            scorer = model.shared_scorer(n_workers=n_workers)
+            # 首次打分时进程才真正启动并加载模型
+            scorer.predict_proba(X[:n_workers * 10])
+        with scorer, scorer.allocate(X.shape, X.dtype) as features:
+            features.array[:] = X
+            seconds, proba = best_of(lambda: scorer.predict_proba(features))
+        if not np.allclose(proba, reference):
+            raise RuntimeError("多进程打分结果与predict不一致")
+
+        if n_workers == 1:
+            single_seconds = seconds
+        speedup = single_seconds / seconds
+        print(f"{n_workers:>8} {startup.elapsed:>10.2f} {seconds:>9.3f} {args.rows / seconds:>13,.0f} "
+              f"{speedup:>8.2f} {speedup / n_workers:>11.0%} {threaded_seconds / seconds:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
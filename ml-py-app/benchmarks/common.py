@@ -0,0 +1,82 @@
+"""
+基准测试公共工具
+
+提供计时、峰值内存测量以及在独立子进程中运行测量的辅助函数
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from src.utils.memory import current_rss_bytes, peak_rss_bytes, reset_peak_rss  # noqa: F401
+
+# 项目根目录，子进程在该目录下运行以便导入src包
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    """
+    获取当前进程的峰值常驻内存
+    
+    Returns:
+        float: 峰值RSS（MB）
+    """
+    return peak_rss_bytes() / (1024 * 1024)
+
+
+def current_rss_mb():
+    """
+    获取当前进程的常驻内存
+    
+    Returns:
+        float: 当前RSS（MB），无法读取时返回0
+    """
+    return current_rss_bytes() / (1024 * 1024)
+
+
+class Timer:
+    """
+    简单的上下文管理器计时器
+    """
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = None
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
+        return False
+
+
+def emit_result(result):
+    """
+    以单行JSON输出测量结果，供父进程解析
+    
+    Args:
+        result: 结果字典
+    """
+    print('BENCH_RESULT ' + json.dumps(result, ensure_ascii=False), flush=True)
+
+
+def run_isolated(module, args):
+    """
+    在独立子进程中运行基准测试模块，保证峰值内存互不干扰
+    
+    Args:
+        module: 模块名，如 'benchmarks.bench_load_data'
+        args: 命令行参数列表
+        
+    Returns:
+        dict: 子进程通过emit_result输出的结果
+    """
+    completed = subprocess.run(
+        [sys.executable, '-m', module] + [str(arg) for arg in args],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith('BENCH_RESULT '):
+            return json.loads(line[len('BENCH_RESULT '):])
+    raise RuntimeError(f"子进程未输出结果: {completed.stderr}")
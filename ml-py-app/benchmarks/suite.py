@@ -0,0 +1,335 @@
+"""
+全流程基准测试套件
+
+在多个数据规模下测量各阶段的耗时和峰值内存：
+load_data、clean_data、preprocess_features、Dataset构建、train、
+predict单行延迟、predict吞吐量、evaluate、save_model、load_model。
+每个 (阶段, 规模) 在独立子进程中运行，峰值内存在阶段开始前重置，
+只反映被测阶段本身。结果写入JSON，并可与上一次的结果比较，
+耗时或内存增长超过阈值时标记为退化并以非零状态退出。
+
+用法:
+    python -m benchmarks.suite --sizes 1000 100000 --output benchmarks/results/latest.json
+    python -m benchmarks.suite --sizes 1000 100000 --baseline benchmarks/results/previous.json --threshold 0.2
+    python -m benchmarks.suite --sizes 10000000 --stages train predict_throughput
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.common import Timer, current_rss_mb, emit_result, peak_rss_mb, reset_peak_rss, run_isolated
+
+STAGES = ('load_data', 'clean_data', 'preprocess_features', 'dataset', 'train',
+          'predict_latency', 'predict_throughput', 'evaluate', 'save_model', 'load_model')
+
+DEFAULT_SIZES = (1000, 100_000)
+
+# 基准测试使用固定的迭代次数，结果不受早停位置波动的影响：
+# 训练时不传入验证集，train 中的早停回调只有训练集可用，LightGBM会将其关闭
+TRAIN_PARAMS = {'objective': 'binary', 'n_estimators': 100, 'learning_rate': 0.1,
+                'num_leaves': 31, 'verbose': -1}
+
+# 预测类阶段使用的模型在不超过该行数的数据上训练
+MODEL_TRAIN_ROWS = 100_000
+
+# 单行延迟测量的调用次数
+LATENCY_CALLS = 200
+
+
+def _repeats(rows):
+    """
+    小规模数据重复测量取最小值，降低计时噪声
+    """
+    return 5 if rows <= 10_000 else 3 if rows <= 100_000 else 1
+
+
+def prepare_inputs(rows, work_dir, seed=42):
+    """
+    为一个数据规模准备CSV数据文件和预测用模型
+
+    Args:
+        rows: 行数
+        work_dir: 工作目录
+        seed: 合成数据种子
+
+    Returns:
+        str: 该规模的输入目录
+    """
+    from src.data.data_processor import PowerGridDataProcessor
+    from src.data.synthetic import iter_chunks, make_dataset
+    from src.models.lgbm_model import LightGBMComplaintPredictor
+
+    input_dir = os.path.join(work_dir, f'rows_{rows}')
+    os.makedirs(input_dir, exist_ok=True)
+
+    csv_path = os.path.join(input_dir, 'data.csv')
+    if not os.path.exists(csv_path):
+        # 分块追加写入，10M行时也不需要在内存中持有完整数据
+        for index, chunk in enumerate(iter_chunks(rows, chunk_size=1_000_000, seed=seed)):
+            chunk.to_csv(csv_path, mode='a', header=index == 0, index=False, encoding='utf-8')
+
+    model_path = os.path.join(input_dir, 'model.joblib')
+    if not os.path.exists(model_path):
+        processor = PowerGridDataProcessor()
+        data = make_dataset(min(rows, MODEL_TRAIN_ROWS), seed=seed + 1)
+        X = processor.preprocess_features(data)
+        y = data[processor.target_column].values
+        X_train, _, y_train, _ = processor.split_data(X, y)
+        model = LightGBMComplaintPredictor()
+        model.set_params(dict(TRAIN_PARAMS))
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            model.train(X_train, y_train, feature_names=processor.feature_columns)
+        model.save_model(model_path, scaler_state=processor.get_scaler_state())
+
+    return input_dir
+
+
+def _measure(func, repeats):
+    """
+    重置峰值内存后执行被测函数，返回最短耗时和阶段内的峰值内存增量
+    """
+    seconds = []
+    peak_delta = 0.0
+    for _ in range(repeats):
+        reset_peak_rss()
+        baseline = current_rss_mb()
+        with Timer() as timer:
+            func()
+        seconds.append(timer.elapsed)
+        peak_delta = max(peak_delta, peak_rss_mb() - baseline)
+    return min(seconds), peak_delta
+
+
+def run_stage(stage, rows, input_dir):
+    """
+    子进程：准备阶段输入（不计时）并测量该阶段
+
+    Args:
+        stage: 阶段名
+        rows: 行数
+        input_dir: prepare_inputs 生成的输入目录
+
+    Returns:
+        Dict: 测量结果
+    """
+    import lightgbm as lgb
+
+    from src.data.data_processor import PowerGridDataProcessor
+    from src.models.lgbm_model import LightGBMComplaintPredictor
+
+    csv_path = os.path.join(input_dir, 'data.csv')
+    model_path = os.path.join(input_dir, 'model.joblib')
+    processor = PowerGridDataProcessor()
+    repeats = _repeats(rows)
+    result = {'stage': stage, 'rows': rows}
+
+    if stage == 'load_data':
+        seconds, peak = _measure(lambda: processor.load_data(csv_path), repeats)
+    elif stage == 'clean_data':
+        data = processor.load_data(csv_path)
+        seconds, peak = _measure(lambda: processor.clean_data(data), repeats)
+    elif stage == 'preprocess_features':
+        data = processor.clean_data(processor.load_data(csv_path))
+        seconds, peak = _measure(lambda: PowerGridDataProcessor().preprocess_features(data), repeats)
+    else:
+        data = processor.clean_data(processor.load_data(csv_path))
+        X = processor.preprocess_features(data)
+        y = data[processor.target_column].values
+        rows = len(y)
+        del data
+
+        if stage == 'dataset':
+            seconds, peak = _measure(
+                lambda: lgb.Dataset(X, label=y, feature_name=processor.feature_columns,
+                                    params={'verbose': -1}).construct(), repeats)
+        elif stage == 'train':
+            X_train, _, y_train, _ = processor.split_data(X, y)
+            del X
+
+            def train():
+                model = LightGBMComplaintPredictor()
+                model.set_params(dict(TRAIN_PARAMS))
+                # 不传验证集，固定训练 n_estimators 轮
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', UserWarning)
+                    model.train(X_train, y_train, feature_names=processor.feature_columns)
+
+            seconds, peak = _measure(train, repeats)
+        elif stage == 'save_model':
+            model = LightGBMComplaintPredictor().load_model(model_path)
+            save_dir = tempfile.mkdtemp(prefix='bench_save_')
+            try:
+                seconds, peak = _measure(
+                    lambda: model.save_model(os.path.join(save_dir, 'model.joblib'),
+                                             scaler_state=model.scaler_state), repeats)
+            finally:
+                shutil.rmtree(save_dir, ignore_errors=True)
+            rows = None
+        elif stage == 'load_model':
+            seconds, peak = _measure(lambda: LightGBMComplaintPredictor().load_model(model_path), repeats)
+            rows = None
+        else:
+            model = LightGBMComplaintPredictor().load_model(model_path)
+            if stage == 'predict_latency':
+                latencies = []
+                rows_to_score = X[:LATENCY_CALLS]
+                model.predict(rows_to_score[:1])  # 预热
+
+                def score_single_rows():
+                    for i in range(len(rows_to_score)):
+                        with Timer() as timer:
+                            model.predict(rows_to_score[i:i + 1])
+                        latencies.append(timer.elapsed)
+
+                seconds, peak = _measure(score_single_rows, 1)
+                result['p50_ms'] = float(np.percentile(latencies, 50) * 1000)
+                result['p99_ms'] = float(np.percentile(latencies, 99) * 1000)
+                rows = len(rows_to_score)
+            elif stage == 'predict_throughput':
+                seconds, peak = _measure(lambda: model.predict(X), repeats)
+            elif stage == 'evaluate':
+                seconds, peak = _measure(lambda: model.evaluate(X, y), repeats)
+            else:
+                raise ValueError(f"未知的阶段: {stage}")
+
+    result.update({
+        'seconds': seconds,
+        'peak_rss_delta_mb': peak,
+        'rows_per_sec': rows / seconds if rows and seconds > 0 else None
+    })
+    return result
+
+
+def compare(results, baseline, threshold=0.2, min_seconds=0.005):
+    """
+    与基线结果比较，找出退化的 (阶段, 规模)
+
+    Args:
+        results: 本次结果列表
+        baseline: 基线结果列表
+        threshold: 相对增长阈值，如0.2表示增长超过20%
+        min_seconds: 基线耗时低于该值时不比较耗时，避免计时噪声误报
+
+    Returns:
+        List[Dict]: 退化项，包含阶段、规模、指标、基线值和本次值
+    """
+    previous = {(item['stage'], item['rows_requested']): item for item in baseline}
+    regressions = []
+    for item in results:
+        old = previous.get((item['stage'], item['rows_requested']))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_rss_delta_mb'):
+            if old.get(metric) is None:
+                continue
+            if metric == 'seconds' and old['seconds'] < min_seconds:
+                continue
+            # 内存增量很小时同样只比较超过1MB的变化
+            if metric == 'peak_rss_delta_mb' and item[metric] - old[metric] < 1.0:
+                continue
+            if item[metric] > old[metric] * (1 + threshold):
+                regressions.append({
+                    'stage': item['stage'],
+                    'rows': item['rows_requested'],
+                    'metric': metric,
+                    'baseline': old[metric],
+                    'current': item[metric],
+                    'change': item[metric] / old[metric] - 1 if old[metric] else None
+                })
+    return regressions
+
+
+def run_suite(sizes, stages, work_dir=None):
+    """
+    依次在独立子进程中运行所有 (规模, 阶段)
+
+    Returns:
+        List[Dict]: 测量结果
+    """
+    temporary = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix='bench_suite_')
+    results = []
+    try:
+        for rows in sizes:
+            print(f"准备 {rows} 行的输入数据...", flush=True)
+            input_dir = prepare_inputs(rows, work_dir)
+            for stage in stages:
+                result = run_isolated('benchmarks.suite', ['--run-stage', stage, '--rows', rows,
+                                                           '--input-dir', input_dir])
+                result['rows_requested'] = rows
+                results.append(result)
+                throughput = f"{result['rows_per_sec']:>14,.0f}" if result['rows_per_sec'] else f"{'-':>14}"
+                print(f"{stage:>20} {rows:>10} {result['seconds']:>10.4f} {result['peak_rss_delta_mb']:>10.1f} "
+                      f"{throughput}", flush=True)
+    finally:
+        if temporary:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='全流程基准测试套件')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='数据规模，如 1000 100000 10000000')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--output', default='benchmarks/results/latest.json')
+    parser.add_argument('--baseline', help='用于比较的上一次结果JSON')
+    parser.add_argument('--threshold', type=float, default=0.2, help='退化判定的相对增长阈值')
+    parser.add_argument('--work-dir', help='保留输入数据的目录，重复运行时可复用')
+    parser.add_argument('--run-stage', choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument('--rows', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--input-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        emit_result(run_stage(args.run_stage, args.rows, args.input_dir))
+        return
+
+    import lightgbm as lgb
+
+    print(f"{'阶段':>20} {'行数':>10} {'耗时(s)':>10} {'内存增量(MB)':>10} {'行/秒':>14}")
+    results = run_suite(args.sizes, args.stages, args.work_dir)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'lightgbm': lgb.__version__,
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold)
+        report['baseline'] = args.baseline
+        report['regressions'] = regressions
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到: {args.output}")
+
+    if args.baseline:
+        if regressions:
+            print(f"发现 {len(regressions)} 项退化（阈值 {args.threshold:.0%}）:")
+            for item in regressions:
+                print(f"  {item['stage']} @ {item['rows']} 行 {item['metric']}: "
+                      f"{item['baseline']:.4f} -> {item['current']:.4f} ({item['change']:+.1%})")
+            sys.exit(1)
+        print("未发现退化")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,8 +13,9 @@ from src.data.data_processor import PowerGridDataProcessor
 from src.models.lgbm_model import LightGBMComplaintPredictor
 from src.utils.utils import (
     setup_logging, plot_confusion_matrix, plot_roc_curve,
-    calculate_risk_level, format_percentage
+    calculate_risk_levels, format_percentages
 )
+from src.utils import instrumentation
 
 def main():
     """
@@ -24,6 +25,9 @@ def main():
     logger = setup_logging()
     logger.info("投诉风险预测系统使用示例开始")
     
+    # 开启阶段埋点，记录各阶段耗时、行数和内存
+    instrumentation.enable()
+    
     # 确保数据目录存在
     os.makedirs('data/raw', exist_ok=True)
     os.makedirs('data/processed', exist_ok=True)
@@ -87,7 +91,8 @@ def main():
         
         # 保存模型
         model_path = 'models/lgbm_complaint_predictor.joblib'
-        model.save_model(model_path)
+        # 连同scaler状态一起保存，在线预测时只需调用model.transform
+        model.save_model(model_path, scaler_state=data_processor.get_scaler_state())
         logger.info(f"模型已保存至: {model_path}")
         
         # 3. 模型评估
@@ -116,17 +121,27 @@ def main():
         # 进行预测
         probabilities, classes = model.predict(test_samples)
         
+        # 批量计算风险等级和格式化概率
+        risk_levels, _ = calculate_risk_levels(probabilities)
+        percentages = format_percentages(probabilities)
+        
         # 显示预测结果
         print("\n预测结果示例:")
         print("-" * 80)
-        for i, (prob, cls) in enumerate(zip(probabilities, classes)):
-            risk_level, risk_class = calculate_risk_level(prob)
+        for i, (percentage, cls, risk_level) in enumerate(zip(percentages, classes, risk_levels)):
             print(f"样本 {i+1}:")
-            print(f"  预测概率: {format_percentage(prob)}")
+            print(f"  预测概率: {percentage}")
             print(f"  预测类别: {'投诉' if cls == 1 else '无投诉'}")
             print(f"  风险等级: {risk_level}")
             print("-" * 80)
         
+        # 导出阶段埋点结果
+        instrumentation.export_json('logs/stages.jsonl')
+        instrumentation.export_prometheus('logs/stages.prom')
+        for stage, stats in instrumentation.summarize().items():
+            logger.info(f"{stage}: {stats['calls']} 次, 墙钟 {stats['wall_seconds']:.3f} s, "
+                        f"CPU {stats['cpu_seconds']:.3f} s, {stats['rows_per_sec']:,.0f} 行/秒")
+        
         logger.info("投诉风险预测系统使用示例完成")
         
     except Exception as e:
@@ -1,7 +1,21 @@
+import os
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, KFold, StratifiedKFold, TimeSeriesSplit
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from .scaling import minmax_params, minmax_transform
+from .feature_cache import FeatureCache, cache_key
+from .dedup import RowHashSet, BloomFilter, hash_columns
+from ..utils.instrumentation import instrument
+from ..utils import copy_audit
+from ..utils.hashing import file_sha256
+
+# 模型使用的特征列
+DEFAULT_FEATURE_COLUMNS = [
+    'population_density', 'load_rate', 'historical_faults', 
+    'special_group_density', 'equipment_age', 'external_risk',
+    'is_holiday', 'economic_level', 'historical_complaints', 'temperature'
+]
 
 class PowerGridDataProcessor:
     """
@@ -9,24 +23,40 @@ class PowerGridDataProcessor:
     负责数据的加载、清洗、预处理和特征工程
     """
     
-    def __init__(self):
+    def __init__(self, dtype=np.float32):
         """
         初始化数据处理器
+        
+        Args:
+            dtype: 预处理后特征矩阵的浮点类型，float32比float64节省一半内存，
+                LightGBM分箱和预测都可以直接使用
         """
+        self.dtype = np.dtype(dtype)  # 特征矩阵的浮点类型
         self.scaler = MinMaxScaler()  # 用于特征标准化
         self.feature_columns = None  # 存储特征列名
         self.target_column = 'complaint_label'  # 目标列名
+        self.clean_stats = None  # 最近一次clean_data的丢弃统计
     
-    def load_data(self, file_path):
+    @instrument()
+    def load_data(self, file_path, chunksize=None, downcast=True):
         """
         加载数据文件
         
         Args:
             file_path: 数据文件路径
+            chunksize: 分块行数，为None时一次性读取整个文件；
+                指定后返回按块产出DataFrame的迭代器，只读取特征列和目标列
+            downcast: 分块读取时是否将特征降为float32、目标降为int8
             
         Returns:
-            pd.DataFrame: 加载的数据
+            pd.DataFrame 或 Iterator[pd.DataFrame]: 加载的数据
         """
+        if chunksize is not None:
+            if not (file_path.endswith('.csv') or file_path.endswith('.xlsx') or file_path.endswith('.xls')):
+                print(f"加载数据失败: 不支持的文件格式: {file_path}")
+                return None
+            return self._iter_chunks(file_path, chunksize, downcast)
+        
         try:
             # 根据文件扩展名选择读取方法
             if file_path.endswith('.csv'):
@@ -39,56 +69,308 @@ class PowerGridDataProcessor:
             print(f"加载数据失败: {e}")
             return None
     
-    def clean_data(self, data):
+    def _iter_chunks(self, file_path, chunksize, downcast):
+        """
+        按块读取数据文件
+        
+        Args:
+            file_path: 数据文件路径
+            chunksize: 每块行数
+            downcast: 是否在读取时降低数值精度
+            
+        Yields:
+            pd.DataFrame: 只包含特征列和目标列的数据块
+        """
+        feature_columns = self.feature_columns or DEFAULT_FEATURE_COLUMNS
+        usecols = list(feature_columns) + [self.target_column]
+        dtype = None
+        if downcast:
+            # 目标列使用可空整型，缺失值留到clean_data中处理
+            dtype = {column: np.float32 for column in feature_columns}
+            dtype[self.target_column] = 'Int8'
+        
+        if file_path.endswith('.csv'):
+            # 目标列可能不存在（如待预测数据），此时只读取特征列
+            header = pd.read_csv(file_path, encoding='utf-8', nrows=0).columns
+            usecols = [column for column in usecols if column in header]
+            if dtype is not None:
+                dtype = {column: dtype[column] for column in usecols}
+            reader = pd.read_csv(file_path, encoding='utf-8', usecols=usecols,
+                                 dtype=dtype, chunksize=chunksize)
+            with reader:
+                for chunk in reader:
+                    yield chunk
+        else:
+            # Excel不支持流式读取，只能在读取后按块切分，但仍只加载所需列
+            data = pd.read_excel(file_path, usecols=lambda column: column in usecols)
+            if dtype is not None:
+                data = data.astype({column: dtype[column] for column in data.columns})
+            for start in range(0, len(data), chunksize):
+                yield data.iloc[start:start + chunksize]
+    
+    @instrument()
+    def clean_data(self, data, columns=None, dedup='exact', bloom_capacity=100_000_000,
+                   bloom_error_rate=0.001):
+        """
+        数据清洗：去除所需列含缺失值的行和重复行
+        
+        重复行按所需列的64位行哈希判断，保留第一次出现的行；传入数据块迭代器时
+        已出现的哈希跨块保存，整个数据流只保留每个不同的行一次。
+        各原因丢弃的行数记录在 self.clean_stats 中，流式清洗时随数据块的消费更新。
+        
+        Args:
+            data: 原始数据，DataFrame或load_data(chunksize=...)返回的数据块迭代器
+            columns: 检查缺失值和重复的列，默认为特征列和目标列中数据包含的列
+            dedup: 去重方式，'exact' 精确哈希集合（每个不同的行占8字节），
+                'bloom' 固定内存的布隆过滤器（有少量误删），None 不去重
+            bloom_capacity: 布隆过滤器的预计不同行数量
+            bloom_error_rate: 布隆过滤器的目标误判率
+            
+        Returns:
+            pd.DataFrame 或 Iterator[pd.DataFrame]: 清洗后的数据；
+                传入迭代器时返回逐块清洗的迭代器
+        """
+        if dedup == 'exact':
+            seen = RowHashSet()
+        elif dedup == 'bloom':
+            seen = BloomFilter(bloom_capacity, bloom_error_rate)
+        elif dedup is None:
+            seen = None
+        else:
+            raise ValueError(f"不支持的去重方式: {dedup}")
+        
+        self.clean_stats = {'rows_in': 0, 'dropped_na': 0, 'dropped_duplicate': 0, 'rows_out': 0}
+        
+        if not isinstance(data, pd.DataFrame):
+            return self._clean_chunks(data, columns, seen, self.clean_stats)
+        return self._clean_chunk(data, columns, seen, self.clean_stats)
+    
+    def _clean_columns(self, data, columns):
+        if columns is not None:
+            return list(columns)
+        needed = list(self.feature_columns or DEFAULT_FEATURE_COLUMNS) + [self.target_column]
+        present = [column for column in needed if column in data.columns]
+        # 数据不包含约定的列时退回检查全部列
+        return present or list(data.columns)
+    
+    def _clean_chunk(self, chunk, columns, seen, stats):
+        """
+        清洗一个数据块，只在最后按掩码取行时复制一次
+        
+        Returns:
+            pd.DataFrame: 清洗后的数据块
+        """
+        columns = self._clean_columns(chunk, columns)
+        
+        # 逐列累积缺失值掩码，避免构造所需列的子表
+        keep = np.ones(len(chunk), dtype=bool)
+        for column in columns:
+            keep &= chunk[column].notna().to_numpy()
+        not_na = int(keep.sum())
+        
+        if seen is not None and not_na:
+            # 对所有行计算哈希再按掩码选取，不为去掉缺失值的行复制数据
+            row_index = np.flatnonzero(keep)
+            is_new = seen.add_new(hash_columns(chunk, columns)[row_index])
+            keep[row_index[~is_new]] = False
+        
+        cleaned_chunk = chunk[keep]
+        
+        # 缺失值已去除，可空整型的目标列可以转为紧凑的int8
+        if str(cleaned_chunk.dtypes.get(self.target_column)) == 'Int8':
+            cleaned_chunk = cleaned_chunk.astype({self.target_column: np.int8})
+        
+        stats['rows_in'] += len(chunk)
+        stats['dropped_na'] += len(chunk) - not_na
+        stats['dropped_duplicate'] += not_na - len(cleaned_chunk)
+        stats['rows_out'] += len(cleaned_chunk)
+        return cleaned_chunk
+    
+    def _clean_chunks(self, chunks, columns, seen, stats):
+        """
+        逐块清洗数据，重复行跨块判断
+        
+        Yields:
+            pd.DataFrame: 清洗后的数据块
+        """
+        for chunk in chunks:
+            yield self._clean_chunk(chunk, columns, seen, stats)
+    
+    def fit(self, data):
+        """
+        在完整数据上拟合scaler
+        
+        Args:
+            data: 包含特征的数据，DataFrame或数据块迭代器；
+                传入迭代器时逐块调用partial_fit，内存占用与数据量无关
+            
+        Returns:
+            self: 拟合后的处理器
+        """
+        self.feature_columns = list(DEFAULT_FEATURE_COLUMNS)
+        self.scaler = MinMaxScaler(feature_range=self.scaler.feature_range)
+        
+        if isinstance(data, pd.DataFrame):
+            self.scaler.fit(data[self.feature_columns].values)
+        else:
+            for chunk in data:
+                self.partial_fit(chunk)
+        
+        return self
+    
+    def partial_fit(self, data):
         """
-        数据清洗
+        用一个数据块增量更新scaler的最小/最大值
         
         Args:
-            data: 原始数据
+            data: 包含特征的数据块
             
         Returns:
-            pd.DataFrame: 清洗后的数据
+            self: 更新后的处理器
         """
-        # 复制数据以避免修改原始数据
-        cleaned_data = data.copy()
+        if self.feature_columns is None:
+            self.feature_columns = list(DEFAULT_FEATURE_COLUMNS)
+        self.scaler.partial_fit(data[self.feature_columns].values)
+        return self
+    
+    def transform(self, data):
+        """
+        使用已拟合的scaler转换特征，不修改scaler状态
         
-        # 处理缺失值
-        cleaned_data = cleaned_data.dropna()
+        Args:
+            data: 包含特征的数据，DataFrame或数据块迭代器
+            
+        Returns:
+            np.ndarray 或 Iterator[tuple]: 转换后的C连续特征数据（类型为self.dtype）；
+                传入迭代器时返回产出 (特征块, 目标块) 的迭代器，目标列不存在时目标块为None
+        """
+        if not self.is_fitted():
+            raise ValueError("scaler尚未拟合，请先调用fit或partial_fit")
         
-        # 移除重复行
-        cleaned_data = cleaned_data.drop_duplicates()
+        # 保留 set_scaler_state 恢复的特征列，未设置时才使用默认列
+        if self.feature_columns is None:
+            self.feature_columns = list(DEFAULT_FEATURE_COLUMNS)
+        if not isinstance(data, pd.DataFrame):
+            return self._transform_chunks(data)
         
-        return cleaned_data
+        return self._transform_frame(data)
     
-    def preprocess_features(self, data):
+    def _transform_frame(self, data):
+        """
+        把DataFrame的特征列直接写入C连续数组后原地缩放，只复制一次；
+        与 MinMaxScaler.transform 的计算相同（X * scale_ + min_）
+        """
+        features = minmax_transform(data, self.scaler.scale_, self.scaler.min_,
+                                    dtype=self.dtype, columns=self.feature_columns)
+        copy_audit.record('preprocess_features', features, 'transform')
+        return features
+    
+    def is_fitted(self):
+        """
+        检查scaler是否已拟合
+        
+        Returns:
+            bool: 已拟合返回True
+        """
+        return hasattr(self.scaler, 'data_min_')
+    
+    @instrument()
+    def preprocess_features(self, data, fit=None):
         """
         预处理特征数据
         
         Args:
-            data: 包含特征的数据
+            data: 包含特征的数据，DataFrame或数据块迭代器
+            fit: 是否在该数据上重新拟合scaler；为None时仅在scaler
+                尚未拟合时拟合，已拟合时直接转换（推理数据使用训练时的最值）
             
         Returns:
-            np.ndarray: 预处理后的特征数据
+            np.ndarray: 预处理后的特征数据；传入迭代器时返回
+                产出 (特征块, 目标块) 的迭代器，目标列不存在时目标块为None
         """
-        # 定义特征列
-        self.feature_columns = [
-            'population_density', 'load_rate', 'historical_faults', 
-            'special_group_density', 'equipment_age', 'external_risk',
-            'is_holiday', 'economic_level', 'historical_complaints', 'temperature'
-        ]
+        # 定义特征列，已恢复的特征列不覆盖
+        if self.feature_columns is None:
+            self.feature_columns = list(DEFAULT_FEATURE_COLUMNS)
+        
+        if not isinstance(data, pd.DataFrame):
+            # 流式处理无法在单次遍历中先拟合再转换，要求scaler已拟合
+            if fit or not self.is_fitted():
+                raise ValueError("流式预处理需要已拟合的scaler，请先调用fit在完整数据上拟合")
+            return self._transform_chunks(data)
         
-        # 提取特征数据
-        features = data[self.feature_columns].values
+        if fit is None:
+            fit = not self.is_fitted()
         
         # 标准化特征
-        features_scaled = self.scaler.fit_transform(features)
+        if fit:
+            self.fit(data)
+        return self.transform(data)
+    
+    def _transform_chunks(self, chunks):
+        """
+        逐块转换特征数据
+        
+        Args:
+            chunks: 数据块迭代器
+            
+        Yields:
+            tuple: (标准化后的特征块, 目标块)
+        """
+        for chunk in chunks:
+            features_scaled = self._transform_frame(chunk)
+            target = None
+            if self.target_column in chunk.columns:
+                target = chunk[self.target_column].values
+            yield features_scaled, target
+    
+    def get_scaler_state(self):
+        """
+        获取scaler状态，可序列化为JSON
         
-        return features_scaled
+        Returns:
+            Dict: 包含特征列、特征范围、各特征最小/最大值和特征矩阵类型的字典，
+                未拟合时最值为None
+        """
+        fitted = self.is_fitted()
+        return {
+            'feature_columns': list(self.feature_columns or DEFAULT_FEATURE_COLUMNS),
+            'dtype': self.dtype.name,
+            'feature_range': list(self.scaler.feature_range),
+            'data_min': self.scaler.data_min_.tolist() if fitted else None,
+            'data_max': self.scaler.data_max_.tolist() if fitted else None,
+            'n_samples_seen': int(self.scaler.n_samples_seen_) if fitted else 0
+        }
+    
+    def set_scaler_state(self, state):
+        """
+        从状态字典恢复scaler
+        
+        Args:
+            state: get_scaler_state() 返回的字典
+        """
+        scaler = MinMaxScaler(feature_range=tuple(state['feature_range']))
+        if state.get('data_min') is not None:
+            scale, offset = minmax_params(state)
+            scaler.data_min_ = np.asarray(state['data_min'], dtype=np.float64)
+            scaler.data_max_ = np.asarray(state['data_max'], dtype=np.float64)
+            scaler.data_range_ = scaler.data_max_ - scaler.data_min_
+            scaler.scale_ = scale
+            scaler.min_ = offset
+            scaler.n_features_in_ = len(scale)
+            scaler.n_samples_seen_ = state.get('n_samples_seen', 0)
+        if state.get('feature_columns'):
+            self.feature_columns = list(state['feature_columns'])
+        if state.get('dtype'):
+            self.dtype = np.dtype(state['dtype'])
+        self.scaler = scaler
     
     def split_data(self, features, target, test_size=0.2, random_state=42):
         """
         划分训练集和测试集
         
+        划分结果与 train_test_split 相同。特征先转换为C连续的self.dtype数组
+        （已满足时不复制），再按行下标各取一次，两部分合计复制一次完整矩阵。
+        
         Args:
             features: 特征数据
             target: 目标数据
@@ -98,12 +380,49 @@ class PowerGridDataProcessor:
         Returns:
             tuple: (X_train, X_test, y_train, y_test)
         """
-        return train_test_split(
-            features, 
-            target, 
-            test_size=test_size, 
+        features = copy_audit.ensure_array(features, 'split_data', self.dtype)
+        target = np.asarray(target)
+        
+        # 划分只取决于样本数和随机种子，直接对行号划分
+        train_index, test_index = train_test_split(
+            np.arange(len(features)),
+            test_size=test_size,
             random_state=random_state
         )
+        X_train = features[train_index]
+        X_test = features[test_index]
+        copy_audit.record('split_data', X_train, 'index')
+        copy_audit.record('split_data', X_test, 'index')
+        return X_train, X_test, target[train_index], target[test_index]
+    
+    def kfold_indices(self, target, n_splits=5, stratified=True, time_ordered=False,
+                      shuffle=True, random_state=42):
+        """
+        生成K折交叉验证的索引
+        
+        Args:
+            target: 目标数据
+            n_splits: 折数
+            stratified: 是否按目标类别分层
+            time_ordered: 是否按时间顺序划分（数据需已按时间排序），
+                每折只用之前的数据训练、之后的一段数据验证，此时忽略stratified和shuffle
+            shuffle: 非时间顺序划分时是否打乱
+            random_state: 随机种子
+            
+        Returns:
+            List[tuple]: 每折的 (训练集索引, 验证集索引)
+        """
+        target = np.asarray(target)
+        if time_ordered:
+            splitter = TimeSeriesSplit(n_splits=n_splits)
+        elif stratified:
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=shuffle,
+                                       random_state=random_state if shuffle else None)
+        else:
+            splitter = KFold(n_splits=n_splits, shuffle=shuffle,
+                             random_state=random_state if shuffle else None)
+        
+        return list(splitter.split(np.zeros((len(target), 1)), target))
     
     def generate_sample_data(self, n_samples=1000):
         """
@@ -186,4 +505,54 @@ class PowerGridDataProcessor:
                 data.to_excel(file_path, index=False)
             print(f"数据已保存至: {file_path}")
         except Exception as e:
-            print(f"保存数据失败: {e}")
\ No newline at end of file
+            print(f"保存数据失败: {e}")
+    
+    def load_features_cached(self, file_path, cache_dir='data/processed/cache', mmap=True, dedup='exact'):
+        """
+        加载预处理后的特征矩阵，优先使用二进制缓存
+        
+        缓存以源文件内容哈希、当前scaler状态和去重方式为键；未命中时执行
+        加载、清洗和预处理并写入缓存。命中时以内存映射方式返回，
+        无需解析文本，并恢复生成缓存时的scaler状态。
+        
+        Args:
+            file_path: 数据文件路径
+            cache_dir: 缓存目录
+            mmap: 命中缓存时是否以只读内存映射方式加载
+            dedup: 清洗时的去重方式，见 clean_data
+            
+        Returns:
+            tuple: (特征矩阵, 标签数组)，数据中没有目标列时标签为None
+        """
+        if self.feature_columns is None:
+            self.feature_columns = list(DEFAULT_FEATURE_COLUMNS)
+        cache = FeatureCache(cache_dir)
+        source_hash = file_sha256(file_path)
+        key = cache_key(source_hash, self.get_scaler_state(), self.feature_columns, dedup)
+        
+        cached = cache.load(key, mmap=mmap)
+        if cached is not None:
+            features, target, header = cached
+            self.set_scaler_state(header['scaler_state'])
+            print(f"命中特征缓存: {cache.entry_dir(key)}")
+            return features, target
+        
+        data = self.load_data(file_path)
+        if data is None:
+            raise ValueError(f"无法加载数据: {file_path}")
+        
+        cleaned_data = self.clean_data(data, dedup=dedup)
+        features = self.preprocess_features(cleaned_data)
+        target = None
+        if self.target_column in cleaned_data.columns:
+            target = cleaned_data[self.target_column].values
+        
+        cache.save(key, features, target, header={
+            'source_path': os.path.abspath(file_path),
+            'source_hash': source_hash,
+            'feature_columns': self.feature_columns,
+            'scaler_state': self.get_scaler_state()
+        })
+        print(f"特征缓存已写入: {cache.entry_dir(key)}")
+        
+        return features, target
@@ -0,0 +1,173 @@
+"""
+跨数据块的行去重
+
+每行按所选列计算64位哈希，已出现的哈希保存在紧凑结构中：
+    RowHashSet   有序uint64数组（按几何级数合并的有序段），每个不同的行占8字节，
+                 结果精确（忽略哈希碰撞）
+    BloomFilter  固定大小的位数组，内存与行数无关，但有少量误判，
+                 误判会把未出现过的行当作重复行丢弃
+
+两者都提供 add_new(hashes)，返回每个哈希是否首次出现，
+同一批内的重复只保留第一次出现的位置，与 drop_duplicates(keep='first') 一致。
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from ..utils.hashing import mix64
+
+_HASH_PRIME = np.uint64(0x100000001B3)
+
+
+def hash_columns(data, columns):
+    """
+    按列计算每行的64位哈希，不复制所选列组成的子表
+
+    Args:
+        data: DataFrame
+        columns: 参与哈希的列
+
+    Returns:
+        np.ndarray: uint64类型的行哈希
+    """
+    h = np.zeros(len(data), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column in columns:
+            column_hash = pd.util.hash_pandas_object(data[column], index=False).to_numpy()
+            h = (h * _HASH_PRIME) ^ column_hash
+        return mix64(h)
+
+
+def _first_occurrences(hashes):
+    """
+    Returns:
+        tuple: (批内不同的哈希, 各哈希第一次出现的位置)
+    """
+    return np.unique(hashes, return_index=True)
+
+
+class RowHashSet:
+    """
+    以若干有序uint64数组（有序段）保存已出现行哈希的精确集合
+
+    每批新哈希作为一个新的有序段加入；后一段不小于前一段的一半时两段合并，
+    段长按几何级数递增，段数为O(log N)，每个哈希只被合并O(log N)次。
+    查询时在每段上用 searchsorted 二分查找。
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def _contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes)
+            positions[positions == len(run)] = 0
+            found |= run[positions] == hashes
+        return found
+
+    def add_new(self, hashes):
+        """
+        加入一批哈希
+
+        Args:
+            hashes: uint64行哈希
+
+        Returns:
+            np.ndarray: 每个位置是否为首次出现
+        """
+        unique, first_index = _first_occurrences(hashes)
+        new = ~self._contains(unique)
+
+        if new.any():
+            self._runs.append(unique[new])
+            while len(self._runs) > 1 and 2 * len(self._runs[-1]) >= len(self._runs[-2]):
+                last = self._runs.pop()
+                # 两段有序数组拼接后排序，timsort只需线性合并两个有序段
+                self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]), kind='stable')
+
+        is_new = np.zeros(len(hashes), dtype=bool)
+        is_new[first_index[new]] = True
+        return is_new
+
+    @property
+    def nbytes(self):
+        return sum(run.nbytes for run in self._runs)
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+
+class BloomFilter:
+    """
+    布隆过滤器，用固定内存近似判断行哈希是否出现过
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        初始化过滤器
+
+        Args:
+            capacity: 预计的不同行数量，超过后误判率会升高
+            error_rate: 达到容量时的目标误判率
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity必须为正数，error_rate必须在(0, 1)之间")
+
+        num_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_bits = np.uint64(max(num_bits, 8))
+        self.num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bits = np.zeros((int(self.num_bits) + 7) // 8, dtype=np.uint8)
+        self._count = 0
+
+    def _positions(self, hashes):
+        """
+        Returns:
+            List[tuple]: 每个哈希函数对应的 (字节下标, 位掩码)
+        """
+        positions = []
+        # 双重哈希：第i个位置为 h1 + i * h2，h2取奇数
+        with np.errstate(over='ignore'):
+            h2 = mix64(hashes ^ np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+            for i in range(self.num_hashes):
+                bit = (hashes + np.uint64(i) * h2) % self.num_bits
+                positions.append(((bit >> np.uint64(3)).astype(np.intp),
+                                  np.left_shift(1, bit & np.uint64(7)).astype(np.uint8)))
+        return positions
+
+    def add_new(self, hashes):
+        """
+        加入一批哈希
+
+        Args:
+            hashes: uint64行哈希
+
+        Returns:
+            np.ndarray: 每个位置是否判定为首次出现
+        """
+        unique, first_index = _first_occurrences(hashes)
+        positions = self._positions(unique)
+
+        present = np.ones(len(unique), dtype=bool)
+        for byte_index, mask in positions:
+            present &= (self._bits[byte_index] & mask) != 0
+
+        new = ~present
+        for byte_index, mask in positions:
+            np.bitwise_or.at(self._bits, byte_index[new], mask[new])
+        self._count += int(new.sum())
+
+        is_new = np.zeros(len(hashes), dtype=bool)
+        is_new[first_index[new]] = True
+        return is_new
+
+    @property
+    def nbytes(self):
+        return self._bits.nbytes
+
+    def __len__(self):
+        return self._count
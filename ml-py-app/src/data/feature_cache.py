@@ -0,0 +1,164 @@
+"""
+预处理特征矩阵的二进制缓存
+
+特征矩阵和标签以原始 .npy 格式保存，配合 JSON 头文件记录元数据。
+加载时通过内存映射直接使用磁盘上的数据，无需解析文本或复制数组。
+缓存以源文件内容哈希和scaler状态为键，源文件或scaler变化后旧缓存不会被命中。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# 缓存格式版本，格式或清洗结果变化时递增使旧缓存失效
+# 2: clean_data 开始删除重复行
+CACHE_FORMAT_VERSION = 2
+
+HEADER_FILE = 'header.json'
+FEATURES_FILE = 'features.npy'
+TARGET_FILE = 'target.npy'
+
+
+def scaler_fingerprint(scaler_state):
+    """
+    计算scaler状态的指纹
+
+    Args:
+        scaler_state: PowerGridDataProcessor.get_scaler_state() 返回的字典
+
+    Returns:
+        str: 十六进制哈希值
+    """
+    payload = json.dumps(scaler_state, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_key(source_hash, scaler_state, feature_columns, dedup='exact'):
+    """
+    生成缓存键
+
+    Args:
+        source_hash: 源文件内容哈希
+        scaler_state: scaler状态字典
+        feature_columns: 特征列名列表
+        dedup: 清洗时的去重方式
+
+    Returns:
+        str: 缓存键
+    """
+    payload = json.dumps({
+        'version': CACHE_FORMAT_VERSION,
+        'source': source_hash,
+        'scaler': scaler_fingerprint(scaler_state),
+        'features': list(feature_columns),
+        'dedup': dedup
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class FeatureCache:
+    """
+    特征矩阵缓存
+
+    每个缓存条目是 cache_dir 下以缓存键命名的目录，包含
+    features.npy、target.npy（可选）和 header.json
+    """
+
+    def __init__(self, cache_dir='data/processed/cache'):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存根目录
+        """
+        self.cache_dir = cache_dir
+
+    def entry_dir(self, key):
+        """
+        获取缓存条目目录
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            str: 条目目录路径
+        """
+        return os.path.join(self.cache_dir, key)
+
+    def save(self, key, features, target=None, header=None):
+        """
+        保存特征矩阵和标签
+
+        先写入临时目录再整体重命名，避免并发读取到写了一半的缓存
+
+        Args:
+            key: 缓存键
+            features: 特征矩阵
+            target: 标签数组（可选）
+            header: 需要写入头文件的附加元数据
+
+        Returns:
+            str: 条目目录路径
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        features = np.ascontiguousarray(features)
+
+        tmp_dir = tempfile.mkdtemp(prefix=f'.{key}-', dir=self.cache_dir)
+        try:
+            np.save(os.path.join(tmp_dir, FEATURES_FILE), features)
+            if target is not None:
+                np.save(os.path.join(tmp_dir, TARGET_FILE), np.ascontiguousarray(target))
+
+            meta = dict(header or {})
+            meta.update({
+                'format_version': CACHE_FORMAT_VERSION,
+                'key': key,
+                'shape': list(features.shape),
+                'dtype': str(features.dtype),
+                'has_target': target is not None
+            })
+            with open(os.path.join(tmp_dir, HEADER_FILE), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+
+            target_dir = self.entry_dir(key)
+            if os.path.exists(target_dir):
+                shutil.rmtree(target_dir)
+            os.replace(tmp_dir, target_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        return target_dir
+
+    def load(self, key, mmap=True):
+        """
+        加载缓存的特征矩阵和标签
+
+        Args:
+            key: 缓存键
+            mmap: 是否以只读内存映射方式加载
+
+        Returns:
+            tuple 或 None: (特征矩阵, 标签数组或None, 头文件字典)，未命中时返回None
+        """
+        entry_dir = self.entry_dir(key)
+        header_path = os.path.join(entry_dir, HEADER_FILE)
+        if not os.path.exists(header_path):
+            return None
+
+        with open(header_path, 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        if header.get('format_version') != CACHE_FORMAT_VERSION or header.get('key') != key:
+            return None
+
+        mmap_mode = 'r' if mmap else None
+        features = np.load(os.path.join(entry_dir, FEATURES_FILE), mmap_mode=mmap_mode)
+        target = None
+        if header.get('has_target'):
+            target = np.load(os.path.join(entry_dir, TARGET_FILE), mmap_mode=mmap_mode)
+
+        return features, target, header
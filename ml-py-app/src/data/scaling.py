@@ -0,0 +1,87 @@
+"""
+Min-Max 缩放的轻量实现
+
+只依赖numpy，根据 PowerGridDataProcessor.get_scaler_state() 导出的状态
+计算缩放参数并执行向量化转换，供在线预测路径使用
+"""
+
+import numpy as np
+
+
+def minmax_params(state):
+    """
+    根据scaler状态计算缩放系数和偏移量
+
+    Args:
+        state: get_scaler_state() 返回的字典
+
+    Returns:
+        tuple: (scale, offset)，转换公式为 X * scale + offset
+    """
+    if state is None or state.get('data_min') is None:
+        raise ValueError("scaler尚未拟合")
+
+    feature_min, feature_max = state['feature_range']
+    data_min = np.asarray(state['data_min'], dtype=np.float64)
+    data_max = np.asarray(state['data_max'], dtype=np.float64)
+    data_range = data_max - data_min
+    # 与MinMaxScaler一致：常数特征的范围按1处理
+    data_range = np.where(data_range == 0, 1.0, data_range)
+
+    scale = (feature_max - feature_min) / data_range
+    offset = feature_min - data_min * scale
+    return scale, offset
+
+
+def columns_to_array(data, columns, dtype=np.float64, block_rows=65536):
+    """
+    把表格对象的指定列写入预分配的C连续数组
+
+    DataFrame.to_numpy 对多列得到的是按列存储的数组，转成按行存储还需再复制一次；
+    这里按行块逐列写入，数据只复制一次，每个行块都在缓存内完成。
+
+    Args:
+        data: 支持按列名取列的表格对象（如DataFrame）
+        columns: 列名
+        dtype: 输出类型
+        block_rows: 每个行块的行数
+
+    Returns:
+        np.ndarray: 形状为 (行数, 列数) 的C连续数组
+    """
+    arrays = [np.asarray(data[column]) for column in columns]
+    n_rows = len(arrays[0]) if arrays else len(data)
+    result = np.empty((n_rows, len(columns)), dtype=dtype)
+    for start in range(0, n_rows, block_rows):
+        block = result[start:start + block_rows]
+        for index, array in enumerate(arrays):
+            block[:, index] = array[start:start + block_rows]
+    return result
+
+
+def minmax_transform(X, scale, offset, dtype=None, columns=None):
+    """
+    执行Min-Max转换
+
+    Args:
+        X: 原始特征矩阵，或提供columns时为表格对象
+        scale: 缩放系数
+        offset: 偏移量
+        dtype: 输出类型，默认与输入保持一致（非浮点输入转为float64）
+        columns: 从表格对象中选取的列，提供时直接写入C连续的输出数组
+
+    Returns:
+        np.ndarray: 转换后的C连续特征矩阵
+    """
+    if columns is not None:
+        result = columns_to_array(X, columns, dtype=dtype or np.float64)
+    else:
+        X = np.asarray(X)
+        if dtype is None:
+            dtype = X.dtype if np.issubdtype(X.dtype, np.floating) else np.float64
+        result = np.array(X, dtype=dtype, copy=True, order='C')
+
+    # 在输出数组上原地计算，不产生额外的临时数组
+    result *= scale.astype(result.dtype, copy=False)
+    result += offset.astype(result.dtype, copy=False)
+    return result
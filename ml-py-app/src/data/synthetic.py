@@ -0,0 +1,180 @@
+"""
+可扩展的并行合成数据生成器
+
+与 PowerGridDataProcessor.generate_sample_data 使用相同的业务规则，但按块生成：
+每个数据块使用由 np.random.SeedSequence 派生的独立 np.random.Generator，
+块的内容只取决于总种子和块序号，与工作进程数量无关，结果可以复现。
+数据块在进程池中生成并直接写入分区文件，主进程不持有完整数据。
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def generate_chunk(seed_sequence, n_samples, dtype=np.float64):
+    """
+    用独立的随机数生成器生成一个数据块
+
+    Args:
+        seed_sequence: 该块的 np.random.SeedSequence
+        n_samples: 行数
+        dtype: 特征的浮点类型
+
+    Returns:
+        pd.DataFrame: 生成的数据块，列与 generate_sample_data 一致
+    """
+    rng = np.random.default_rng(seed_sequence)
+
+    # 生成基础特征
+    population_density = rng.beta(2, 5, n_samples)  # 人口密度 (0-1)
+    load_rate = rng.beta(3, 3, n_samples)  # 负载率 (0-1)
+    historical_faults = rng.poisson(3, n_samples) / 20  # 历史故障数 (归一化)
+    special_group_density = rng.beta(2, 5, n_samples)  # 特殊群体密度 (0-1)
+    equipment_age = rng.beta(5, 2, n_samples)  # 设备老化程度 (0-1)
+    external_risk = rng.beta(1, 4, n_samples)  # 外部风险 (0-1)
+    is_holiday = rng.binomial(1, 0.2, n_samples)  # 是否节假日 (0-1)
+    economic_level = rng.beta(3, 3, n_samples)  # 经济水平 (0-1)
+    historical_complaints = rng.poisson(2, n_samples) / 15  # 历史投诉数 (归一化)
+    temperature = (rng.normal(25, 10, n_samples) - 10) / 30  # 温度 (归一化到0-1)
+
+    # 计算投诉风险分数（基于业务规则）
+    risk_score = (
+        special_group_density * 0.35 +
+        load_rate * 0.25 +
+        historical_faults * 0.15 +
+        population_density * 0.10 +
+        equipment_age * 0.08 +
+        external_risk * 0.05 +
+        is_holiday * 0.02
+    )
+    risk_score += rng.normal(0, 0.05, n_samples)
+
+    complaint_prob = 1 / (1 + np.exp(-10 * (risk_score - 0.5)))
+    complaint_label = rng.binomial(1, complaint_prob)
+
+    return pd.DataFrame({
+        'population_density': population_density.astype(dtype, copy=False),
+        'load_rate': load_rate.astype(dtype, copy=False),
+        'historical_faults': historical_faults.astype(dtype, copy=False),
+        'special_group_density': special_group_density.astype(dtype, copy=False),
+        'equipment_age': equipment_age.astype(dtype, copy=False),
+        'external_risk': external_risk.astype(dtype, copy=False),
+        'is_holiday': is_holiday.astype(np.int8),
+        'economic_level': economic_level.astype(dtype, copy=False),
+        'historical_complaints': historical_complaints.astype(dtype, copy=False),
+        'temperature': temperature.astype(dtype, copy=False),
+        'risk_score': risk_score.astype(dtype, copy=False),
+        'complaint_prob': complaint_prob.astype(dtype, copy=False),
+        'complaint_label': complaint_label.astype(np.int8)
+    })
+
+
+def chunk_sizes(n_rows, chunk_size):
+    """
+    计算每个数据块的行数
+
+    Args:
+        n_rows: 总行数
+        chunk_size: 每块行数
+
+    Returns:
+        List[int]: 各块行数
+    """
+    sizes = [chunk_size] * (n_rows // chunk_size)
+    if n_rows % chunk_size:
+        sizes.append(n_rows % chunk_size)
+    return sizes
+
+
+def iter_chunks(n_rows, chunk_size=1_000_000, seed=42, dtype=np.float64):
+    """
+    在当前进程中按块生成数据
+
+    Args:
+        n_rows: 总行数
+        chunk_size: 每块行数
+        seed: 总种子
+        dtype: 特征的浮点类型
+
+    Yields:
+        pd.DataFrame: 数据块
+    """
+    sizes = chunk_sizes(n_rows, chunk_size)
+    for seed_sequence, size in zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes):
+        yield generate_chunk(seed_sequence, size, dtype)
+
+
+def _write_partition(args):
+    seed_sequence, size, file_path, file_format, dtype = args
+    chunk = generate_chunk(seed_sequence, size, dtype)
+    if file_format == 'csv':
+        chunk.to_csv(file_path, index=False, encoding='utf-8')
+    elif file_format == 'parquet':
+        chunk.to_parquet(file_path, index=False)
+    else:
+        # npy：特征和标签分别保存为可内存映射的数组，列名另存为JSON
+        features = chunk.drop(columns=['complaint_label'])
+        np.save(file_path + '.features.npy', features.to_numpy())
+        np.save(file_path + '.label.npy', chunk['complaint_label'].to_numpy())
+        with open(file_path + '.columns.json', 'w', encoding='utf-8') as f:
+            json.dump(list(features.columns), f)
+    return file_path, size
+
+
+def generate_partitioned(n_rows, output_dir, chunk_size=1_000_000, seed=42,
+                         file_format='csv', n_workers=None, dtype=np.float64):
+    """
+    在进程池中并行生成数据并写入分区文件
+
+    Args:
+        n_rows: 总行数
+        output_dir: 输出目录
+        chunk_size: 每个分区的行数
+        seed: 总种子，相同种子和块大小得到相同数据，与n_workers无关
+        file_format: 'csv'、'parquet'（需要pyarrow）或 'npy'
+        n_workers: 进程数，默认为CPU核数
+        dtype: 特征的浮点类型
+
+    Returns:
+        List[str]: 按分区顺序排列的文件路径（npy格式为路径前缀）
+    """
+    if file_format not in ('csv', 'parquet', 'npy'):
+        raise ValueError(f"不支持的文件格式: {file_format}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    sizes = chunk_sizes(n_rows, chunk_size)
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+    extension = '' if file_format == 'npy' else f'.{file_format}'
+
+    tasks = [
+        (seed_sequence, size, os.path.join(output_dir, f'part-{index:05d}{extension}'), file_format, dtype)
+        for index, (seed_sequence, size) in enumerate(zip(seed_sequences, sizes))
+    ]
+
+    with ProcessPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+        paths = [file_path for file_path, _ in executor.map(_write_partition, tasks)]
+
+    print(f"已生成 {n_rows} 行数据，共 {len(paths)} 个分区: {output_dir}")
+    return paths
+
+
+def make_dataset(n_rows, seed=42, chunk_size=1_000_000, dtype=np.float64):
+    """
+    在内存中生成完整数据集，可作为基准测试的固定数据
+
+    结果与相同参数下 generate_partitioned 写出的分区按顺序拼接后一致
+
+    Args:
+        n_rows: 总行数
+        seed: 总种子
+        chunk_size: 每块行数
+        dtype: 特征的浮点类型
+
+    Returns:
+        pd.DataFrame: 生成的数据
+    """
+    return pd.concat(list(iter_chunks(n_rows, chunk_size, seed, dtype)), ignore_index=True)
@@ -0,0 +1,296 @@
+"""
+单次排序的融合评估
+
+对预测分数只排序一次，由排序后的累计正负样本数同时得到：
+    - ROC AUC（与 sklearn.metrics.roc_auc_score 一致，含并列分数的处理）
+    - 所有阈值下的精确率、召回率、F1、TPR、FPR 曲线
+    - 给定阈值下的准确率、精确率、召回率、F1 和混淆矩阵
+    - 按指定目标选出的最优阈值
+总复杂度 O(n log n)，只依赖numpy。
+
+数据无法一次放入内存时使用 StreamingMetrics：逐块累积精确的混淆矩阵计数
+和按类别的固定分箱分数直方图，由直方图近似得到AUC和PR曲线，
+累加器可以在多个进程之间合并。
+"""
+
+import numpy as np
+
+# 选择最优阈值时支持的目标
+OBJECTIVES = ('f1', 'accuracy', 'youden')
+
+
+def _safe_divide(numerator, denominator):
+    """
+    分母为0时结果取0，与sklearn的zero_division=0一致
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
+
+
+def _point_metrics(tp, fp, positives, negatives):
+    """
+    由混淆矩阵计数计算各项指标
+    """
+    fn = positives - tp
+    tn = negatives - fp
+    precision = float(_safe_divide(tp, tp + fp))
+    recall = float(_safe_divide(tp, positives))
+    return {
+        'accuracy': (tp + tn) / (positives + negatives),
+        'precision': precision,
+        'recall': recall,
+        'f1': float(_safe_divide(2 * precision * recall, precision + recall)),
+        'confusion_matrix': [[int(tn), int(fp)], [int(fn), int(tp)]]
+    }
+
+
+def _curve_from_counts(tps, fps, positives, negatives):
+    """
+    由按阈值从高到低的累计正/负样本数计算曲线和AUC
+
+    Returns:
+        tuple: (曲线字典, ROC AUC)
+    """
+    tpr = _safe_divide(tps, positives)
+    fpr = _safe_divide(fps, negatives)
+    precision = _safe_divide(tps, tps + fps)
+    f1 = _safe_divide(2 * precision * tpr, precision + tpr)
+
+    # 梯形法则，并列分数对应一条斜线段，与sklearn的处理一致
+    if positives and negatives:
+        roc_tpr, roc_fpr = np.r_[0.0, tpr], np.r_[0.0, fpr]
+        roc_auc = float(np.sum(np.diff(roc_fpr) * (roc_tpr[1:] + roc_tpr[:-1])) / 2)
+    else:
+        roc_auc = float('nan')
+
+    curve = {'precision': precision, 'recall': tpr, 'f1': f1, 'tpr': tpr, 'fpr': fpr}
+    return curve, roc_auc
+
+
+def _best_index(curve, tps, fps, positives, negatives, objective):
+    """
+    按目标选出曲线上的最优位置
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"不支持的目标: {objective}，可选 {OBJECTIVES}")
+    if objective == 'f1':
+        score = curve['f1']
+    elif objective == 'accuracy':
+        score = (tps + (negatives - fps)) / max(positives + negatives, 1)
+    else:
+        score = curve['tpr'] - curve['fpr']
+    return int(np.argmax(score))
+
+
+def evaluate_scores(y_true, y_score, threshold=0.5, objective='f1'):
+    """
+    融合计算全部评估指标
+
+    Args:
+        y_true: 0/1标签
+        y_score: 正类预测概率
+        threshold: 计算单点指标的分类阈值（分数 >= 阈值判为正类）
+        objective: 选择最优阈值的目标，'f1'、'accuracy' 或 'youden'（TPR - FPR）
+
+    Returns:
+        Dict: 包含
+            metrics: 给定阈值下的 accuracy、precision、recall、f1、roc_auc、confusion_matrix
+            curve: 按阈值从高到低排列的 thresholds、precision、recall、f1、tpr、fpr 数组
+            best_threshold: 最优阈值
+            best_metrics: 最优阈值下的指标
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"不支持的目标: {objective}，可选 {OBJECTIVES}")
+
+    y_true = np.asarray(y_true).ravel()
+    y_score = np.asarray(y_score, dtype=np.float64).ravel()
+    if len(y_true) != len(y_score):
+        raise ValueError("标签和分数的长度不一致")
+
+    # 按分数从高到低排序，唯一的一次排序
+    order = np.argsort(-y_score, kind='mergesort')
+    sorted_score = y_score[order]
+    sorted_label = y_true[order] == 1
+
+    # 每个不同分数的最后一个位置：阈值取该分数时，之前的样本全部判为正类
+    distinct = np.flatnonzero(np.diff(sorted_score)) if len(sorted_score) > 1 else np.empty(0, dtype=np.intp)
+    last_index = np.r_[distinct, len(sorted_score) - 1]
+    cumulative_tp = np.cumsum(sorted_label)
+    tps = cumulative_tp[last_index]
+    fps = last_index + 1 - tps
+
+    positives = int(cumulative_tp[-1]) if len(cumulative_tp) else 0
+    negatives = len(y_true) - positives
+
+    curve, roc_auc = _curve_from_counts(tps, fps, positives, negatives)
+    curve['thresholds'] = sorted_score[last_index]
+
+    # 给定阈值下判为正类的样本数：分数 >= threshold 的样本
+    predicted_positive = int(np.searchsorted(-sorted_score, -threshold, side='right'))
+    tp = int(cumulative_tp[predicted_positive - 1]) if predicted_positive else 0
+    metrics = _point_metrics(tp, predicted_positive - tp, positives, negatives)
+    metrics['roc_auc'] = roc_auc
+
+    best = _best_index(curve, tps, fps, positives, negatives, objective)
+    best_metrics = _point_metrics(int(tps[best]), int(fps[best]), positives, negatives)
+    best_metrics['roc_auc'] = roc_auc
+
+    return {
+        'metrics': metrics,
+        'curve': curve,
+        'objective': objective,
+        'best_threshold': float(curve['thresholds'][best]),
+        'best_metrics': best_metrics
+    }
+
+
+class StreamingMetrics:
+    """
+    可合并的流式评估累加器
+
+    单点指标（给定阈值下的混淆矩阵）是精确的；AUC和曲线由每个类别在
+    [0, 1] 上 n_bins 个等宽分箱的分数直方图近似，同一分箱内的样本视为分数并列，
+    AUC的误差不超过 auc_error_bound（同箱正负样本对的占比的一半）。
+    """
+
+    def __init__(self, n_bins=1000, threshold=0.5):
+        """
+        初始化累加器
+
+        Args:
+            n_bins: 分数直方图的分箱数，分箱越多近似越精确
+            threshold: 计算混淆矩阵的分类阈值
+        """
+        self.n_bins = n_bins
+        self.threshold = threshold
+        self.positive_hist = np.zeros(n_bins, dtype=np.int64)
+        self.negative_hist = np.zeros(n_bins, dtype=np.int64)
+        # 给定阈值下的混淆矩阵计数
+        self.tp = self.fp = self.tn = self.fn = 0
+
+    def update(self, y_true, y_score):
+        """
+        累积一块数据
+
+        Args:
+            y_true: 0/1标签
+            y_score: 正类预测概率
+
+        Returns:
+            self: 累加器本身
+        """
+        y_true = np.asarray(y_true).ravel() == 1
+        y_score = np.asarray(y_score, dtype=np.float64).ravel()
+        if len(y_true) != len(y_score):
+            raise ValueError("标签和分数的长度不一致")
+
+        bins = np.clip((y_score * self.n_bins).astype(np.intp), 0, self.n_bins - 1)
+        self.positive_hist += np.bincount(bins[y_true], minlength=self.n_bins)
+        self.negative_hist += np.bincount(bins[~y_true], minlength=self.n_bins)
+
+        predicted = y_score >= self.threshold
+        tp = int(np.count_nonzero(predicted & y_true))
+        fp = int(np.count_nonzero(predicted)) - tp
+        positives = int(np.count_nonzero(y_true))
+        self.tp += tp
+        self.fp += fp
+        self.fn += positives - tp
+        self.tn += len(y_true) - positives - fp
+        return self
+
+    def merge(self, other):
+        """
+        合并另一个累加器（如其他工作进程的结果）
+
+        Args:
+            other: 分箱数和阈值相同的 StreamingMetrics
+
+        Returns:
+            self: 累加器本身
+        """
+        if other.n_bins != self.n_bins or other.threshold != self.threshold:
+            raise ValueError("只能合并分箱数和阈值相同的累加器")
+        self.positive_hist += other.positive_hist
+        self.negative_hist += other.negative_hist
+        self.tp += other.tp
+        self.fp += other.fp
+        self.tn += other.tn
+        self.fn += other.fn
+        return self
+
+    @property
+    def count(self):
+        return self.tp + self.fp + self.tn + self.fn
+
+    def to_dict(self):
+        """
+        导出为可JSON序列化的字典，便于跨进程或跨作业传递
+
+        Returns:
+            Dict: 累加器状态
+        """
+        return {
+            'n_bins': self.n_bins,
+            'threshold': self.threshold,
+            'positive_hist': self.positive_hist.tolist(),
+            'negative_hist': self.negative_hist.tolist(),
+            'confusion': [self.tn, self.fp, self.fn, self.tp]
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        从 to_dict 的结果恢复累加器
+
+        Args:
+            state: 累加器状态
+
+        Returns:
+            StreamingMetrics: 恢复的累加器
+        """
+        metrics = cls(n_bins=state['n_bins'], threshold=state['threshold'])
+        metrics.positive_hist[:] = state['positive_hist']
+        metrics.negative_hist[:] = state['negative_hist']
+        metrics.tn, metrics.fp, metrics.fn, metrics.tp = state['confusion']
+        return metrics
+
+    def result(self, objective='f1'):
+        """
+        计算评估结果，格式与 evaluate_scores 相同
+
+        Args:
+            objective: 选择最优阈值的目标，'f1'、'accuracy' 或 'youden'
+
+        Returns:
+            Dict: 包含 metrics（精确的单点指标和近似AUC）、curve（按分箱下边界
+                从高到低排列的近似曲线）、best_threshold、best_metrics 和 auc_error_bound
+        """
+        positives = self.tp + self.fn
+        negatives = self.tn + self.fp
+
+        # 只保留有样本的分箱，从高分到低分累积
+        occupied = np.flatnonzero(self.positive_hist + self.negative_hist)[::-1]
+        tps = np.cumsum(self.positive_hist[occupied])
+        fps = np.cumsum(self.negative_hist[occupied])
+
+        curve, roc_auc = _curve_from_counts(tps, fps, positives, negatives)
+        curve['thresholds'] = occupied / self.n_bins
+
+        metrics = _point_metrics(self.tp, self.fp, positives, negatives)
+        metrics['roc_auc'] = roc_auc
+
+        result = {
+            'metrics': metrics,
+            'curve': curve,
+            'objective': objective,
+            'auc_error_bound': float(np.dot(self.positive_hist, self.negative_hist) / 2 / positives / negatives)
+            if positives and negatives else float('nan')
+        }
+        if len(occupied):
+            best = _best_index(curve, tps, fps, positives, negatives, objective)
+            result['best_threshold'] = float(curve['thresholds'][best])
+            result['best_metrics'] = _point_metrics(int(tps[best]), int(fps[best]), positives, negatives)
+            result['best_metrics']['roc_auc'] = roc_auc
+        return result
@@ -0,0 +1,61 @@
+"""
+逐行预测解释
+
+基于 Booster.predict(pred_contrib=True) 得到的逐特征贡献值（原始分数空间，
+最后一列为基准值），选出每行绝对贡献最大的前k个特征。
+"""
+
+import numpy as np
+
+
+def top_contributions(contrib, top_k=3):
+    """
+    选出每行绝对贡献最大的前k个特征
+
+    Args:
+        contrib: pred_contrib 的结果，形状为 (n, 特征数 + 1)，最后一列为基准值
+        top_k: 每行保留的特征数
+
+    Returns:
+        tuple: (特征下标 (n, k), 贡献值 (n, k), 基准值 (n,))，按绝对贡献从大到小排列
+    """
+    contrib = np.asarray(contrib)
+    feature_contrib = contrib[:, :-1]
+    top_k = min(top_k, feature_contrib.shape[1])
+
+    magnitude = np.abs(feature_contrib)
+    if top_k < feature_contrib.shape[1]:
+        candidates = np.argpartition(-magnitude, top_k - 1, axis=1)[:, :top_k]
+    else:
+        candidates = np.broadcast_to(np.arange(top_k), (len(contrib), top_k))
+    order = np.argsort(-np.take_along_axis(magnitude, candidates, axis=1), axis=1, kind='stable')
+    feature_index = np.take_along_axis(candidates, order, axis=1)
+    return feature_index, np.take_along_axis(feature_contrib, feature_index, axis=1), contrib[:, -1]
+
+
+def to_records(explanation, feature_names, row_ids=None):
+    """
+    把 LightGBMComplaintPredictor.explain 的结果转换为每行一个字典，只包含已解释的行
+
+    Args:
+        explanation: explain 返回的字典
+        feature_names: 特征名称
+        row_ids: 行标识（可选），默认使用行号
+
+    Returns:
+        List[Dict]: 每行的概率、基准值和前k个特征的贡献
+    """
+    rows = np.flatnonzero(explanation['explained'])
+    records = []
+    for row in rows.tolist():
+        records.append({
+            'row_id': row_ids[row] if row_ids is not None else row,
+            'probability': float(explanation['probability'][row]),
+            'base_value': float(explanation['base_value'][row]),
+            'contributions': [
+                {'feature': feature_names[index], 'contribution': float(value)}
+                for index, value in zip(explanation['feature_index'][row].tolist(),
+                                        explanation['contribution'][row].tolist())
+            ]
+        })
+    return records
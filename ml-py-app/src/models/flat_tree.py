@@ -0,0 +1,442 @@
+"""
+扁平数组树模型推理引擎
+
+将 LightGBM Booster 的 dump_model() 结果导出为扁平的NumPy节点数组
+（特征索引、阈值、左右子节点、叶子值）。单行预测时在Python列表上逐棵树
+从根走到叶子，避开 Booster.predict 的固定调用开销；多行时对所有树按层向量化遍历，
+比 Booster.predict 慢，适合不能导入lightgbm的进程。
+
+只依赖numpy，支持数值型分裂及LightGBM的缺失值处理规则，
+不支持类别特征分裂和多分类模型。
+"""
+
+import math
+
+import numpy as np
+
+from ..utils import copy_audit
+
+# LightGBM判断零值的阈值（kZeroThreshold）
+ZERO_THRESHOLD = 1e-35
+
+# missing_type 编码
+MISSING_NONE = 0
+MISSING_ZERO = 1
+MISSING_NAN = 2
+
+_MISSING_TYPES = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+
+
+def _sigmoid(x):
+    """
+    标量sigmoid，x很小时exp溢出，结果为0
+    """
+    if x < -700.0:
+        return 0.0
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+class FlatTreeEnsemble:
+    """
+    扁平数组表示的树集成模型
+
+    所有树的节点存放在同一组数组中，叶子节点的左右子节点指向自身，
+    这样遍历时无需区分叶子和内部节点，迭代 max_depth 次即可到达叶子
+    """
+
+    def __init__(self, feature, threshold, left, right, value, default_left,
+                 missing_type, roots, max_depth, num_features, sigmoid=None):
+        """
+        初始化模型
+
+        Args:
+            feature: 各节点的分裂特征索引，叶子为0
+            threshold: 各节点的分裂阈值
+            left: 左子节点的全局索引
+            right: 右子节点的全局索引
+            value: 叶子值，内部节点为0
+            default_left: 缺失值是否走左子树
+            missing_type: 缺失值类型编码
+            roots: 各棵树根节点的全局索引
+            max_depth: 所有树的最大深度
+            num_features: 特征数量
+            sigmoid: 二分类的sigmoid系数，为None时输出原始分数
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.roots = roots
+        self.max_depth = max_depth
+        self.num_features = num_features
+        self.sigmoid = sigmoid
+
+        # 特征值为NaN时的分裂方向只取决于节点本身，可以预先算出：
+        # NaN缺失类型走默认方向；其他类型按0处理，Zero缺失类型下0也走默认方向
+        zero_left = np.where(missing_type == MISSING_ZERO, default_left, 0.0 <= threshold)
+        self._nan_left = np.where(missing_type == MISSING_NAN, default_left, zero_left)
+        self._zero_missing = np.flatnonzero(missing_type == MISSING_ZERO)
+        # 单行逐树遍历使用的Python列表，首次使用时生成
+        self._walk_tables = None
+
+    @staticmethod
+    def _check_supported(num_tree_per_iteration, average_output):
+        """
+        检查模型类型是否受支持，两种导入方式共用
+        """
+        if num_tree_per_iteration != 1:
+            raise NotImplementedError("扁平推理引擎不支持多分类模型")
+        if average_output:
+            raise NotImplementedError("扁平推理引擎不支持随机森林模式")
+
+    @classmethod
+    def _build(cls, feature, threshold, left, right, value, default_left, missing_type, roots,
+               max_depth, num_features, objective):
+        """
+        由解析得到的节点列表构建模型，两种导入方式共用
+
+        Args:
+            objective: 模型的目标函数字符串，如 'binary sigmoid:1'，
+                二分类时从中读取sigmoid系数
+
+        Returns:
+            FlatTreeEnsemble: 导出的模型
+        """
+        sigmoid = None
+        if objective.startswith('binary'):
+            sigmoid = 1.0
+            for token in objective.split()[1:]:
+                if token.startswith('sigmoid:'):
+                    sigmoid = float(token.split(':', 1)[1])
+
+        return cls(
+            feature=np.asarray(feature, dtype=np.intp),
+            threshold=np.asarray(threshold, dtype=np.float64),
+            left=np.asarray(left, dtype=np.intp),
+            right=np.asarray(right, dtype=np.intp),
+            value=np.asarray(value, dtype=np.float64),
+            default_left=np.asarray(default_left, dtype=bool),
+            missing_type=np.asarray(missing_type, dtype=np.int8),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            num_features=num_features,
+            sigmoid=sigmoid
+        )
+
+    @classmethod
+    def from_booster(cls, booster, num_iteration=None):
+        """
+        从 LightGBM Booster 导出扁平模型
+
+        Args:
+            booster: lgb.Booster 对象
+            num_iteration: 使用的迭代次数，默认使用最佳迭代（没有时使用全部）
+
+        Returns:
+            FlatTreeEnsemble: 导出的模型
+        """
+        if num_iteration is None:
+            num_iteration = booster.best_iteration if booster.best_iteration > 0 else -1
+        return cls.from_dump(booster.dump_model(num_iteration=num_iteration))
+
+    @classmethod
+    def from_dump(cls, dump):
+        """
+        从 dump_model() 的结果导出扁平模型
+
+        Args:
+            dump: Booster.dump_model() 返回的字典
+
+        Returns:
+            FlatTreeEnsemble: 导出的模型
+        """
+        cls._check_supported(dump.get('num_tree_per_iteration', 1), dump.get('average_output', False))
+
+        feature, threshold, left, right = [], [], [], []
+        value, default_left, missing_type = [], [], []
+        roots = []
+        max_depth = 0
+
+        for tree in dump['tree_info']:
+            roots.append(len(feature))
+            # 显式栈做前序遍历，先为节点分配索引再回填子节点
+            stack = [(tree['tree_structure'], len(feature), 0)]
+            feature.append(0)
+            threshold.append(0.0)
+            left.append(0)
+            right.append(0)
+            value.append(0.0)
+            default_left.append(False)
+            missing_type.append(MISSING_NONE)
+
+            while stack:
+                node, index, depth = stack.pop()
+                max_depth = max(max_depth, depth)
+
+                if 'leaf_value' in node:
+                    value[index] = node['leaf_value']
+                    left[index] = index
+                    right[index] = index
+                    continue
+
+                if node['decision_type'] != '<=':
+                    raise NotImplementedError("扁平推理引擎不支持类别特征分裂")
+
+                feature[index] = node['split_feature']
+                threshold[index] = node['threshold']
+                default_left[index] = node['default_left']
+                missing_type[index] = _MISSING_TYPES[node['missing_type']]
+
+                for child_key, targets in (('left_child', left), ('right_child', right)):
+                    child_index = len(feature)
+                    targets[index] = child_index
+                    feature.append(0)
+                    threshold.append(0.0)
+                    left.append(0)
+                    right.append(0)
+                    value.append(0.0)
+                    default_left.append(False)
+                    missing_type.append(MISSING_NONE)
+                    stack.append((node[child_key], child_index, depth + 1))
+
+        return cls._build(feature, threshold, left, right, value, default_left, missing_type, roots,
+                          max_depth, dump['max_feature_idx'] + 1, dump.get('objective', ''))
+
+    @classmethod
+    def from_model_file(cls, file_path):
+        """
+        从 LightGBM 文本格式模型文件导出扁平模型，不需要导入lightgbm
+
+        Args:
+            file_path: Booster.save_model 保存的 model.txt
+
+        Returns:
+            FlatTreeEnsemble: 导出的模型
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return cls.from_model_string(f.read())
+
+    @classmethod
+    def from_model_string(cls, model_str):
+        """
+        解析 LightGBM 文本格式模型
+
+        文本中每棵树以 "Tree=" 开头，内部节点的子节点为非负数，
+        叶子用 ~叶子编号 表示；decision_type 的第0位为类别分裂，
+        第1位为缺失值走左子树，第2-3位为缺失值类型
+
+        Args:
+            model_str: Booster.model_to_string() 的结果
+
+        Returns:
+            FlatTreeEnsemble: 导出的模型
+        """
+        header, _, body = model_str.partition('\nTree=')
+        header_fields = dict(line.split('=', 1) for line in header.splitlines() if '=' in line)
+        cls._check_supported(int(header_fields.get('num_tree_per_iteration', 1)),
+                             'average_output' in header.splitlines())
+
+        feature, threshold, left, right = [], [], [], []
+        value, default_left, missing_type = [], [], []
+        roots = []
+        max_depth = 0
+
+        trees_text = body.split('end of trees', 1)[0]
+        for tree_text in ('Tree=' + trees_text).split('\nTree=') if trees_text else []:
+            fields = dict(line.split('=', 1) for line in tree_text.splitlines() if '=' in line)
+            base = len(feature)
+            roots.append(base)
+            num_leaves = int(fields['num_leaves'])
+            leaf_value = np.array(fields['leaf_value'].split(), dtype=np.float64)
+
+            if num_leaves == 1:
+                feature.append(0)
+                threshold.append(0.0)
+                left.append(base)
+                right.append(base)
+                value.append(float(leaf_value[0]))
+                default_left.append(False)
+                missing_type.append(MISSING_NONE)
+                continue
+
+            num_internal = num_leaves - 1
+            decision_type = np.array(fields['decision_type'].split(), dtype=np.int64)
+            if np.any(decision_type & 1):
+                raise NotImplementedError("扁平推理引擎不支持类别特征分裂")
+
+            def to_global(children):
+                # 非负为内部节点编号，负数 ~j 为第j个叶子，叶子排在内部节点之后
+                children = np.array(children.split(), dtype=np.int64)
+                return np.where(children >= 0, base + children, base + num_internal + ~children)
+
+            feature.extend(int(x) for x in fields['split_feature'].split())
+            threshold.extend(float(x) for x in fields['threshold'].split())
+            left.extend(to_global(fields['left_child']).tolist())
+            right.extend(to_global(fields['right_child']).tolist())
+            value.extend([0.0] * num_internal)
+            default_left.extend(((decision_type >> 1) & 1).astype(bool).tolist())
+            missing_type.extend(((decision_type >> 2) & 3).tolist())
+
+            # 叶子节点：子节点指向自身
+            leaf_index = range(base + num_internal, base + num_internal + num_leaves)
+            feature.extend([0] * num_leaves)
+            threshold.extend([0.0] * num_leaves)
+            left.extend(leaf_index)
+            right.extend(leaf_index)
+            value.extend(leaf_value.tolist())
+            default_left.extend([False] * num_leaves)
+            missing_type.extend([MISSING_NONE] * num_leaves)
+
+            # 逐层向下计算树深度
+            depth = 0
+            level = [base]
+            while level:
+                depth += 1
+                level = [child for node in level for child in (left[node], right[node])
+                         if child < base + num_internal]
+            max_depth = max(max_depth, depth)
+
+        return cls._build(feature, threshold, left, right, value, default_left, missing_type, roots,
+                          max_depth, int(header_fields['max_feature_idx']) + 1,
+                          header_fields.get('objective', ''))
+
+    @property
+    def num_trees(self):
+        return len(self.roots)
+
+    def predict_raw(self, X, block_size=4096, small_batch=1):
+        """
+        计算原始分数（所有树叶子值之和）
+
+        Args:
+            X: 特征矩阵，形状为 (n_samples, n_features)
+            block_size: 每次遍历的行数，限制 (行数 x 树数) 中间数组的大小
+            small_batch: 不超过该行数时逐行逐树从根走到叶子；行数更多时
+                对所有树按层向量化遍历
+
+        Returns:
+            np.ndarray: 原始分数
+        """
+        # float32特征保持原类型：与float64阈值比较时按float64进行，结果与LightGBM一致
+        dtype = getattr(X, 'dtype', None)
+        X = copy_audit.ensure_array(X, 'flat_predict',
+                                    dtype if dtype in (np.float32, np.float64) else np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.num_features:
+            raise ValueError(f"特征数量不匹配: 期望 {self.num_features}，实际 {X.shape[1]}")
+
+        if len(X) <= small_batch:
+            return np.array(self._walk_rows(X))
+
+        result = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), block_size):
+            result[start:start + block_size] = self._predict_by_level(X[start:start + block_size])
+        return result
+
+    def _walk_rows(self, X):
+        """
+        逐行逐棵树从根走到叶子计算原始分数
+
+        只比较阈值，每棵树只访问路径上的节点；行内有NaN，或有接近0的值且模型含Zero缺失类型时，
+        该行改用按层遍历处理缺失值规则
+
+        Returns:
+            List[float]: 各行的原始分数
+        """
+        if self._walk_tables is None:
+            # 子节点为叶子时编码为 ~叶子索引（负数），遍历到负数即停止
+            left, right = self.left.tolist(), self.right.tolist()
+            is_leaf = [child == node for node, child in enumerate(left)]
+
+            def encode(children):
+                return [~child if is_leaf[child] else child for child in children]
+
+            self._walk_tables = (self.feature.tolist(), self.threshold.tolist(), encode(left),
+                                 encode(right), self.value.tolist(), encode(self.roots.tolist()))
+        feature, threshold, left, right, value, roots = self._walk_tables
+
+        scores = []
+        for i, row in enumerate(X.tolist()):
+            if any(v != v for v in row) or (len(self._zero_missing) and
+                                            any(abs(v) <= ZERO_THRESHOLD for v in row)):
+                scores.append(float(self._predict_by_level(X[i:i + 1])[0]))
+                continue
+
+            # 与LightGBM相同，按树的顺序逐棵累加
+            total = 0.0
+            for node in roots:
+                while node >= 0:
+                    node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+                total += value[~node]
+            scores.append(total)
+        return scores
+
+    def _go_left(self, values, nodes=None):
+        """
+        与LightGBM NumericalDecision一致的分裂方向判断
+
+        Args:
+            values: 各位置对应的特征值
+            nodes: 各位置对应的节点索引，为None时values的最后一维对应全部节点
+
+        Returns:
+            np.ndarray: 是否走左子树
+        """
+        if nodes is None:
+            nodes = slice(None)
+            node_index = np.arange(len(self.feature))
+        else:
+            node_index = nodes
+
+        go_left = values <= self.threshold[nodes]
+
+        is_nan = np.isnan(values)
+        if is_nan.any():
+            go_left[is_nan] = self._nan_left[np.broadcast_to(node_index, values.shape)[is_nan]]
+
+        if len(self._zero_missing):
+            is_zero_missing = (np.abs(values) <= np.float64(ZERO_THRESHOLD)) & \
+                              (self.missing_type[nodes] == MISSING_ZERO)
+            if is_zero_missing.any():
+                go_left[is_zero_missing] = self.default_left[
+                    np.broadcast_to(node_index, values.shape)[is_zero_missing]]
+
+        return go_left
+
+    def _predict_by_level(self, X):
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.num_trees)).copy()
+
+        for _ in range(self.max_depth):
+            go_left = self._go_left(X[rows, self.feature[nodes]], nodes)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.value[nodes].sum(axis=1)
+
+    def predict(self, X, block_size=4096, small_batch=1):
+        """
+        计算预测值，二分类模型返回正类概率
+
+        Args:
+            X: 特征矩阵
+            block_size: 每次遍历的行数
+            small_batch: 逐行逐树遍历的行数上限
+
+        Returns:
+            np.ndarray: 预测值
+        """
+        raw = self.predict_raw(X, block_size, small_batch)
+        if self.sigmoid is None:
+            return raw
+        if len(raw) <= small_batch:
+            # 单行时numpy的逐元素运算开销远大于计算本身
+            return np.array([_sigmoid(self.sigmoid * score) for score in raw.tolist()])
+        return 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+
+    def __repr__(self):
+        return (f"FlatTreeEnsemble(num_trees={self.num_trees}, num_nodes={len(self.feature)}, "
+                f"max_depth={self.max_depth})")
@@ -0,0 +1,154 @@
+"""
+精简推理入口
+
+只提供预测进程需要的功能：加载原生格式模型、特征转换、预测和风险分级。
+模块本身只依赖标准库和numpy，不导入pandas、sklearn、matplotlib和joblib。
+
+两种后端：
+    'native'  使用 lightgbm.Booster，首次加载模型时才导入lightgbm
+              （注意lightgbm自身在安装了pandas/sklearn时会导入它们）
+    'flat'    直接解析 model.txt 为扁平数组模型，整个推理路径只依赖numpy，
+              适合对启动时间和内存最敏感的打分进程
+"""
+
+import os
+
+from ..data.scaling import minmax_params, minmax_transform
+from ..utils.hashing import file_sha256
+from ..utils.utils import calculate_risk_levels, risk_level_codes
+from .model_io import is_native_path, read_manifest, load_booster
+
+BACKENDS = ('native', 'flat')
+
+
+class InferenceModel:
+    """
+    只用于预测的轻量模型
+    """
+
+    def __init__(self, model_dir, backend='native', verify=True):
+        """
+        加载原生格式模型
+
+        Args:
+            model_dir: save_model 保存的原生格式模型目录（.lgbm）
+            backend: 'native' 或 'flat'
+            verify: 是否校验模型文件的SHA-256
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"不支持的推理后端: {backend}")
+        if not is_native_path(model_dir):
+            raise ValueError(f"精简推理入口只支持原生格式模型目录: {model_dir}")
+
+        self.model_dir = model_dir
+        self.backend = backend
+        self.manifest = read_manifest(model_dir)
+        self.feature_names = self.manifest['feature_names']
+        self.scaler_state = self.manifest.get('scaler_state')
+        self._scaler_params = minmax_params(self.scaler_state) if self.scaler_state else None
+
+        if backend == 'native':
+            self._model = load_booster(model_dir, self.manifest, verify=verify)
+        else:
+            from .flat_tree import FlatTreeEnsemble
+
+            model_path = os.path.join(model_dir, self.manifest['model_file'])
+            if verify and file_sha256(model_path) != self.manifest['sha256']:
+                raise ValueError(f"模型文件校验失败: {model_path}")
+            # 文件中的树已截断到最佳迭代，直接使用全部树
+            self._model = FlatTreeEnsemble.from_model_file(model_path)
+
+    def transform(self, X):
+        """
+        使用模型配套的scaler状态转换原始特征
+
+        Args:
+            X: 原始特征矩阵，或包含特征列的表格对象（如DataFrame）
+
+        Returns:
+            np.ndarray: 标准化后的C连续特征矩阵，类型与训练时的特征矩阵一致
+        """
+        if self._scaler_params is None:
+            raise ValueError("模型没有配套的scaler状态")
+
+        scale, offset = self._scaler_params
+        dtype = self.scaler_state.get('dtype', 'float64')
+        # 按列名选取并直接写入输出数组，无需导入pandas
+        if hasattr(X, 'columns'):
+            return minmax_transform(X, scale, offset, dtype=dtype, columns=self.scaler_state['feature_columns'])
+        return minmax_transform(X, scale, offset, dtype=dtype)
+
+    def predict_proba(self, X):
+        """
+        预测正类概率
+
+        Args:
+            X: 已转换的特征矩阵
+
+        Returns:
+            np.ndarray: 预测概率
+        """
+        return self._model.predict(X)
+
+    def predict(self, X, threshold=0.5):
+        """
+        预测概率和类别，与 LightGBMComplaintPredictor.predict 一致
+
+        Args:
+            X: 已转换的特征矩阵
+            threshold: 分类阈值
+
+        Returns:
+            tuple: (预测概率, 预测类别)
+        """
+        y_pred_proba = self.predict_proba(X)
+        return y_pred_proba, (y_pred_proba >= threshold).astype(int)
+
+    @staticmethod
+    def bucket(probabilities):
+        """
+        批量计算风险等级
+
+        Args:
+            probabilities: 预测概率
+
+        Returns:
+            tuple: (风险等级数组, 风险类别数组)
+        """
+        return calculate_risk_levels(probabilities)
+
+    def score(self, X, threshold=0.5, raw=True):
+        """
+        完整的打分流程：转换、预测、分级
+
+        Args:
+            X: 特征矩阵或表格对象
+            threshold: 分类阈值
+            raw: X是否为未转换的原始特征
+
+        Returns:
+            Dict: probability、predicted_class、risk_code 数组
+        """
+        if raw:
+            X = self.transform(X)
+        y_pred_proba, y_pred_class = self.predict(X, threshold)
+        return {
+            'probability': y_pred_proba,
+            'predicted_class': y_pred_class,
+            'risk_code': risk_level_codes(y_pred_proba)
+        }
+
+
+def load(model_dir, backend='native', verify=True):
+    """
+    加载精简推理模型
+
+    Args:
+        model_dir: 原生格式模型目录
+        backend: 'native' 或 'flat'
+        verify: 是否校验模型文件的SHA-256
+
+    Returns:
+        InferenceModel: 加载的模型
+    """
+    return InferenceModel(model_dir, backend=backend, verify=verify)
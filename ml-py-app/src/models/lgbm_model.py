@@ -1,10 +1,25 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import lightgbm as lgb
 import numpy as np
 import pandas as pd
-import joblib
-import matplotlib.pyplot as plt
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score, confusion_matrix
+# matplotlib、sklearn.metrics和joblib只在绘图、评估和保存/加载时按需导入，
+# 只做预测的进程不需要为它们付出导入时间和内存
 from typing import Dict, List, Tuple, Optional
+from ..data.scaling import minmax_params, minmax_transform
+from .flat_tree import FlatTreeEnsemble
+from .prediction_cache import PredictionCache
+from .explain import top_contributions
+from .evaluation import evaluate_scores, StreamingMetrics
+from .tuning import (HyperparameterSearch, grid_candidates, random_candidates,
+                     ITERATION_ALIASES, THREAD_ALIASES)
+from .model_io import is_native_path, save_native, read_manifest, load_booster
+from ..utils.prediction_writer import PredictionWriter
+from ..utils.utils import calculate_risk_levels
+from ..utils.instrumentation import instrument
+from ..utils import copy_audit
 
 class LightGBMComplaintPredictor:
     """
@@ -16,9 +31,121 @@ class LightGBMComplaintPredictor:
         """
         初始化模型
         """
-        self.model = None
+        self._model = None
+        self._lazy_model_dir = None  # 原生格式模型目录，首次访问model时才构建Booster
+        self._lazy_manifest = None
         self.params = None
         self.feature_names = None
+        self.scaler_state = None  # 训练时拟合的scaler状态，随模型一起保存
+        self._scaler_params = None  # 由scaler_state计算出的 (scale, offset)
+        self._flat_model = None  # 按需导出的扁平数组推理模型
+        self._prediction_cache = None  # 可选的预测结果缓存
+        self._explanation_cache = None  # 启用预测缓存后，explain按需创建的贡献值缓存
+        self._model_version = 0  # 每次替换模型时递增，参与缓存键计算
+        self.lineage = []  # 模型谱系：初次训练及之后每次增量更新的记录
+    
+    @property
+    def model(self):
+        """
+        底层的LightGBM Booster，原生格式加载的模型在首次访问时构建
+        """
+        if self._model is None and self._lazy_model_dir is not None:
+            self._model = load_booster(self._lazy_model_dir, self._lazy_manifest)
+            self._lazy_model_dir = None
+            self._lazy_manifest = None
+        return self._model
+    
+    @model.setter
+    def model(self, booster):
+        self._model = booster
+        self._lazy_model_dir = None
+        self._lazy_manifest = None
+    
+    def _on_model_changed(self):
+        """
+        模型被替换后清理由旧模型派生的状态
+        """
+        self._flat_model = None
+        self._model_version += 1
+        if self._prediction_cache is not None:
+            self._prediction_cache.clear()
+        self._explanation_cache = None
+    
+    def enable_prediction_cache(self, max_entries: int = 100000, ttl: Optional[float] = None,
+                                decimals: int = 6):
+        """
+        启用预测结果缓存
+        
+        以量化后特征行的哈希和模型版本为键缓存预测概率，
+        批量预测时只对未命中的行调用模型；explain 的逐特征贡献值
+        以相同的键和设置另行缓存
+        
+        Args:
+            max_entries: 最大缓存条目数，超过时按LRU淘汰
+            ttl: 条目有效期（秒），为None时不过期
+            decimals: 特征量化保留的小数位数
+        """
+        self._prediction_cache = PredictionCache(max_entries=max_entries, ttl=ttl, decimals=decimals)
+        self._explanation_cache = None
+    
+    def disable_prediction_cache(self):
+        """
+        关闭预测结果缓存
+        """
+        self._prediction_cache = None
+        self._explanation_cache = None
+    
+    def get_cache_stats(self):
+        """
+        获取预测缓存的统计信息
+        
+        Returns:
+            Dict: 命中/未命中次数等统计信息，未启用缓存时返回None；
+                调用过explain时 'explanations' 为贡献值缓存的统计信息
+        """
+        if self._prediction_cache is None:
+            return None
+        stats = self._prediction_cache.stats()
+        if self._explanation_cache is not None:
+            stats['explanations'] = self._explanation_cache.stats()
+        return stats
+    
+    def set_scaler_state(self, scaler_state: Optional[Dict]):
+        """
+        设置与模型配套的scaler状态
+        
+        Args:
+            scaler_state: PowerGridDataProcessor.get_scaler_state() 返回的字典
+        """
+        self.scaler_state = scaler_state
+        self._scaler_params = None
+    
+    def transform(self, X):
+        """
+        使用训练时拟合的scaler转换原始特征，不重新拟合
+        
+        Args:
+            X: 原始特征矩阵，或包含特征列的DataFrame
+            
+        Returns:
+            np.ndarray: 标准化后的C连续特征矩阵，类型与训练时的特征矩阵一致
+                （旧版本保存的scaler状态没有记录类型，使用float64）
+        """
+        if self.scaler_state is None:
+            raise ValueError("模型没有配套的scaler状态，请先调用set_scaler_state")
+        
+        if self._scaler_params is None:
+            self._scaler_params = minmax_params(self.scaler_state)
+        
+        scale, offset = self._scaler_params
+        dtype = np.dtype(self.scaler_state.get('dtype', 'float64'))
+        if isinstance(X, pd.DataFrame):
+            features = minmax_transform(X, scale, offset, dtype=dtype,
+                                        columns=self.scaler_state['feature_columns'])
+        else:
+            features = minmax_transform(X, scale, offset, dtype=dtype)
+        copy_audit.record('transform', features, 'transform')
+        return features
     
     def set_params(self, params: Optional[Dict] = None):
         """
@@ -52,6 +179,57 @@ class LightGBMComplaintPredictor:
         else:
             self.params = params
     
+    def tune(self, X_train: np.ndarray, y_train: np.ndarray,
+             X_valid: np.ndarray, y_valid: np.ndarray,
+             param_grid: Optional[Dict] = None,
+             param_distributions: Optional[Dict] = None,
+             n_trials: int = 20, strategy: str = 'full',
+             num_boost_round: int = 500, n_workers: Optional[int] = None,
+             metric: str = 'binary_logloss', **search_kwargs):
+        """
+        超参数搜索，结束后将最佳参数设置为模型参数
+        
+        训练集只分箱一次并以二进制Dataset共享给各试验进程，详见 HyperparameterSearch
+        
+        Args:
+            X_train: 训练特征数据
+            y_train: 训练标签数据
+            X_valid: 验证特征数据
+            y_valid: 验证标签数据
+            param_grid: 网格搜索的参数候选值
+            param_distributions: 随机搜索的参数分布（与param_grid二选一）
+            n_trials: 随机搜索的采样次数
+            strategy: 'full' 或 'halving'（逐次减半剪枝）
+            num_boost_round: 每个试验的最大迭代次数
+            n_workers: 并行试验的进程数
+            metric: 用于排序的验证集指标
+            **search_kwargs: 传给 HyperparameterSearch.fit 的其他参数
+            
+        Returns:
+            List[Dict]: 按验证指标和耗时排序的试验结果
+        """
+        if (param_grid is None) == (param_distributions is None):
+            raise ValueError("需要且只能指定param_grid或param_distributions之一")
+        
+        if self.params is None:
+            self.set_params()
+        
+        if param_grid is not None:
+            candidates = grid_candidates(param_grid)
+        else:
+            candidates = random_candidates(param_distributions, n_trials)
+        
+        search = HyperparameterSearch(base_params=self.params, metric=metric, n_workers=n_workers)
+        results = search.fit(X_train, y_train, X_valid, y_valid, candidates,
+                             num_boost_round=num_boost_round, strategy=strategy,
+                             feature_names=self.feature_names, **search_kwargs)
+        
+        params = dict(self.params)
+        params.update(search.best_params_)
+        self.params = params
+        return results
+    
+    @instrument(rows_from='X_train')
     def train(self, X_train: np.ndarray, y_train: np.ndarray, 
               X_valid: Optional[np.ndarray] = None, 
               y_valid: Optional[np.ndarray] = None,
@@ -80,15 +258,77 @@ class LightGBMComplaintPredictor:
             # 如果没有提供特征名称，生成默认名称
             self.feature_names = [f'feature_{i}' for i in range(X_train.shape[1])]
         
-        # 创建LightGBM数据集
+        # 创建LightGBM数据集，C连续的float32/float64矩阵和float32标签不会再被复制
+        X_train = copy_audit.ensure_array(X_train, 'train')
+        y_train = copy_audit.ensure_array(y_train, 'train', np.float32)
         lgb_train = lgb.Dataset(X_train, label=y_train, feature_name=self.feature_names)
         
         # 如果有验证集，创建验证数据集
-        valid_sets = [lgb_train]
-        valid_names = ['train']
-        
+        lgb_valid = None
         if X_valid is not None and y_valid is not None:
+            X_valid = copy_audit.ensure_array(X_valid, 'train')
+            y_valid = copy_audit.ensure_array(y_valid, 'train', np.float32)
             lgb_valid = lgb.Dataset(X_valid, label=y_valid, feature_name=self.feature_names)
+        
+        return self._train_dataset(lgb_train, lgb_valid)
+    
+    @instrument()
+    def train_out_of_core(self, train_paths: List[str], valid_paths: Optional[List[str]] = None,
+                          feature_columns: Optional[List[str]] = None,
+                          target_column: str = 'complaint_label', file_format: Optional[str] = None,
+                          block_size: int = 65536, dtype=np.float64):
+        """
+        从分区文件进行核外训练，不物化完整的特征矩阵
+        
+        每个分区包装为 lgb.Sequence，构建数据集时按块顺序读取并用scaler状态转换，
+        内存中只保留当前块、LightGBM的分箱数据和标签。
+        
+        Args:
+            train_paths: 训练分区路径列表（CSV、Parquet 或 npy 路径前缀）
+            valid_paths: 验证分区路径列表（可选）
+            feature_columns: 文件中的特征列，默认使用scaler状态中的特征列
+            target_column: 目标列名
+            file_format: 分区格式，默认根据路径判断
+            block_size: 每次读取的行数
+            dtype: 特征的浮点类型
+            
+        Returns:
+            self: 训练好的模型实例
+        """
+        from .out_of_core import build_dataset
+        
+        if self.params is None:
+            self.set_params()
+        
+        if feature_columns is None:
+            if self.scaler_state is None:
+                raise ValueError("未设置scaler状态时需要提供feature_columns")
+            feature_columns = self.scaler_state['feature_columns']
+        self.feature_names = list(feature_columns)
+        
+        scaler_params = None
+        if self.scaler_state is not None:
+            if self._scaler_params is None:
+                self._scaler_params = minmax_params(self.scaler_state)
+            scaler_params = self._scaler_params
+        
+        dataset_kwargs = {'feature_columns': feature_columns, 'target_column': target_column,
+                          'scaler_params': scaler_params, 'file_format': file_format,
+                          'dtype': dtype, 'block_size': block_size}
+        lgb_train = build_dataset(train_paths, params=self.params, **dataset_kwargs)
+        lgb_valid = None
+        if valid_paths:
+            lgb_valid = build_dataset(valid_paths, reference=lgb_train, **dataset_kwargs)
+        
+        return self._train_dataset(lgb_train, lgb_valid)
+    
+    def _train_dataset(self, lgb_train, lgb_valid):
+        """
+        在已创建的数据集上训练并记录谱系
+        """
+        valid_sets = [lgb_train]
+        valid_names = ['train']
+        if lgb_valid is not None:
             valid_sets.append(lgb_valid)
             valid_names.append('valid')
         
@@ -103,16 +343,114 @@ class LightGBMComplaintPredictor:
                 lgb.early_stopping(stopping_rounds=50, verbose=True)  # 早停策略
             ]
         )
+        self._on_model_changed()
+        self.lineage = []
+        self.lineage.append(self._lineage_entry('train', lgb_train.num_data(), accepted=True))
         
         return self
     
-    def predict(self, X: np.ndarray, threshold: float = 0.5):
+    def _lineage_entry(self, mode, rows, accepted, **extra):
+        """
+        生成一条模型谱系记录
+        """
+        accepted_versions = [item['version'] for item in self.lineage if item['accepted']]
+        entry = {
+            'version': len(self.lineage) + 1,
+            'parent_version': accepted_versions[-1] if accepted_versions else None,
+            'mode': mode,
+            'rows': int(rows),
+            'num_trees': self.model.num_trees(),
+            'accepted': accepted,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        entry.update(extra)
+        return entry
+    
+    def update(self, X_new: np.ndarray, y_new: np.ndarray,
+               X_holdout: Optional[np.ndarray] = None,
+               y_holdout: Optional[np.ndarray] = None,
+               mode: str = 'continue', num_boost_round: int = 20,
+               decay_rate: float = 0.9, max_degradation: float = 0.0):
+        """
+        用新数据增量更新模型，无需在全部历史数据上重新训练
+        
+        Args:
+            X_new: 新增特征数据
+            y_new: 新增标签数据
+            X_holdout: 留出集特征，用于防止更新后模型变差（可选）
+            y_holdout: 留出集标签
+            mode: 'continue' 在当前booster基础上继续追加 num_boost_round 棵树；
+                'refit' 保持树结构不变，只用新数据重新拟合叶子值
+            num_boost_round: continue模式下追加的迭代次数
+            decay_rate: refit模式下旧叶子值的保留比例
+            max_degradation: 允许留出集logloss相对变差的比例，超过时放弃本次更新
+            
+        Returns:
+            Dict: 本次更新的谱系记录，accepted为False表示已回滚到更新前的模型；
+                num_trees、holdout_logloss 为保留的模型，candidate_num_trees、
+                candidate_holdout_logloss 为本次更新得到的候选模型
+        """
+        if self.model is None:
+            raise ValueError("模型尚未训练，请先训练模型")
+        
+        start_time = time.perf_counter()
+        booster = self.model
+        
+        # 早停后多训练的树不参与预测，继续训练前先截断到最佳迭代
+        if booster.best_iteration > 0 and booster.best_iteration < booster.num_trees():
+            booster = lgb.Booster(model_str=booster.model_to_string(num_iteration=booster.best_iteration))
+        
+        if mode == 'continue':
+            params = dict(self.params or {})
+            for alias in ITERATION_ALIASES:
+                params.pop(alias, None)
+            params['verbose'] = -1
+            lgb_new = lgb.Dataset(copy_audit.ensure_array(X_new, 'update'),
+                                  label=copy_audit.ensure_array(y_new, 'update', np.float32),
+                                  feature_name=self.feature_names)
+            updated = lgb.train(params, lgb_new, num_boost_round=num_boost_round,
+                                init_model=booster, keep_training_booster=True)
+        elif mode == 'refit':
+            updated = booster.refit(X_new, y_new, decay_rate=decay_rate)
+        else:
+            raise ValueError(f"不支持的更新模式: {mode}")
+        
+        holdout = {}
+        accepted = True
+        if X_holdout is not None and y_holdout is not None:
+            from sklearn.metrics import log_loss
+            
+            before = log_loss(y_holdout, booster.predict(X_holdout), labels=[0, 1])
+            after = log_loss(y_holdout, updated.predict(X_holdout), labels=[0, 1])
+            holdout = {'holdout_logloss_before': before, 'holdout_logloss_after': after}
+            accepted = after <= before * (1 + max_degradation)
+            # 保留下来的模型和本次候选模型的留出集得分分开记录，回滚时也能看到被拒绝的候选
+            holdout['holdout_logloss'] = after if accepted else before
+            holdout['candidate_holdout_logloss'] = after
+        
+        elapsed = time.perf_counter() - start_time
+        if accepted:
+            self.model = updated
+            self._on_model_changed()
+        else:
+            print(f"增量更新使留出集logloss从 {holdout['holdout_logloss_before']:.5f} "
+                  f"变为 {holdout['holdout_logloss_after']:.5f}，已放弃本次更新")
+        
+        entry = self._lineage_entry(mode, len(y_new), accepted, seconds=elapsed,
+                                    candidate_num_trees=updated.num_trees(), **holdout)
+        self.lineage.append(entry)
+        return entry
+    
+    @instrument(rows_from='X')
+    def predict(self, X: np.ndarray, threshold: float = 0.5, backend: str = 'native'):
         """
         使用模型进行预测
         
         Args:
             X: 待预测的特征数据
             threshold: 分类阈值
+            backend: 推理后端，'native' 使用 Booster.predict，
+                'flat' 使用扁平数组推理引擎（只有单行时比native快，多行时更慢）
             
         Returns:
             tuple: (预测概率, 预测类别)
@@ -121,13 +459,283 @@ class LightGBMComplaintPredictor:
             raise ValueError("模型尚未训练，请先训练模型")
         
         # 预测概率
-        y_pred_proba = self.model.predict(X)
+        if self._prediction_cache is None:
+            y_pred_proba = self._predict_proba(X, backend)
+        else:
+            y_pred_proba = self._predict_proba_cached(X, backend)
         
         # 根据阈值预测类别
         y_pred_class = (y_pred_proba >= threshold).astype(int)
         
         return y_pred_proba, y_pred_class
     
+    def _predict_proba(self, X, backend):
+        if backend == 'native':
+            return self.model.predict(copy_audit.ensure_array(X, 'predict'))
+        if backend == 'flat':
+            return self.get_flat_model().predict(X)
+        raise ValueError(f"不支持的推理后端: {backend}")
+    
+    def _predict_proba_cached(self, X, backend):
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        
+        cache = self._prediction_cache
+        keys = cache.keys(X, self._model_version)
+        y_pred_proba, hit_mask = cache.get_many(keys)
+        
+        # 只对未命中的行调用模型
+        miss_index = np.flatnonzero(~hit_mask)
+        if len(miss_index):
+            miss_proba = self._predict_proba(X[miss_index], backend)
+            y_pred_proba[miss_index] = miss_proba
+            cache.put_many(keys[miss_index], miss_proba)
+        
+        return y_pred_proba
+    
+    @instrument(rows_from='X')
+    def explain(self, X: np.ndarray, top_k: int = 3, min_probability: Optional[float] = None,
+                n_workers: Optional[int] = None, chunk_size: int = 10000):
+        """
+        逐行解释预测结果：每行贡献最大的前k个特征
+        
+        贡献值来自 Booster.predict(pred_contrib=True)，位于原始分数（对数几率）空间，
+        各特征贡献与基准值之和等于该行的原始分数。大批量数据按 chunk_size 分块
+        在线程池中计算；启用预测缓存时，已解释过的行直接从缓存读取贡献值。
+        
+        Args:
+            X: 已转换的特征矩阵
+            top_k: 每行返回的特征数
+            min_probability: 快速模式，只解释预测概率不低于该值的行（如高风险小区），
+                为None时解释全部行
+            n_workers: 并行计算的线程数，默认为CPU核数
+            chunk_size: 每块的行数
+            
+        Returns:
+            Dict: 包含
+                probability: 每行的预测概率
+                explained: 每行是否已解释
+                feature_index: 前k个特征的下标 (n, k)，未解释的行为-1
+                feature: 前k个特征的名称 (n, k)，未解释的行为None
+                contribution: 对应的贡献值 (n, k)，未解释的行为NaN
+                base_value: 基准值，未解释的行为NaN
+        """
+        if self.model is None:
+            raise ValueError("模型尚未训练，请先训练模型")
+        
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        
+        y_pred_proba, _ = self.predict(X)
+        if min_probability is None:
+            rows = np.arange(len(X))
+        else:
+            rows = np.flatnonzero(y_pred_proba >= min_probability)
+        
+        width = X.shape[1] + 1
+        contrib = np.empty((len(rows), width))
+        todo = np.arange(len(rows))
+        if self._prediction_cache is not None:
+            if self._explanation_cache is None:
+                cache = self._prediction_cache
+                self._explanation_cache = PredictionCache(max_entries=cache.max_entries, ttl=cache.ttl,
+                                                          decimals=cache.decimals, width=width)
+            keys = self._explanation_cache.keys(X[rows], self._model_version)
+            contrib, hit_mask = self._explanation_cache.get_many(keys)
+            todo = np.flatnonzero(~hit_mask)
+        
+        if len(todo):
+            cpu_count = os.cpu_count() or 1
+            n_workers = n_workers or cpu_count
+            num_threads = max(1, cpu_count // n_workers)
+            todo_rows = rows[todo]
+            
+            def compute(start):
+                X_chunk = X[todo_rows[start:start + chunk_size]]
+                return start, self.model.predict(X_chunk, pred_contrib=True, num_threads=num_threads)
+            
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                for start, chunk_contrib in executor.map(compute, range(0, len(todo), chunk_size)):
+                    contrib[todo[start:start + chunk_size]] = chunk_contrib
+            
+            if self._explanation_cache is not None:
+                self._explanation_cache.put_many(keys[todo], contrib[todo])
+        
+        feature_index, contribution, base_value = top_contributions(contrib, top_k)
+        top_k = feature_index.shape[1]
+        
+        explanation = {
+            'probability': y_pred_proba,
+            'explained': np.zeros(len(X), dtype=bool),
+            'feature_index': np.full((len(X), top_k), -1, dtype=np.intp),
+            'feature': np.full((len(X), top_k), None, dtype=object),
+            'contribution': np.full((len(X), top_k), np.nan),
+            'base_value': np.full(len(X), np.nan)
+        }
+        explanation['explained'][rows] = True
+        explanation['feature_index'][rows] = feature_index
+        explanation['feature'][rows] = np.asarray(self.feature_names, dtype=object)[feature_index]
+        explanation['contribution'][rows] = contribution
+        explanation['base_value'][rows] = base_value
+        return explanation
+    
+    def shared_scorer(self, n_workers: Optional[int] = None, num_threads: int = 1):
+        """
+        创建基于共享内存的多进程打分器，工作进程和模型可在多次打分之间复用
+        
+        Args:
+            n_workers: 进程数，默认为CPU核数
+            num_threads: 每个进程内LightGBM的线程数
+            
+        Returns:
+            SharedMemoryScorer: 打分器，使用完毕后调用close（或用with语句）
+        """
+        from .shared_scoring import SharedMemoryScorer
+        
+        if self.model is None:
+            raise ValueError("模型尚未训练，请先训练模型")
+        return SharedMemoryScorer(self.model, n_workers=n_workers, num_threads=num_threads)
+    
+    @instrument(rows_from='X')
+    def predict_shared(self, X, threshold: float = 0.5, n_workers: Optional[int] = None,
+                       chunk_size: Optional[int] = None):
+        """
+        多进程预测：特征和输出位于共享内存，各进程对自己的行范围原地打分
+        
+        每次调用都会启动工作进程并加载模型，多次打分时使用 shared_scorer 复用进程。
+        
+        Args:
+            X: 已转换的特征矩阵，SharedArray 或 .npy 内存映射数组可免去复制
+            threshold: 分类阈值
+            n_workers: 进程数，默认为CPU核数
+            chunk_size: 每个任务的行数
+            
+        Returns:
+            tuple: (预测概率, 预测类别)
+        """
+        with self.shared_scorer(n_workers) as scorer:
+            y_pred_proba = scorer.predict_proba(X, chunk_size)
+        return y_pred_proba, (y_pred_proba >= threshold).astype(int)
+    
+    def get_flat_model(self):
+        """
+        获取扁平数组推理模型，首次调用时从booster导出
+        
+        Returns:
+            FlatTreeEnsemble: 扁平数组推理模型
+        """
+        if self.model is None:
+            raise ValueError("模型尚未训练，请先训练模型")
+        
+        if self._flat_model is None:
+            self._flat_model = FlatTreeEnsemble.from_booster(self.model)
+        return self._flat_model
+    
+    def predict_stream(self, chunks, output_path: Optional[str] = None,
+                       threshold: float = 0.5, n_workers: Optional[int] = None,
+                       chunk_size: int = 100000, max_pending: Optional[int] = None,
+                       metrics: Optional[StreamingMetrics] = None):
+        """
+        对数据块流进行批量预测，内存占用只与块大小和并发数有关
+        
+        LightGBM预测时会释放GIL，多个数据块在线程池中并行预测，
+        每个线程分到 CPU核数 / n_workers 个OpenMP线程。结果按输入顺序增量写出。
+        
+        Args:
+            chunks: 数据块迭代器，元素可以是特征矩阵、DataFrame
+                （有scaler状态时先调用transform，否则按训练时的特征名选取列）
+                或 (特征块, 目标块) 元组；
+                也可以直接传入np.ndarray/np.memmap，按chunk_size切分为视图
+            output_path: 输出文件路径（.csv 或 .parquet），为None时不写出
+            threshold: 分类阈值
+            n_workers: 并行预测的线程数，默认为CPU核数
+            chunk_size: 传入数组时每块的行数
+            max_pending: 同时在途的最大块数，默认为 2 * n_workers
+            metrics: 流式评估累加器（可选）。数据块为 (特征块, 目标块) 元组时，
+                预测结果在同一遍中累积到该累加器，未传入时自动创建
+            
+        Returns:
+            Dict: 包含总行数、块数、耗时和吞吐量（行/秒）的统计信息；
+                数据块带目标值时还包含 'metrics'（StreamingMetrics 累加器）
+        """
+        if self.model is None:
+            raise ValueError("模型尚未训练，请先训练模型")
+        
+        if isinstance(chunks, np.ndarray):
+            array = chunks
+            chunks = (array[start:start + chunk_size] for start in range(0, len(array), chunk_size))
+        
+        cpu_count = os.cpu_count() or 1
+        n_workers = n_workers or cpu_count
+        max_pending = max_pending or 2 * n_workers
+        num_threads = max(1, cpu_count // n_workers)
+        
+        def score(X):
+            y = None
+            if isinstance(X, tuple):
+                X, y = X
+            if isinstance(X, pd.DataFrame):
+                if self.scaler_state is not None:
+                    X = self.transform(X)
+                else:
+                    # 只取训练时的特征列，避免目标列等其他列混入特征矩阵
+                    missing = [column for column in self.feature_names if column not in X.columns]
+                    if missing:
+                        raise ValueError(f"数据块缺少特征列: {missing}")
+                    X = X[self.feature_names].to_numpy()
+            return self.model.predict(copy_audit.ensure_array(X, 'predict'), num_threads=num_threads), y
+        
+        writer = PredictionWriter(output_path) if output_path is not None else None
+        pending = deque()
+        rows = 0
+        n_chunks = 0
+        
+        def drain_one():
+            nonlocal rows, n_chunks, metrics
+            y_pred_proba, y_true = pending.popleft().result()
+            if y_true is not None:
+                if metrics is None:
+                    metrics = StreamingMetrics(threshold=threshold)
+                metrics.update(y_true, y_pred_proba)
+            if writer is not None:
+                risk_levels, _ = calculate_risk_levels(y_pred_proba)
+                writer.write(pd.DataFrame({
+                    'row_id': np.arange(rows, rows + len(y_pred_proba)),
+                    'probability': y_pred_proba,
+                    'predicted_class': (y_pred_proba >= threshold).astype(np.int8),
+                    'risk_level': risk_levels
+                }))
+            rows += len(y_pred_proba)
+            n_chunks += 1
+        
+        start_time = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                for chunk in chunks:
+                    pending.append(executor.submit(score, chunk))
+                    # 按提交顺序取回结果，既保证输出有序也限制在途块数
+                    if len(pending) >= max_pending:
+                        drain_one()
+                while pending:
+                    drain_one()
+        finally:
+            if writer is not None:
+                writer.close()
+        elapsed = time.perf_counter() - start_time
+        
+        stats = {
+            'rows': rows,
+            'chunks': n_chunks,
+            'seconds': elapsed,
+            'rows_per_sec': rows / elapsed if elapsed > 0 else float('inf')
+        }
+        if metrics is not None:
+            stats['metrics'] = metrics
+        return stats
+    
+    @instrument(rows_from='X_test')
     def evaluate(self, X_test: np.ndarray, y_test: np.ndarray, threshold: float = 0.5):
         """
         评估模型性能
@@ -144,13 +752,7 @@ class LightGBMComplaintPredictor:
         y_pred_proba, y_pred_class = self.predict(X_test, threshold)
         
         # 计算评估指标
-        metrics = {
-            'accuracy': accuracy_score(y_test, y_pred_class),
-            'precision': precision_score(y_test, y_pred_class),
-            'recall': recall_score(y_test, y_pred_class),
-            'f1': f1_score(y_test, y_pred_class),
-            'roc_auc': roc_auc_score(y_test, y_pred_proba)
-        }
+        metrics = self._classification_metrics(y_test, y_pred_proba, y_pred_class)
         
         # 打印评估指标
         print("模型评估结果:")
@@ -158,12 +760,168 @@ class LightGBMComplaintPredictor:
             print(f"{metric_name}: {metric_value:.4f}")
         
         # 打印混淆矩阵
+        from sklearn.metrics import confusion_matrix
+        
         cm = confusion_matrix(y_test, y_pred_class)
         print("\n混淆矩阵:")
         print(cm)
         
         return metrics
     
+    @instrument(rows_from='X_test')
+    def evaluate_fused(self, X_test: np.ndarray, y_test: np.ndarray, threshold: float = 0.5,
+                       objective: str = 'f1', backend: str = 'native'):
+        """
+        单次排序的融合评估，不打印结果
+        
+        与evaluate相比只预测和排序一次，同时给出所有阈值下的精确率/召回率/F1曲线
+        和按objective选出的最优阈值
+        
+        Args:
+            X_test: 测试特征数据
+            y_test: 测试标签数据
+            threshold: 计算单点指标的分类阈值
+            objective: 选择最优阈值的目标，'f1'、'accuracy' 或 'youden'
+            backend: 预测后端，'native' 或 'flat'
+            
+        Returns:
+            Dict: evaluate_scores 的结果，包含 metrics、curve、best_threshold、best_metrics
+        """
+        y_pred_proba, _ = self.predict(X_test, threshold, backend)
+        return evaluate_scores(y_test, y_pred_proba, threshold=threshold, objective=objective)
+    
+    @staticmethod
+    def _classification_metrics(y_true, y_pred_proba, y_pred_class):
+        """
+        计算分类评估指标
+        
+        Args:
+            y_true: 真实标签
+            y_pred_proba: 预测概率
+            y_pred_class: 预测类别
+            
+        Returns:
+            Dict: 包含各种评估指标的字典
+        """
+        from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+        
+        return {
+            'accuracy': accuracy_score(y_true, y_pred_class),
+            'precision': precision_score(y_true, y_pred_class),
+            'recall': recall_score(y_true, y_pred_class),
+            'f1': f1_score(y_true, y_pred_class),
+            'roc_auc': roc_auc_score(y_true, y_pred_proba)
+        }
+    
+    def cross_validate(self, X: np.ndarray, y: np.ndarray, folds: List[Tuple[np.ndarray, np.ndarray]],
+                       n_workers: Optional[int] = None, threshold: float = 0.5,
+                       early_stopping_rounds: int = 50,
+                       feature_names: Optional[List[str]] = None):
+        """
+        K折交叉验证，各折并发训练
+        
+        整个数据集只构建、分箱一次，每折的训练集和验证集通过 Dataset.subset
+        从中取子集，不再重新分箱。各折在线程池中训练（LightGBM训练时释放GIL），
+        CPU线程在各折之间均分。
+        
+        Args:
+            X: 特征数据
+            y: 标签数据
+            folds: 每折的 (训练集索引, 验证集索引)，可由 PowerGridDataProcessor.kfold_indices 生成
+            n_workers: 并发训练的折数，默认为 min(折数, CPU核数)
+            threshold: 计算各折指标时的分类阈值
+            early_stopping_rounds: 各折的早停轮数
+            feature_names: 特征名称列表（可选）
+            
+        Returns:
+            Dict: 包含袋外预测概率（未出现在任何验证集中的行为NaN）、
+                各折指标、平均指标、各折模型和总耗时
+        """
+        if self.params is None:
+            self.set_params()
+        
+        cpu_count = os.cpu_count() or 1
+        n_workers = n_workers or min(len(folds), cpu_count)
+        
+        params = dict(self.params)
+        for alias in THREAD_ALIASES:
+            params.pop(alias, None)
+        params['num_threads'] = max(1, cpu_count // n_workers)
+        params['verbose'] = -1
+        
+        feature_names = feature_names or self.feature_names or [f'feature_{i}' for i in range(X.shape[1])]
+        
+        start_time = time.perf_counter()
+        
+        # 只分箱一次，各折从中取子集
+        X = copy_audit.ensure_array(X, 'cross_validate')
+        full_set = lgb.Dataset(X, label=y, feature_name=feature_names,
+                               params=params, free_raw_data=False).construct()
+        fold_sets = []
+        for train_index, valid_index in folds:
+            fold_sets.append((full_set.subset(np.sort(train_index)).construct(),
+                              full_set.subset(np.sort(valid_index)).construct()))
+        
+        def train_fold(fold_set):
+            train_set, valid_set = fold_set
+            return lgb.train(
+                params, train_set,
+                valid_sets=[valid_set], valid_names=['valid'],
+                callbacks=[lgb.early_stopping(stopping_rounds=early_stopping_rounds, verbose=False)]
+            )
+        
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            boosters = list(executor.map(train_fold, fold_sets))
+        
+        oof_proba = np.full(len(y), np.nan)
+        fold_metrics = []
+        for fold, (booster, (_, valid_index)) in enumerate(zip(boosters, folds)):
+            X_valid = X[valid_index]
+            copy_audit.record('cross_validate', X_valid, 'index')
+            valid_proba = booster.predict(X_valid)
+            oof_proba[valid_index] = valid_proba
+            metrics = self._classification_metrics(
+                y[valid_index], valid_proba, (valid_proba >= threshold).astype(int))
+            metrics['fold'] = fold
+            metrics['best_iteration'] = booster.best_iteration
+            fold_metrics.append(metrics)
+        
+        metric_names = ['accuracy', 'precision', 'recall', 'f1', 'roc_auc']
+        mean_metrics = {name: float(np.mean([metrics[name] for metrics in fold_metrics]))
+                        for name in metric_names}
+        
+        return {
+            'oof_proba': oof_proba,
+            'fold_metrics': fold_metrics,
+            'mean_metrics': mean_metrics,
+            'models': boosters,
+            'seconds': time.perf_counter() - start_time
+        }
+    
+    def render_report(self, X_test: np.ndarray, y_test: np.ndarray, output_dir: str,
+                      threshold: float = 0.5, **kwargs):
+        """
+        将评估报告（混淆矩阵、ROC曲线、预测概率分布、特征重要性和指标）直接写入文件，
+        不弹出窗口，可在无界面的服务器上使用
+        
+        Args:
+            X_test: 测试特征数据
+            y_test: 测试标签数据
+            output_dir: 输出目录
+            threshold: 分类阈值
+            **kwargs: 传给 render_report 的其他参数，如 image_format、dpi
+            
+        Returns:
+            Dict: 输出文件路径和评估指标
+        """
+        from ..utils.report import render_report
+        
+        y_pred_proba, _ = self.predict(X_test, threshold)
+        return render_report(y_test, y_pred_proba, output_dir, threshold=threshold,
+                             feature_names=self.feature_names,
+                             importances=self.model.feature_importance(importance_type='gain'),
+                             **kwargs)
+    
     def plot_feature_importance(self, max_num_features: int = 10, figsize: Tuple[int, int] = (10, 6)):
         """
         绘制特征重要性图
@@ -175,6 +933,8 @@ class LightGBMComplaintPredictor:
         if self.model is None:
             raise ValueError("模型尚未训练，请先训练模型")
         
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=figsize)
         lgb.plot_importance(self.model, max_num_features=max_num_features, 
                           importance_type='gain', title='特征重要性 (增益)')
@@ -199,45 +959,94 @@ class LightGBMComplaintPredictor:
         else:
             raise ValueError(f"特征 '{feature_name}' 不存在")
         
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=(10, 6))
         lgb.plot_split_value_histogram(self.model, feature_idx, bins=bins)
         plt.title(f"特征 '{feature_name}' 的分割值分布", fontsize=15)
         plt.tight_layout()
         plt.show()
     
-    def save_model(self, file_path: str):
+    def save_model(self, file_path: str, scaler_state: Optional[Dict] = None,
+                   format: Optional[str] = None):
         """
         保存模型到文件
         
         Args:
             file_path: 保存路径
+            scaler_state: 与模型配套的scaler状态（可选），
+                为None时使用set_scaler_state设置的状态
+            format: 'joblib' 或 'native'，为None时根据路径判断：
+                以 .lgbm 结尾时使用原生格式，否则使用joblib
         """
         if self.model is None:
             raise ValueError("没有可保存的模型")
         
-        # 保存模型
-        joblib.dump({
-            'model': self.model,
-            'params': self.params,
-            'feature_names': self.feature_names
-        }, file_path)
+        if scaler_state is not None:
+            self.set_scaler_state(scaler_state)
+        
+        if format is None:
+            format = 'native' if is_native_path(file_path) else 'joblib'
+        
+        if format == 'native':
+            # 原生格式：LightGBM文本模型 + JSON清单
+            save_native(file_path, self.model, params=self.params,
+                        feature_names=self.feature_names, scaler_state=self.scaler_state,
+                        extra={'lineage': self.lineage})
+        elif format == 'joblib':
+            import joblib
+            
+            # 保存模型
+            joblib.dump({
+                'model': self.model,
+                'params': self.params,
+                'feature_names': self.feature_names,
+                'scaler_state': self.scaler_state,
+                'lineage': self.lineage
+            }, file_path)
+        else:
+            raise ValueError(f"不支持的模型格式: {format}")
         
         print(f"模型已保存至: {file_path}")
     
-    def load_model(self, file_path: str):
+    def load_model(self, file_path: str, lazy: bool = True):
         """
         从文件加载模型
         
         Args:
-            file_path: 模型文件路径
+            file_path: 模型文件路径，原生格式为模型目录
+            lazy: 原生格式下是否推迟到首次使用时再构建Booster，
+                加载时只读取清单
         """
+        if is_native_path(file_path):
+            manifest = read_manifest(file_path)
+            self.model = None
+            self._lazy_model_dir = file_path
+            self._lazy_manifest = manifest
+            self._on_model_changed()
+            self.params = manifest['params']
+            self.feature_names = manifest['feature_names']
+            self.set_scaler_state(manifest.get('scaler_state'))
+            self.lineage = manifest.get('lineage', [])
+            if not lazy:
+                _ = self.model
+            
+            print(f"模型已从 {file_path} 加载")
+            return self
+        
+        import joblib
+        
         # 加载模型
         model_data = joblib.load(file_path)
         
         # 恢复模型参数
         self.model = model_data['model']
+        self._on_model_changed()
         self.params = model_data['params']
         self.feature_names = model_data['feature_names']
+        # 旧版本保存的模型文件不包含scaler状态
+        self.set_scaler_state(model_data.get('scaler_state'))
+        self.lineage = model_data.get('lineage', [])
         
         print(f"模型已从 {file_path} 加载")
         return self
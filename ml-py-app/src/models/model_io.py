@@ -0,0 +1,135 @@
+"""
+LightGBM模型的原生保存格式
+
+模型保存为一个目录，包含:
+    model.txt      LightGBM文本格式模型，截断到最佳迭代
+    manifest.json  特征名、参数、scaler状态、最佳迭代和model.txt的SHA-256校验值
+
+与joblib序列化相比，不依赖Python/LightGBM对象的pickle兼容性；
+读取清单只需解析一个小JSON文件，Booster可以推迟到首次预测时再构建。
+只依赖标准库和lightgbm，lightgbm在需要时才导入，只读取清单的进程不需要加载它。
+"""
+
+import json
+import os
+from datetime import datetime
+
+from ..utils.hashing import file_sha256
+
+# 原生格式版本
+NATIVE_FORMAT_VERSION = 1
+
+# 原生格式目录的扩展名
+NATIVE_EXTENSION = '.lgbm'
+
+MANIFEST_FILE = 'manifest.json'
+MODEL_FILE = 'model.txt'
+
+
+def is_native_path(file_path):
+    """
+    判断路径是否为原生格式模型
+
+    Args:
+        file_path: 模型路径
+
+    Returns:
+        bool: 以 .lgbm 结尾或是包含清单文件的目录时返回True
+    """
+    return file_path.rstrip('/\\').endswith(NATIVE_EXTENSION) or \
+        os.path.isfile(os.path.join(file_path, MANIFEST_FILE))
+
+
+def save_native(model_dir, booster, params=None, feature_names=None, scaler_state=None, extra=None):
+    """
+    以原生格式保存模型
+
+    Args:
+        model_dir: 模型目录
+        booster: lgb.Booster 对象
+        params: 训练参数
+        feature_names: 特征名称列表
+        scaler_state: scaler状态字典
+        extra: 写入清单的附加信息（可选）
+
+    Returns:
+        Dict: 写入的清单
+    """
+    import lightgbm as lgb
+    
+    os.makedirs(model_dir, exist_ok=True)
+
+    # 只保存到最佳迭代，去掉早停后多训练的树
+    best_iteration = booster.best_iteration if booster.best_iteration > 0 else -1
+    model_path = os.path.join(model_dir, MODEL_FILE)
+    booster.save_model(model_path, num_iteration=best_iteration)
+
+    manifest = {
+        'format_version': NATIVE_FORMAT_VERSION,
+        'model_file': MODEL_FILE,
+        'sha256': file_sha256(model_path),
+        'size_bytes': os.path.getsize(model_path),
+        'best_iteration': max(booster.best_iteration, 0),
+        'num_trees': booster.num_trees() if best_iteration < 0 else best_iteration,
+        'feature_names': list(feature_names) if feature_names is not None else booster.feature_name(),
+        'params': params,
+        'scaler_state': scaler_state,
+        'lightgbm_version': lgb.__version__,
+        'created_at': datetime.now().isoformat(timespec='seconds')
+    }
+    if extra:
+        manifest.update(extra)
+
+    # 先写临时文件再替换，读取方不会看到写了一半的清单
+    manifest_path = os.path.join(model_dir, MANIFEST_FILE)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(tmp_path, manifest_path)
+
+    return manifest
+
+
+def read_manifest(model_dir):
+    """
+    读取模型清单
+
+    Args:
+        model_dir: 模型目录
+
+    Returns:
+        Dict: 清单内容
+    """
+    with open(os.path.join(model_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format_version') != NATIVE_FORMAT_VERSION:
+        raise ValueError(f"不支持的模型格式版本: {manifest.get('format_version')}")
+    return manifest
+
+
+def load_booster(model_dir, manifest=None, verify=True):
+    """
+    根据清单构建Booster
+
+    Args:
+        model_dir: 模型目录
+        manifest: 已读取的清单，为None时重新读取
+        verify: 是否校验模型文件的SHA-256
+
+    Returns:
+        lgb.Booster: 加载的Booster
+    """
+    if manifest is None:
+        manifest = read_manifest(model_dir)
+
+    model_path = os.path.join(model_dir, manifest['model_file'])
+    if verify and file_sha256(model_path) != manifest['sha256']:
+        raise ValueError(f"模型文件校验失败: {model_path}")
+
+    import lightgbm as lgb
+    
+    booster = lgb.Booster(model_file=model_path)
+    # 文件中的树已截断到最佳迭代，恢复该值以便get_best_iteration与训练时一致
+    booster.best_iteration = manifest.get('best_iteration', 0)
+    return booster
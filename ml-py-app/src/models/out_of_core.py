@@ -0,0 +1,264 @@
+"""
+从分区文件进行核外训练
+
+每个分区文件（CSV、Parquet 或 npy 内存映射数组）包装为一个 lgb.Sequence，
+按块顺序读取并转换特征。LightGBM构建Dataset时先按递增的行号抽样确定分箱，
+再按批次顺序推入全部行，两遍都只顺序读取文件，内存中同时只保留一个块，
+完整的特征矩阵不会被物化。标签按列单独读取，每行只占一个浮点数。
+
+npy 分区以路径前缀表示：<prefix>.features.npy、<prefix>.label.npy，
+以及可选的 <prefix>.columns.json（特征数组的列名，缺省时视为与特征列一致）。
+"""
+
+import json
+import os
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from ..data.scaling import minmax_transform
+
+FORMATS = ('csv', 'parquet', 'npy')
+
+# 每次读取的默认行数，同时作为推入Dataset的批大小
+DEFAULT_BLOCK_SIZE = 65536
+
+
+def detect_format(path):
+    """
+    根据路径判断分区格式
+
+    Args:
+        path: 分区文件路径（npy为路径前缀）
+
+    Returns:
+        str: 'csv'、'parquet' 或 'npy'
+    """
+    if path.endswith('.csv'):
+        return 'csv'
+    if path.endswith('.parquet'):
+        return 'parquet'
+    if os.path.exists(path + '.features.npy'):
+        return 'npy'
+    raise ValueError(f"无法识别的分区格式: {path}")
+
+
+def _count_csv_rows(path, block_size=1 << 20):
+    """
+    按字节块统计CSV的数据行数（不含表头），不解析内容
+    """
+    count = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            count += block.count(b'\n')
+            last = block[-1:]
+    # 最后一行没有换行符时补上，再减去表头
+    return count + (last != b'\n') - 1
+
+
+class PartitionSequence(lgb.Sequence):
+    """
+    单个分区文件上的按块读取序列
+    """
+
+    def __init__(self, path, feature_columns, file_format=None, scaler_params=None,
+                 dtype=np.float64, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        初始化序列，只读取元数据
+
+        Args:
+            path: 分区文件路径（npy为路径前缀）
+            feature_columns: 特征列，按模型的特征顺序排列
+            file_format: 'csv'、'parquet' 或 'npy'，默认根据路径判断
+            scaler_params: minmax_params 返回的 (scale, offset)，为None时不缩放
+            dtype: 输出特征的浮点类型
+            block_size: 每次读取的行数
+        """
+        self.path = path
+        self.feature_columns = list(feature_columns)
+        self.file_format = file_format or detect_format(path)
+        if self.file_format not in FORMATS:
+            raise ValueError(f"不支持的分区格式: {self.file_format}")
+        self.scaler_params = scaler_params
+        self.dtype = dtype
+        self.batch_size = block_size
+
+        self._block = None
+        self._block_start = 0
+        self._blocks = None
+
+        if self.file_format == 'npy':
+            features = np.load(path + '.features.npy', mmap_mode='r')
+            columns_path = path + '.columns.json'
+            if os.path.exists(columns_path):
+                with open(columns_path, 'r', encoding='utf-8') as f:
+                    columns = json.load(f)
+                self._column_index = [columns.index(column) for column in self.feature_columns]
+            else:
+                self._column_index = list(range(len(self.feature_columns)))
+            self._length = len(features)
+        elif self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+
+            self._length = pq.ParquetFile(path).metadata.num_rows
+        else:
+            self._length = _count_csv_rows(path)
+
+    def __len__(self):
+        return self._length
+
+    def _iter_raw_blocks(self):
+        """
+        从头顺序产出原始特征块
+        """
+        if self.file_format == 'npy':
+            features = np.load(self.path + '.features.npy', mmap_mode='r')
+            for start in range(0, len(features), self.batch_size):
+                yield features[start:start + self.batch_size, self._column_index]
+        elif self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(self.path).iter_batches(batch_size=self.batch_size,
+                                                                  columns=self.feature_columns):
+                yield np.column_stack([batch.column(column).to_numpy(zero_copy_only=False)
+                                       for column in self.feature_columns])
+        else:
+            reader = pd.read_csv(self.path, usecols=self.feature_columns, chunksize=self.batch_size)
+            for chunk in reader:
+                yield chunk[self.feature_columns].to_numpy()
+
+    def _transform(self, block):
+        if self.scaler_params is None:
+            return np.ascontiguousarray(block, dtype=self.dtype)
+        scale, offset = self.scaler_params
+        return minmax_transform(block, scale, offset, dtype=self.dtype)
+
+    def _seek(self, row):
+        """
+        使当前块包含指定行；向后访问时从头重新读取
+        """
+        if self._block is not None and self._block_start <= row < self._block_start + len(self._block):
+            return
+        if self._block is None or row < self._block_start:
+            self._blocks = self._iter_raw_blocks()
+            self._block = None
+            self._block_start = 0
+        while self._block is None or row >= self._block_start + len(self._block):
+            if self._block is not None:
+                self._block_start += len(self._block)
+            self._block = self._transform(next(self._blocks))
+        # 读到最后一块后释放读取器：挂起的读取器引用序列本身，
+        # 不释放时每个分区会一直保留解码缓冲（如整个Parquet行组）
+        if self._block_start + len(self._block) >= self._length:
+            self._blocks = None
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(self._length)
+            if step != 1:
+                raise ValueError("只支持步长为1的切片")
+            parts = []
+            while start < stop:
+                self._seek(start)
+                offset = start - self._block_start
+                part = self._block[offset:offset + stop - start]
+                parts.append(part)
+                start += len(part)
+            if len(parts) == 1:
+                return parts[0]
+            return np.concatenate(parts) if parts else np.empty((0, len(self.feature_columns)), self.dtype)
+        if isinstance(idx, (int, np.integer)):
+            if idx < 0:
+                idx += self._length
+            self._seek(idx)
+            return self._block[idx - self._block_start]
+        raise TypeError(f"序列下标必须为整数或切片，实际为 {type(idx).__name__}")
+
+    def close(self):
+        """
+        释放当前块和读取器
+        """
+        self._block = None
+        self._blocks = None
+
+
+def read_labels(path, target_column='complaint_label', file_format=None):
+    """
+    只读取分区的标签列
+
+    Args:
+        path: 分区文件路径（npy为路径前缀）
+        target_column: 目标列名
+        file_format: 分区格式，默认根据路径判断
+
+    Returns:
+        np.ndarray: 标签
+    """
+    file_format = file_format or detect_format(path)
+    if file_format == 'npy':
+        return np.load(path + '.label.npy')
+    if file_format == 'parquet':
+        return pd.read_parquet(path, columns=[target_column])[target_column].to_numpy()
+    return pd.read_csv(path, usecols=[target_column])[target_column].to_numpy()
+
+
+def iter_partition_frames(paths, feature_columns, target_column='complaint_label', file_format=None,
+                          block_size=DEFAULT_BLOCK_SIZE):
+    """
+    按块读取多个分区的原始特征和标签，用于流式拟合scaler（PowerGridDataProcessor.fit）
+
+    Args:
+        paths: 分区路径列表
+        feature_columns: 特征列
+        target_column: 目标列名
+        file_format: 分区格式，默认根据路径判断
+        block_size: 每块的行数
+
+    Yields:
+        pd.DataFrame: 包含特征列和目标列的数据块
+    """
+    for path in paths:
+        sequence = PartitionSequence(path, feature_columns, file_format, block_size=block_size)
+        labels = read_labels(path, target_column, sequence.file_format)
+        start = 0
+        for block in sequence._iter_raw_blocks():
+            frame = pd.DataFrame(block, columns=feature_columns)
+            frame[target_column] = labels[start:start + len(block)]
+            start += len(block)
+            yield frame
+
+
+def build_dataset(paths, feature_columns, feature_names=None, target_column='complaint_label',
+                  scaler_params=None, file_format=None, dtype=np.float64,
+                  block_size=DEFAULT_BLOCK_SIZE, reference=None, params=None):
+    """
+    由分区文件构建基于 lgb.Sequence 的LightGBM数据集
+
+    Args:
+        paths: 分区路径列表
+        feature_columns: 文件中的特征列
+        feature_names: 数据集中的特征名称，默认使用feature_columns
+        target_column: 目标列名
+        scaler_params: minmax_params 返回的 (scale, offset)，为None时不缩放
+        file_format: 分区格式，默认根据路径判断
+        dtype: 特征的浮点类型
+        block_size: 每次读取的行数
+        reference: 验证集对应的训练数据集，使用相同的分箱
+        params: 构建数据集的参数（如 bin_construct_sample_cnt、max_bin）
+
+    Returns:
+        lgb.Dataset: 尚未构建的数据集，在lgb.train中按块读取
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    sequences = [PartitionSequence(path, feature_columns, file_format, scaler_params, dtype, block_size)
+                 for path in paths]
+    labels = np.concatenate([read_labels(path, target_column, sequence.file_format)
+                             for path, sequence in zip(paths, sequences)]).astype(np.float32)
+    return lgb.Dataset(sequences, label=labels, feature_name=list(feature_names or feature_columns),
+                       reference=reference, params=params)
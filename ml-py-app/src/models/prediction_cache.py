@@ -0,0 +1,171 @@
+"""
+预测结果缓存
+
+以量化后特征行的64位哈希和模型版本为键缓存预测概率（或每行定长的向量，
+如逐特征贡献值），按条目数做LRU淘汰，可选TTL过期。
+哈希在numpy中对整批数据向量化计算。条目的读写由锁保护，
+服务端多个线程同时预测时可以共用一个缓存。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from ..utils.hashing import mix64
+
+_FNV_PRIME = np.uint64(0x100000001B3)
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+
+
+def hash_rows(X, decimals=6, seed=0):
+    """
+    计算每行特征量化后的64位哈希
+
+    Args:
+        X: 特征矩阵
+        decimals: 量化保留的小数位数，差异小于该精度的行视为相同
+        seed: 哈希种子，用于区分模型版本
+
+    Returns:
+        np.ndarray: uint64类型的行哈希
+    """
+    X = np.asarray(X)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+
+    with np.errstate(over='ignore'):
+        h = np.full(len(X), _FNV_OFFSET ^ mix64(np.uint64(seed)), dtype=np.uint64)
+        for column in range(X.shape[1]):
+            # 逐列转换为float64后量化，不复制整个特征矩阵，float32与float64输入的哈希相同
+            quantized = np.round(X[:, column].astype(np.float64), decimals)
+            # 统一 -0.0 与 0.0、以及不同位模式的NaN
+            quantized += 0.0
+            quantized[np.isnan(quantized)] = np.nan
+            # 浮点数的位差异集中在高位，乘法只向高位进位，先混合再合并，
+            # 否则取值为小整数的行大量碰撞
+            h = (h ^ mix64(quantized.view(np.uint64))) * _FNV_PRIME
+        return mix64(h)
+
+
+class PredictionCache:
+    """
+    LRU + TTL 预测概率缓存
+    """
+
+    def __init__(self, max_entries=100000, ttl=None, decimals=6, width=None):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最大条目数，超过时淘汰最久未使用的条目
+            ttl: 条目有效期（秒），为None时不过期
+            decimals: 特征量化保留的小数位数
+            width: 每个条目的向量长度，为None时每个条目是一个标量
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.decimals = decimals
+        self.width = width
+        self._entries = OrderedDict()
+        # 查询也会调整LRU顺序，读写都需要加锁
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def keys(self, X, model_version=0):
+        """
+        计算一批特征行的缓存键
+
+        Args:
+            X: 特征矩阵
+            model_version: 模型版本号
+
+        Returns:
+            np.ndarray: uint64类型的缓存键
+        """
+        return hash_rows(X, self.decimals, seed=model_version)
+
+    def get_many(self, keys):
+        """
+        批量查询缓存
+
+        Args:
+            keys: 缓存键数组
+
+        Returns:
+            tuple: (值数组，未命中位置为NaN；width不为None时形状为 (n, width), 命中掩码)
+        """
+        shape = (len(keys),) if self.width is None else (len(keys), self.width)
+        values = np.full(shape, np.nan)
+        hit_mask = np.zeros(len(keys), dtype=bool)
+        now = time.monotonic()
+
+        with self._lock:
+            for i, key in enumerate(keys.tolist()):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at is not None and expires_at < now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    continue
+                self._entries.move_to_end(key)
+                values[i] = value
+                hit_mask[i] = True
+
+            hits = int(hit_mask.sum())
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return values, hit_mask
+
+    def put_many(self, keys, values):
+        """
+        批量写入缓存
+
+        Args:
+            keys: 缓存键数组
+            values: 对应的预测概率，width不为None时为 (n, width) 数组
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        items = list(zip(keys.tolist(), values.tolist()))
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        清空缓存条目，保留统计计数
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        获取缓存统计信息
+
+        Returns:
+            Dict: 条目数、命中/未命中次数、命中率、淘汰和过期次数
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,326 @@
+"""
+多模型注册表
+
+按 (key, version) 索引已保存的模型（如每个供电区域一个模型），首次使用时才加载。
+常驻模型按估计的内存占用计入预算，超出预算时淘汰最久未使用的模型；
+同一模型在并发请求下只加载一次，其他请求等待同一次加载的结果。
+可以按历史访问次数预热最热的模型，并提供命中率和加载耗时统计。
+
+目录约定（scan）:
+    root_dir/<key>/<version>.lgbm      原生格式模型目录
+    root_dir/<key>/<version>.joblib    joblib格式模型文件
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .model_io import NATIVE_EXTENSION
+
+MODEL_EXTENSIONS = (NATIVE_EXTENSION, '.joblib')
+
+
+def _version_key(version):
+    """
+    版本号的自然排序键，如 v2 < v10
+    """
+    return tuple((0, int(part)) if part.isdigit() else (1, part)
+                 for part in re.findall(r'\d+|\D+', str(version)))
+
+
+def path_size(path):
+    """
+    计算文件或目录的总字节数，作为模型常驻内存的估计值
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def _default_loader(path):
+    from .lgbm_model import LightGBMComplaintPredictor
+
+    # 注册表自己管理加载时机，加载时直接构建Booster
+    return LightGBMComplaintPredictor().load_model(path, lazy=False)
+
+
+class ModelRegistry:
+    """
+    带内存预算和LRU淘汰的模型注册表
+    """
+
+    def __init__(self, root_dir=None, memory_budget_mb=1024, loader=None, size_fn=None,
+                 size_factor=2.0, load_window=1024):
+        """
+        初始化注册表
+
+        Args:
+            root_dir: 模型根目录，提供时立即扫描
+            memory_budget_mb: 常驻模型的内存预算（MB）
+            loader: 加载函数 path -> model，默认使用 LightGBMComplaintPredictor.load_model
+            size_fn: 估计模型内存的函数 (path, model) -> 字节数，
+                默认按文件大小乘以 size_factor 估计
+            size_factor: 默认估计时文件大小到内存占用的放大系数
+            load_window: 计算加载耗时p99时保留的最近加载次数
+        """
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._loader = loader or _default_loader
+        self._size_fn = size_fn or (lambda path, model: int(path_size(path) * size_factor))
+
+        self._index = {}
+        self._resident = OrderedDict()
+        self._resident_bytes = 0
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.access_counts = Counter()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.load_failures = 0
+        self.loads = 0
+        self.load_seconds_total = 0.0
+        # 只保留最近的加载耗时用于计算p99，长期运行时内存不随加载次数增长
+        self.load_seconds = deque(maxlen=load_window)
+
+        if root_dir is not None:
+            self.scan(root_dir)
+
+    def register(self, key, version, path):
+        """
+        登记一个模型
+
+        Args:
+            key: 模型键（如供电区域编号）
+            version: 版本号
+            path: 模型路径
+        """
+        with self._lock:
+            self._index.setdefault(key, {})[str(version)] = path
+
+    def scan(self, root_dir):
+        """
+        按目录约定扫描并登记模型
+
+        Args:
+            root_dir: 模型根目录
+
+        Returns:
+            int: 登记的模型数量
+        """
+        count = 0
+        for key in sorted(os.listdir(root_dir)):
+            key_dir = os.path.join(root_dir, key)
+            if not os.path.isdir(key_dir):
+                continue
+            for name in os.listdir(key_dir):
+                for extension in MODEL_EXTENSIONS:
+                    if name.endswith(extension):
+                        self.register(key, name[:-len(extension)], os.path.join(key_dir, name))
+                        count += 1
+        return count
+
+    def keys(self):
+        with self._lock:
+            return sorted(self._index)
+
+    def versions(self, key):
+        """
+        Returns:
+            List[str]: 按自然顺序排列的版本号
+        """
+        with self._lock:
+            return sorted(self._index.get(key, {}), key=_version_key)
+
+    def _resolve(self, key, version):
+        versions = self._index.get(key)
+        if not versions:
+            raise KeyError(f"未登记的模型: {key}")
+        if version is None:
+            version = max(versions, key=_version_key)
+        version = str(version)
+        if version not in versions:
+            raise KeyError(f"模型 {key} 没有版本 {version}")
+        return (key, version), versions[version]
+
+    def get(self, key, version=None):
+        """
+        获取模型，未常驻时加载；并发请求同一模型时只加载一次
+
+        Args:
+            key: 模型键
+            version: 版本号，默认使用最新版本
+
+        Returns:
+            加载的模型
+        """
+        with self._lock:
+            model_id, path = self._resolve(key, version)
+            self.access_counts[key] += 1
+
+            entry = self._resident.get(model_id)
+            if entry is not None:
+                self._resident.move_to_end(model_id)
+                self.hits += 1
+                return entry[0]
+
+            future = self._loading.get(model_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._loading[model_id] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if owner:
+            self._load(model_id, path, future)
+        return future.result()
+
+    def _load(self, model_id, path, future):
+        start_time = time.perf_counter()
+        try:
+            model = self._loader(path)
+            size = self._size_fn(path, model)
+        except BaseException as e:
+            with self._lock:
+                self.load_failures += 1
+                del self._loading[model_id]
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            elapsed = time.perf_counter() - start_time
+            self.loads += 1
+            self.load_seconds_total += elapsed
+            self.load_seconds.append(elapsed)
+            self._resident[model_id] = (model, size)
+            self._resident_bytes += size
+            self._evict(keep=model_id)
+            del self._loading[model_id]
+        future.set_result(model)
+
+    def _evict(self, keep=None):
+        """
+        淘汰最久未使用的模型直到满足预算，刚加载的模型不会被淘汰
+        """
+        while self._resident_bytes > self.memory_budget and len(self._resident) > 1:
+            model_id = next(iter(self._resident))
+            if model_id == keep:
+                self._resident.move_to_end(model_id)
+                model_id = next(iter(self._resident))
+            _, size = self._resident.pop(model_id)
+            self._resident_bytes -= size
+            self.evictions += 1
+
+    def evict(self, key, version=None):
+        """
+        主动卸载模型
+
+        Returns:
+            bool: 模型是否常驻并已卸载
+        """
+        with self._lock:
+            model_id, _ = self._resolve(key, version)
+            entry = self._resident.pop(model_id, None)
+            if entry is None:
+                return False
+            self._resident_bytes -= entry[1]
+            return True
+
+    def prewarm(self, keys=None, top_n=None, n_workers=4):
+        """
+        预热模型（最新版本），不超过内存预算
+
+        Args:
+            keys: 要预热的模型键，默认按访问次数从高到低选取
+            top_n: 最多预热的模型数，默认直到预算用完
+            n_workers: 并行加载的线程数
+
+        Returns:
+            List: 已常驻的模型键
+        """
+        if keys is None:
+            with self._lock:
+                keys = [key for key, _ in self.access_counts.most_common() if key in self._index]
+        keys = list(keys)[:top_n] if top_n is not None else list(keys)
+
+        # 按估计大小截取不超过预算的前缀，避免预热时互相淘汰
+        selected = []
+        budget = self.memory_budget - self._resident_bytes
+        for key in keys:
+            with self._lock:
+                model_id, path = self._resolve(key, None)
+                if model_id in self._resident:
+                    continue
+            budget -= self._size_fn(path, None)
+            if budget < 0:
+                break
+            selected.append(key)
+
+        def load(key):
+            with self._lock:
+                model_id, path = self._resolve(key, None)
+                if model_id in self._resident or model_id in self._loading:
+                    return
+                future = Future()
+                self._loading[model_id] = future
+            self._load(model_id, path, future)
+
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(load, selected))
+
+        with self._lock:
+            return [model_id[0] for model_id in self._resident]
+
+    def save_access_stats(self, file_path):
+        """
+        保存访问次数，下次启动时可用于预热
+        """
+        with self._lock:
+            counts = dict(self.access_counts)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(counts, f, ensure_ascii=False, indent=2)
+
+    def load_access_stats(self, file_path):
+        """
+        读取之前保存的访问次数
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            counts = json.load(f)
+        with self._lock:
+            self.access_counts.update(counts)
+
+    def stats(self):
+        """
+        获取注册表统计信息
+
+        Returns:
+            Dict: 命中/未命中/合并等待次数、命中率、淘汰次数、加载次数和耗时、
+                常驻模型数和估计内存；合并等待（等待其他请求正在进行的加载）不计为命中，
+                加载耗时p99只统计最近 load_window 次加载
+        """
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            load_seconds = sorted(self.load_seconds)
+            return {
+                'registered': sum(len(versions) for versions in self._index.values()),
+                'resident': len(self._resident),
+                'resident_mb': self._resident_bytes / (1024 * 1024),
+                'memory_budget_mb': self.memory_budget / (1024 * 1024),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'loads': self.loads,
+                'load_failures': self.load_failures,
+                'load_seconds_mean': self.load_seconds_total / self.loads if self.loads else 0.0,
+                'load_seconds_p99': load_seconds[int(0.99 * (len(load_seconds) - 1))] if load_seconds else 0.0
+            }
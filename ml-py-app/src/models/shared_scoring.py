@@ -0,0 +1,219 @@
+"""
+基于共享内存的多进程打分
+
+特征矩阵和输出概率都放在 multiprocessing.shared_memory（或已有的 .npy 内存映射文件）中，
+进程之间只传递共享内存的名称、形状和行范围，不序列化大数组。
+每个工作进程在启动时加载一次模型，之后直接在共享内存上对分到的行范围打分，
+并把结果原地写入输出缓冲。
+
+工作进程默认以 'spawn' 方式启动：父进程中LightGBM已初始化OpenMP线程池，
+fork出的子进程再使用OpenMP可能死锁。
+"""
+
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArray:
+    """
+    共享内存中的numpy数组
+    """
+
+    def __init__(self, shm, shape, dtype, owner):
+        self._shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, shape, dtype=np.float64):
+        """
+        分配新的共享内存数组
+
+        Args:
+            shape: 数组形状
+            dtype: 元素类型
+
+        Returns:
+            SharedArray: 由当前进程负责释放的共享数组
+        """
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        return cls(shared_memory.SharedMemory(create=True, size=nbytes), shape, dtype, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        按描述连接到已存在的共享内存数组
+
+        Args:
+            descriptor: descriptor() 返回的描述
+
+        Returns:
+            SharedArray: 连接的共享数组
+        """
+        (_, name), shape, dtype = descriptor
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype, owner=False)
+
+    def descriptor(self):
+        """
+        Returns:
+            tuple: 可在进程间传递的 (('shm', 名称), 形状, 类型)
+        """
+        return ('shm', self._shm.name), self.shape, self.dtype.str
+
+    def close(self):
+        """
+        断开连接；创建者同时释放共享内存。调用前需释放对 array 的其他引用
+        """
+        self.array = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def _memmap_descriptor(X):
+    """
+    np.load(mmap_mode='r') 得到的完整内存映射数组可以在工作进程中按文件重新映射
+
+    Returns:
+        tuple: (('file', 路径, 偏移), 形状, 类型)，不满足条件时返回None
+    """
+    if (isinstance(X, np.memmap) and isinstance(X.base, mmap.mmap) and X.filename
+            and X.flags['C_CONTIGUOUS']):
+        return ('file', X.filename, X.offset), X.shape, X.dtype.str
+    return None
+
+
+# 工作进程的状态：初始化时加载的模型
+_worker = {}
+
+
+def _init_worker(model_str, num_threads):
+    import lightgbm as lgb
+
+    _worker['booster'] = lgb.Booster(model_str=model_str)
+    _worker['num_threads'] = num_threads
+
+
+def _score_range(task):
+    """
+    对输入的一个行范围打分并写入输出；每个任务结束时断开连接，
+    父进程释放共享内存后工作进程不会继续占用
+    """
+    input_descriptor, output_descriptor, start, stop = task
+    source, shape, dtype = input_descriptor
+    if source[0] == 'file':
+        _, file_path, offset = source
+        input_shared = None
+        X = np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=shape)
+    else:
+        input_shared = SharedArray.attach(input_descriptor)
+        X = input_shared.array
+    output_shared = SharedArray.attach(output_descriptor)
+    try:
+        output_shared.array[start:stop] = _worker['booster'].predict(
+            X[start:stop], num_threads=_worker['num_threads'])
+    finally:
+        del X
+        output_shared.close()
+        if input_shared is not None:
+            input_shared.close()
+    return stop - start
+
+
+class SharedMemoryScorer:
+    """
+    常驻的多进程打分器，工作进程和模型在多次打分之间复用
+    """
+
+    def __init__(self, booster, n_workers=None, num_threads=1, mp_context='spawn'):
+        """
+        启动工作进程并在每个进程中加载一次模型
+
+        Args:
+            booster: lightgbm.Booster
+            n_workers: 进程数，默认为CPU核数
+            num_threads: 每个进程内LightGBM的线程数
+            mp_context: 进程启动方式，默认 'spawn'
+        """
+        num_iteration = booster.best_iteration if booster.best_iteration > 0 else -1
+        model_str = booster.model_to_string(num_iteration=num_iteration)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers, mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_worker, initargs=(model_str, num_threads))
+
+    def allocate(self, shape, dtype=np.float64):
+        """
+        在共享内存中分配特征矩阵，直接写入后打分可以避免一次复制
+
+        Returns:
+            SharedArray: 调用方负责close的共享数组
+        """
+        return SharedArray.create(shape, dtype)
+
+    def predict_proba(self, X, chunk_size=None):
+        """
+        多进程预测正类概率
+
+        X 为 SharedArray（如 allocate 分配后写入的特征）或 np.load(mmap_mode='r')
+        得到的内存映射数组时，工作进程直接读取；其他数组先复制一次到共享内存。
+
+        Args:
+            X: 特征矩阵
+            chunk_size: 每个任务的行数，默认把数据平均分给各进程的4倍任务数
+
+        Returns:
+            np.ndarray: 预测概率
+        """
+        temporary = None
+        if isinstance(X, SharedArray):
+            descriptor = X.descriptor()
+            n_rows = X.shape[0]
+        else:
+            descriptor = _memmap_descriptor(X)
+            if descriptor is None:
+                X = np.asarray(X)
+                temporary = SharedArray.create(X.shape, X.dtype)
+                temporary.array[...] = X
+                descriptor = temporary.descriptor()
+            n_rows = X.shape[0]
+
+        chunk_size = chunk_size or max(1, -(-n_rows // (4 * self.n_workers)))
+        try:
+            with SharedArray.create((n_rows,), np.float64) as output:
+                tasks = [(descriptor, output.descriptor(), start, min(start + chunk_size, n_rows))
+                         for start in range(0, n_rows, chunk_size)]
+                rows = sum(self._executor.map(_score_range, tasks))
+                if rows != n_rows:
+                    raise RuntimeError(f"打分行数不一致: {rows} != {n_rows}")
+                return output.array.copy()
+        finally:
+            if temporary is not None:
+                temporary.close()
+
+    def close(self):
+        """
+        关闭工作进程
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,272 @@
+"""
+LightGBM超参数搜索
+
+训练集和验证集只构建、分箱一次并保存为LightGBM二进制文件，各试验进程
+直接加载二进制Dataset，无需重复分箱。试验在进程池中并行执行，CPU线程在
+试验之间均分，而不是每个试验都使用全部核心。支持网格搜索、随机搜索和
+逐次减半（successive halving）剪枝。
+
+试验进程默认以 'spawn' 方式启动：父进程构建Dataset时已初始化OpenMP线程池，
+fork出的子进程再使用多线程训练可能死锁。
+"""
+
+import itertools
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import lightgbm as lgb
+import numpy as np
+
+# 影响分箱的参数，Dataset共享后不能在试验间变化
+DATASET_PARAMS = {'max_bin', 'max_bin_by_feature', 'min_data_in_bin', 'bin_construct_sample_cnt',
+                  'subsample_for_bin', 'use_missing', 'zero_as_missing', 'categorical_feature'}
+
+# 越大越好的评价指标
+HIGHER_IS_BETTER = {'auc', 'average_precision', 'ndcg', 'map'}
+
+# 与迭代次数、线程数等价的参数别名，由搜索统一控制
+ITERATION_ALIASES = ('n_estimators', 'num_iterations', 'num_iteration', 'n_iter',
+                      'num_tree', 'num_trees', 'num_round', 'num_rounds', 'num_boost_round')
+THREAD_ALIASES = ('n_jobs', 'num_threads', 'num_thread', 'nthread', 'nthreads')
+
+# 工作进程内缓存的Dataset，每个进程只加载一次
+_worker_datasets = {}
+
+
+def _load_datasets(train_path, valid_path):
+    key = (train_path, valid_path)
+    if key not in _worker_datasets:
+        train_set = lgb.Dataset(train_path, params={'verbose': -1})
+        valid_set = lgb.Dataset(valid_path, reference=train_set, params={'verbose': -1})
+        _worker_datasets[key] = (train_set, valid_set)
+    return _worker_datasets[key]
+
+
+def _run_trial(trial_id, params, num_rounds, train_path, valid_path, metric, early_stopping_rounds):
+    """
+    在工作进程中执行一次试验
+
+    Returns:
+        Dict: 试验结果
+    """
+    train_set, valid_set = _load_datasets(train_path, valid_path)
+    trial_params = dict(params)
+    trial_params['metric'] = metric
+
+    start_time = time.perf_counter()
+    booster = lgb.train(
+        trial_params, train_set, num_boost_round=num_rounds,
+        valid_sets=[valid_set], valid_names=['valid'],
+        callbacks=[lgb.early_stopping(stopping_rounds=early_stopping_rounds, verbose=False)]
+    )
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'trial_id': trial_id,
+        'params': params,
+        'num_rounds': num_rounds,
+        'best_iteration': booster.best_iteration,
+        'score': booster.best_score['valid'][metric],
+        'seconds': elapsed
+    }
+
+
+def grid_candidates(param_grid):
+    """
+    生成网格搜索的全部参数组合
+
+    Args:
+        param_grid: 参数名到候选值列表的字典
+
+    Returns:
+        List[Dict]: 参数组合列表
+    """
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_grid[name] for name in names))]
+
+
+def random_candidates(param_distributions, n_trials, random_state=42):
+    """
+    随机采样参数组合
+
+    Args:
+        param_distributions: 参数名到取值方式的字典，取值方式可以是
+            列表（均匀抽取一个元素）、(low, high) 元组（整数时均匀取整，
+            浮点数时均匀采样）或接收np.random.Generator的函数
+        n_trials: 采样次数
+        random_state: 随机种子
+
+    Returns:
+        List[Dict]: 参数组合列表
+    """
+    rng = np.random.default_rng(random_state)
+    candidates = []
+    for _ in range(n_trials):
+        params = {}
+        for name, distribution in param_distributions.items():
+            if callable(distribution):
+                params[name] = distribution(rng)
+            elif isinstance(distribution, tuple):
+                low, high = distribution
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = int(rng.integers(low, high + 1))
+                else:
+                    params[name] = float(rng.uniform(low, high))
+            else:
+                params[name] = distribution[int(rng.integers(len(distribution)))]
+        candidates.append(params)
+    return candidates
+
+
+class HyperparameterSearch:
+    """
+    基于共享二进制Dataset的并行超参数搜索
+    """
+
+    def __init__(self, base_params=None, metric='binary_logloss', n_workers=None,
+                 threads_per_trial=None, early_stopping_rounds=50, work_dir=None, mp_context='spawn'):
+        """
+        初始化搜索
+
+        Args:
+            base_params: 所有试验共用的基础参数
+            metric: 用于排序和剪枝的验证集指标
+            n_workers: 并行试验的进程数，默认为CPU核数
+            threads_per_trial: 每个试验使用的线程数，默认为 CPU核数 / n_workers
+            early_stopping_rounds: 试验内部的早停轮数
+            work_dir: 保存二进制Dataset的目录，默认使用临时目录并在结束后删除
+            mp_context: 试验进程的启动方式，默认 'spawn'
+        """
+        cpu_count = os.cpu_count() or 1
+        self.base_params = dict(base_params or {'objective': 'binary'})
+        self.metric = metric
+        self.n_workers = n_workers or cpu_count
+        self.threads_per_trial = threads_per_trial or max(1, cpu_count // self.n_workers)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.work_dir = work_dir
+        self.mp_context = mp_context
+        self.results_ = []
+        self.best_params_ = None
+
+    def _trial_params(self, candidate):
+        invalid = DATASET_PARAMS.intersection(candidate)
+        if invalid:
+            raise ValueError(f"以下参数影响分箱，不能在共享Dataset的搜索中变化: {sorted(invalid)}")
+
+        params = dict(self.base_params)
+        params.update(candidate)
+        for alias in ITERATION_ALIASES + THREAD_ALIASES:
+            params.pop(alias, None)
+        params['num_threads'] = self.threads_per_trial
+        params['verbose'] = -1
+        return params
+
+    def _build_datasets(self, X_train, y_train, X_valid, y_valid, work_dir, feature_names):
+        """
+        构建并保存二进制Dataset，只分箱一次
+        """
+        dataset_params = {key: value for key, value in self.base_params.items() if key in DATASET_PARAMS}
+        dataset_params['verbose'] = -1
+
+        train_path = os.path.join(work_dir, 'train.bin')
+        valid_path = os.path.join(work_dir, 'valid.bin')
+        feature_name = feature_names if feature_names is not None else 'auto'
+
+        train_set = lgb.Dataset(X_train, label=y_train, feature_name=feature_name,
+                                params=dataset_params, free_raw_data=True)
+        train_set.save_binary(train_path)
+        # 验证集以训练集为参照，使用相同的分箱边界
+        valid_set = lgb.Dataset(X_valid, label=y_valid, feature_name=feature_name, reference=train_set)
+        valid_set.save_binary(valid_path)
+        return train_path, valid_path
+
+    def _rank(self, results):
+        sign = -1 if self.metric in HIGHER_IS_BETTER else 1
+        return sorted(results, key=lambda result: (sign * result['score'], result['seconds']))
+
+    def fit(self, X_train, y_train, X_valid, y_valid, candidates, num_boost_round=500,
+            strategy='full', min_rounds=50, reduction_factor=3, feature_names=None):
+        """
+        执行搜索
+
+        Args:
+            X_train: 训练特征数据
+            y_train: 训练标签数据
+            X_valid: 验证特征数据
+            y_valid: 验证标签数据
+            candidates: 参数组合列表，可由grid_candidates或random_candidates生成
+            num_boost_round: 每个试验的最大迭代次数
+            strategy: 'full' 每个试验都训练完整轮数；'halving' 逐次减半，
+                先用 min_rounds 轮评估全部试验，每一级只保留前 1/reduction_factor
+                并将轮数乘以 reduction_factor，直到达到 num_boost_round
+            min_rounds: 逐次减半第一级的迭代次数
+            reduction_factor: 逐次减半的淘汰比例
+            feature_names: 特征名称列表（可选）
+
+        Returns:
+            List[Dict]: 按验证指标和耗时排序的试验结果
+        """
+        if not candidates:
+            raise ValueError("候选参数组合为空")
+
+        work_dir = self.work_dir or tempfile.mkdtemp(prefix='lgbm_search_')
+        os.makedirs(work_dir, exist_ok=True)
+        trials = [(trial_id, self._trial_params(candidate)) for trial_id, candidate in enumerate(candidates)]
+
+        if strategy == 'full':
+            rungs = [num_boost_round]
+        elif strategy == 'halving':
+            rungs = []
+            rounds = min_rounds
+            while rounds < num_boost_round:
+                rungs.append(rounds)
+                rounds *= reduction_factor
+            rungs.append(num_boost_round)
+        else:
+            raise ValueError(f"不支持的搜索策略: {strategy}")
+
+        start_time = time.perf_counter()
+        all_results = []
+        try:
+            train_path, valid_path = self._build_datasets(
+                X_train, y_train, X_valid, y_valid, work_dir, feature_names)
+
+            with ProcessPoolExecutor(max_workers=self.n_workers,
+                                     mp_context=multiprocessing.get_context(self.mp_context)) as executor:
+                for rung, num_rounds in enumerate(rungs):
+                    futures = [
+                        executor.submit(_run_trial, trial_id, params, num_rounds, train_path,
+                                        valid_path, self.metric, self.early_stopping_rounds)
+                        for trial_id, params in trials
+                    ]
+                    rung_results = self._rank([future.result() for future in futures])
+                    for result in rung_results:
+                        result['rung'] = rung
+                    all_results.extend(rung_results)
+
+                    if rung < len(rungs) - 1:
+                        # 剪枝：只保留表现最好的前 1/reduction_factor
+                        keep = max(1, len(rung_results) // reduction_factor)
+                        survivors = {result['trial_id'] for result in rung_results[:keep]}
+                        trials = [(trial_id, params) for trial_id, params in trials if trial_id in survivors]
+        finally:
+            if self.work_dir is None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+        # 每个试验保留其到达的最高一级结果，到达更高级的试验排在前面
+        final = {}
+        for result in all_results:
+            final[result['trial_id']] = result
+        ranked = self._rank(final.values())
+        self.results_ = sorted(ranked, key=lambda result: -result['rung'])
+        self.best_params_ = dict(candidates[self.results_[0]['trial_id']])
+        self.elapsed_ = time.perf_counter() - start_time
+
+        best = self.results_[0]
+        print(f"超参数搜索完成: {len(candidates)} 组参数, 耗时 {self.elapsed_:.1f} s, "
+              f"最佳 {self.metric} = {best['score']:.6f}")
+        return self.results_
@@ -0,0 +1 @@
+# 在线服务模块
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+预测服务压测脚本
+
+开启多个并发keep-alive连接持续发送 /predict 请求，统计客户端延迟和吞吐量，
+结束后拉取服务端的 /metrics 以查看批大小分布
+
+用法:
+    python -m src.serving.load_generator --port 8080 --concurrency 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    data = await reader.readexactly(length)
+    return int(status_line.split()[1]), json.loads(data)
+
+
+async def _worker(host, port, deadline, rows_per_request, n_features, latencies, errors, seed):
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            payload = {'features': rng.random((rows_per_request, n_features)).tolist()}
+            start_time = time.perf_counter()
+            status, _ = await _request(reader, writer, 'POST', '/predict', payload)
+            if status == 200:
+                latencies.append(time.perf_counter() - start_time)
+            else:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host='127.0.0.1', port=8080, concurrency=64, duration=10.0,
+                   rows_per_request=1, n_features=10):
+    """
+    执行压测
+
+    Args:
+        host: 服务地址
+        port: 服务端口
+        concurrency: 并发连接数
+        duration: 压测时长（秒）
+        rows_per_request: 每个请求包含的特征行数
+        n_features: 特征数量
+
+    Returns:
+        Dict: 客户端统计结果和服务端指标
+    """
+    latencies, errors = [], []
+    start_time = time.perf_counter()
+    deadline = start_time + duration
+    await asyncio.gather(*[
+        _worker(host, port, deadline, rows_per_request, n_features, latencies, errors, seed)
+        for seed in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start_time
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, server_metrics = await _request(reader, writer, 'GET', '/metrics')
+    finally:
+        writer.close()
+
+    latencies_ms = np.asarray(latencies) * 1000
+    client = {'requests': len(latencies), 'errors': len(errors),
+              'requests_per_sec': len(latencies) / elapsed}
+    if len(latencies_ms):
+        client['p50_ms'], client['p99_ms'] = np.percentile(latencies_ms, [50, 99]).tolist()
+    return {'client': client, 'server': server_metrics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='预测服务压测')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--rows-per-request', type=int, default=1)
+    parser.add_argument('--n-features', type=int, default=10)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load(args.host, args.port, args.concurrency, args.duration,
+                                  args.rows_per_request, args.n_features))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
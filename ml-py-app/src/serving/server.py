@@ -0,0 +1,344 @@
+"""
+投诉风险在线预测服务
+
+基于asyncio的轻量HTTP服务，常驻加载 LightGBMComplaintPredictor，
+将并发请求合并为微批次后在线程池中统一预测，减少每次调用的固定开销。
+
+接口:
+    POST /predict  请求体 {"features": [[...], ...], "raw": false}
+    GET  /metrics  延迟分位数和批大小分布
+    GET  /health   健康检查
+
+用法:
+    python -m src.serving.server --model models/lgbm_complaint_predictor.joblib --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..models.lgbm_model import LightGBMComplaintPredictor
+from ..utils.utils import calculate_risk_levels
+
+
+class ServingMetrics:
+    """
+    服务指标：最近请求的延迟分位数与批大小分布
+    """
+
+    def __init__(self, window=10000):
+        """
+        初始化指标
+
+        Args:
+            window: 统计延迟分位数时保留的最近请求数
+        """
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.batches = 0
+
+    def record_request(self, latency):
+        self.latencies.append(latency)
+        self.requests += 1
+
+    def record_batch(self, n_requests):
+        self.batch_sizes[n_requests] += 1
+        self.batches += 1
+
+    def snapshot(self):
+        """
+        获取指标快照
+
+        Returns:
+            Dict: 请求数、批次数、延迟分位数（毫秒）和批大小直方图
+        """
+        latencies = np.fromiter(self.latencies, dtype=np.float64) * 1000
+        percentiles = {}
+        if len(latencies):
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            percentiles = {'p50_ms': p50, 'p90_ms': p90, 'p99_ms': p99}
+
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'latency': percentiles,
+            'batch_size_histogram': {str(size): count for size, count in sorted(self.batch_sizes.items())}
+        }
+
+
+class MicroBatcher:
+    """
+    微批次合并器
+
+    收到第一个请求后最多等待 max_wait 秒，或累计到 max_batch_size 行后，
+    将队列中的请求合并为一次predict调用，在线程池中执行以免阻塞事件循环。
+    最多 n_workers 个批次同时预测；所有线程都忙时请求留在队列中，
+    有线程空闲后合并为更大的批次
+    """
+
+    def __init__(self, model, max_batch_size=256, max_wait=0.002, n_workers=1, metrics=None):
+        """
+        初始化合并器
+
+        Args:
+            model: 已加载的 LightGBMComplaintPredictor
+            max_batch_size: 每批最多合并的特征行数
+            max_wait: 凑批的最长等待时间（秒）
+            n_workers: 执行预测的线程数，即同时进行的批次数
+            metrics: ServingMetrics实例（可选）
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.n_workers = n_workers
+        self.metrics = metrics or ServingMetrics()
+        self._executor = ThreadPoolExecutor(max_workers=n_workers)
+        self._queue = None
+        self._slots = None
+        self._task = None
+        self._batch_tasks = set()
+
+    def start(self):
+        """
+        启动后台合并任务，需在事件循环中调用
+        """
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.n_workers)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        停止后台合并任务
+        """
+        tasks = list(self._batch_tasks)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, features):
+        """
+        提交一组特征行并等待预测结果
+
+        Args:
+            features: 形状为 (n, n_features) 的特征矩阵
+
+        Returns:
+            np.ndarray: 预测概率
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # 先等待空闲线程再凑批：线程都忙时请求在队列中积累，空闲后一次合并
+            await self._slots.acquire()
+            try:
+                batch = [await self._queue.get()]
+            except BaseException:
+                self._slots.release()
+                raise
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            # 在等待窗口内尽量多地合并请求
+            while rows < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+
+            # 本批在后台预测，合并循环继续收集下一批
+            task = loop.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                X = np.concatenate([features for features, _ in batch]) if len(batch) > 1 else batch[0][0]
+                y_pred_proba = await loop.run_in_executor(self._executor, self._predict, X)
+            except Exception as e:
+                # 只让本批请求失败，合并任务继续处理后续请求
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            self.metrics.record_batch(len(batch))
+            offset = 0
+            for features, future in batch:
+                if not future.done():
+                    future.set_result(y_pred_proba[offset:offset + len(features)])
+                offset += len(features)
+        finally:
+            self._slots.release()
+
+    def _predict(self, X):
+        y_pred_proba, _ = self.model.predict(X)
+        return y_pred_proba
+
+
+class PredictionServer:
+    """
+    基于asyncio streams的HTTP/1.1预测服务，支持keep-alive
+    """
+
+    def __init__(self, model, host='127.0.0.1', port=8080, threshold=0.5, **batcher_kwargs):
+        """
+        初始化服务
+
+        Args:
+            model: 已加载的 LightGBMComplaintPredictor
+            host: 监听地址
+            port: 监听端口
+            threshold: 分类阈值
+            **batcher_kwargs: 传给MicroBatcher的参数
+        """
+        self.model = model
+        self.host = host
+        self.port = port
+        self.threshold = threshold
+        self.metrics = ServingMetrics()
+        self.batcher = MicroBatcher(model, metrics=self.metrics, **batcher_kwargs)
+        self._server = None
+
+    async def start(self):
+        """
+        启动服务
+        """
+        # 预热一次，避免首个请求承担模型初始化的开销
+        self.model.predict(np.zeros((1, len(self.model.feature_names))))
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"预测服务已启动: http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                body = b''
+                if 'content-length' in headers:
+                    body = await reader.readexactly(int(headers['content-length']))
+
+                status, payload = await self._dispatch(method, path, body)
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return '200 OK', {'status': 'ok'}
+        if method == 'GET' and path == '/metrics':
+            return '200 OK', self.metrics.snapshot()
+        if method == 'POST' and path == '/predict':
+            return await self._predict(body)
+        return '404 Not Found', {'error': f'未知接口: {method} {path}'}
+
+    async def _predict(self, body):
+        start_time = time.perf_counter()
+        try:
+            request = json.loads(body)
+            features = np.asarray(request['features'], dtype=np.float64)
+            if features.ndim == 1 and features.size:
+                features = features.reshape(1, -1)
+            if features.ndim != 2 or features.size == 0:
+                raise ValueError(f"features 必须是非空的二维数组，实际形状为 {features.shape}")
+            n_features = len(self.model.feature_names or ())
+            if n_features and features.shape[1] != n_features:
+                raise ValueError(f"特征数量不匹配: 期望 {n_features}，实际 {features.shape[1]}")
+            if request.get('raw'):
+                # 原始特征使用训练时的scaler转换
+                features = self.model.transform(features)
+        except (ValueError, KeyError, TypeError) as e:
+            return '400 Bad Request', {'error': f'请求格式错误: {e}'}
+
+        try:
+            y_pred_proba = await self.batcher.submit(features)
+        except Exception as e:
+            return '500 Internal Server Error', {'error': str(e)}
+
+        risk_levels, _ = calculate_risk_levels(y_pred_proba)
+        self.metrics.record_request(time.perf_counter() - start_time)
+        return '200 OK', {
+            'probabilities': y_pred_proba.tolist(),
+            'classes': (y_pred_proba >= self.threshold).astype(int).tolist(),
+            'risk_levels': risk_levels.tolist()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='投诉风险在线预测服务')
+    parser.add_argument('--model', required=True, help='模型文件路径')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--workers', type=int, default=1, help='同时预测的批次数（线程数）')
+    args = parser.parse_args()
+
+    model = LightGBMComplaintPredictor().load_model(args.model)
+    server = PredictionServer(model, host=args.host, port=args.port,
+                              max_batch_size=args.max_batch_size,
+                              max_wait=args.max_wait_ms / 1000,
+                              n_workers=args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+数组复制审计
+
+调试模式下记录数据流水线中每一次完整数组的复制（阶段、原因、形状、类型、字节数），
+用于检查特征矩阵在预处理、划分、构建Dataset和预测之间被复制了几次。
+默认关闭，关闭时 record 只有一次布尔判断。
+设置环境变量 ML_APP_COPY_AUDIT=1、调用 enable() 或使用 with audit(): 开启。
+"""
+
+import contextlib
+import os
+import threading
+
+import numpy as np
+
+_enabled = os.environ.get('ML_APP_COPY_AUDIT', '').lower() in ('1', 'true', 'yes')
+_lock = threading.Lock()
+_records = []
+
+
+def enable(enabled=True):
+    """
+    开启或关闭复制审计
+
+    Args:
+        enabled: 是否开启
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    """
+    Returns:
+        bool: 复制审计是否开启
+    """
+    return _enabled
+
+
+def record(stage, array, reason):
+    """
+    记录一次复制
+
+    Args:
+        stage: 发生复制的阶段，如 'preprocess_features'
+        array: 复制得到的数组
+        reason: 复制原因，如 'dtype'、'layout'、'index'
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _records.append({
+            'stage': stage,
+            'reason': reason,
+            'shape': tuple(array.shape),
+            'dtype': array.dtype.name,
+            'nbytes': int(array.nbytes)
+        })
+
+
+def ensure_array(X, stage, dtype=None):
+    """
+    转换为C连续的浮点数组，只在类型或内存布局不符时复制，并记录复制
+
+    Args:
+        X: 输入数组
+        stage: 所在阶段
+        dtype: 目标类型，为None时浮点输入保持原类型，其他输入转为float32
+
+    Returns:
+        np.ndarray: C连续数组，无需复制时为输入本身
+    """
+    source = X
+    X = np.asarray(X)
+    if dtype is None:
+        dtype = X.dtype if X.dtype in (np.float32, np.float64) else np.float32
+    result = np.ascontiguousarray(X, dtype=dtype)
+    if _enabled:
+        if not isinstance(source, np.ndarray):
+            record(stage, result, 'convert')
+        elif not np.may_share_memory(result, source):
+            record(stage, result, 'dtype' if source.dtype != result.dtype else 'layout')
+    return result
+
+
+def get_records():
+    """
+    Returns:
+        List[Dict]: 所有复制记录
+    """
+    with _lock:
+        return list(_records)
+
+
+def clear():
+    """
+    清空复制记录
+    """
+    with _lock:
+        _records.clear()
+
+
+def summary():
+    """
+    按阶段汇总复制记录
+
+    Returns:
+        Dict: copies（总次数）、bytes（总字节数）和 stages（每个阶段的次数、字节数和原因）
+    """
+    stages = {}
+    for item in get_records():
+        stage = stages.setdefault(item['stage'], {'copies': 0, 'bytes': 0, 'reasons': {}})
+        stage['copies'] += 1
+        stage['bytes'] += item['nbytes']
+        stage['reasons'][item['reason']] = stage['reasons'].get(item['reason'], 0) + 1
+    return {
+        'copies': sum(stage['copies'] for stage in stages.values()),
+        'bytes': sum(stage['bytes'] for stage in stages.values()),
+        'stages': stages
+    }
+
+
+def report():
+    """
+    打印按阶段汇总的复制次数和大小
+    """
+    result = summary()
+    print(f"数组复制: {result['copies']} 次, 共 {result['bytes'] / (1024 * 1024):.1f} MB")
+    for stage, item in result['stages'].items():
+        reasons = ', '.join(f'{reason}={count}' for reason, count in item['reasons'].items())
+        print(f"  {stage:<24} {item['copies']:>4} 次 {item['bytes'] / (1024 * 1024):>10.1f} MB  ({reasons})")
+
+
+@contextlib.contextmanager
+def audit():
+    """
+    在代码块内临时开启复制审计，结束后恢复原状态
+
+    Yields:
+        List[Dict]: 代码块内产生的复制记录，代码块结束后填充
+    """
+    global _enabled
+    previous = _enabled
+    start = len(_records)
+    records = []
+    _enabled = True
+    try:
+        yield records
+    finally:
+        _enabled = previous
+        with _lock:
+            records.extend(_records[start:])
@@ -0,0 +1,45 @@
+"""
+哈希的公共函数
+
+文件哈希只依赖标准库；mix64 在调用时才导入numpy，
+只读取模型清单的进程导入本模块时不会加载numpy。
+"""
+
+import hashlib
+
+
+def file_sha256(file_path, block_size=1 << 20):
+    """
+    分块计算文件内容的SHA-256哈希
+
+    Args:
+        file_path: 文件路径
+        block_size: 每次读取的字节数
+
+    Returns:
+        str: 十六进制哈希值
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def mix64(h):
+    """
+    splitmix64的最终混合步骤，使哈希值各位分布均匀
+
+    Args:
+        h: uint64标量或数组，调用方负责在 np.errstate(over='ignore') 下调用
+
+    Returns:
+        与输入形状相同的uint64哈希
+    """
+    import numpy as np
+
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
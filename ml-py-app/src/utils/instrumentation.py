@@ -0,0 +1,308 @@
+"""
+流水线阶段埋点
+
+提供上下文管理器 span 和装饰器 instrument，记录每个阶段的墙钟时间、
+CPU时间、处理行数、行/秒，以及阶段结束时进程生命周期内的峰值RSS
+（process_peak_rss_bytes，是整个进程的最大值而不是该阶段自身的峰值；
+多个线程的阶段可能同时运行，不按阶段重置峰值）。默认关闭，关闭时 span 返回共享的
+空对象、instrument 直接调用原函数，开销只有一次布尔判断。
+
+结果可以导出为JSON Lines结构化日志和Prometheus文本格式文件。
+设置环境变量 ML_APP_INSTRUMENTATION=1 或调用 enable() 开启。
+只依赖标准库。
+"""
+
+import functools
+import inspect
+from collections.abc import Iterator
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from .memory import peak_rss_bytes
+
+_enabled = os.environ.get('ML_APP_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+_lock = threading.Lock()
+_records = []
+_local = threading.local()
+
+logger = logging.getLogger('complaint_prediction.instrumentation')
+
+
+def enable(enabled=True):
+    """
+    开启或关闭埋点
+
+    Args:
+        enabled: 是否开启
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    """
+    Returns:
+        bool: 埋点是否开启
+    """
+    return _enabled
+
+
+def count_rows(obj):
+    """
+    推断数据对象的行数
+
+    Args:
+        obj: DataFrame、数组或 (X, y) 元组
+
+    Returns:
+        int 或 None: 行数，无法推断（如迭代器）时返回None
+    """
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    shape = getattr(obj, 'shape', None)
+    if shape:
+        return int(shape[0])
+    if isinstance(obj, (list, tuple)):
+        return len(obj)
+    return None
+
+
+class _NullSpan:
+    """
+    埋点关闭时使用的空span
+    """
+
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    一次阶段执行的计时记录
+    """
+
+    def __init__(self, name, rows=None, **labels):
+        self.name = name
+        self.rows = rows
+        self.labels = labels
+        # 为True时结束后不记录
+        self.discard = False
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        # 迭代器的span可能在其他span打开时结束，不一定位于栈顶
+        _local.stack.remove(self)
+        if self.discard:
+            return False
+
+        record = {
+            'stage': self.name,
+            'parent': self.parent,
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'rows': self.rows,
+            'rows_per_sec': self.rows / wall if self.rows and wall > 0 else None,
+            'process_peak_rss_bytes': peak_rss_bytes(),
+            # 迭代器未消费完就被关闭（GeneratorExit）不算异常
+            'status': 'ok' if exc_type is None or issubclass(exc_type, GeneratorExit) else 'error'
+        }
+        if self.labels:
+            record['labels'] = self.labels
+
+        with _lock:
+            _records.append(record)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(record, ensure_ascii=False))
+        return False
+
+
+def span(name, rows=None, **labels):
+    """
+    记录一个阶段的上下文管理器，行数可以在进入后通过 span.rows 设置
+
+    Args:
+        name: 阶段名
+        rows: 处理行数（可选）
+        **labels: 附加标签
+
+    Returns:
+        Span: 埋点开启时的记录对象，关闭时为空对象
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, rows, **labels)
+
+
+def _instrument_iterator(stage, iterator):
+    """
+    包装函数返回的迭代器：span从第一次取值开始，到迭代器耗尽或关闭时结束，
+    行数为产出的各数据块行数之和。墙钟时间包含消费方在两次取值之间的处理时间
+    """
+    with Span(stage, rows=0) as current:
+        for chunk in iterator:
+            current.rows += count_rows(chunk) or 0
+            yield chunk
+
+
+def instrument(name=None, rows_from='result'):
+    """
+    为函数添加阶段埋点的装饰器
+
+    被装饰的函数返回迭代器（如流式处理的数据块生成器）时，返回包装后的迭代器，
+    阶段在迭代器耗尽时才记录，行数为各数据块行数之和
+
+    Args:
+        name: 阶段名，默认使用函数名
+        rows_from: 行数来源，'result' 表示从返回值推断，
+            其他值表示从同名参数推断，为None时不记录行数
+
+    Returns:
+        Callable: 装饰器
+    """
+    def decorator(func):
+        stage = name or func.__name__
+        arg_index = None
+        if rows_from not in (None, 'result'):
+            arg_index = list(inspect.signature(func).parameters).index(rows_from)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            with Span(stage) as current:
+                if arg_index is not None:
+                    current.rows = count_rows(
+                        args[arg_index] if arg_index < len(args) else kwargs.get(rows_from))
+                result = func(*args, **kwargs)
+                if isinstance(result, Iterator):
+                    # 实际处理在消费迭代器时才发生，不记录本次调用
+                    current.discard = True
+                    return _instrument_iterator(stage, result)
+                if rows_from == 'result':
+                    current.rows = count_rows(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def get_records():
+    """
+    Returns:
+        List[Dict]: 已记录的阶段（副本）
+    """
+    with _lock:
+        return list(_records)
+
+
+def clear():
+    """
+    清空已记录的阶段
+    """
+    with _lock:
+        _records.clear()
+
+
+def summarize(records=None):
+    """
+    按阶段汇总记录
+
+    Args:
+        records: 记录列表，默认使用全部已记录的阶段
+
+    Returns:
+        Dict[str, Dict]: 阶段名到调用次数、总墙钟时间、总CPU时间、总行数、
+            行/秒和阶段结束时进程峰值RSS的映射
+    """
+    summary = {}
+    for record in get_records() if records is None else records:
+        item = summary.setdefault(record['stage'], {
+            'calls': 0, 'errors': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+            'rows': 0, 'process_peak_rss_bytes': 0
+        })
+        item['calls'] += 1
+        item['errors'] += record['status'] != 'ok'
+        item['wall_seconds'] += record['wall_seconds']
+        item['cpu_seconds'] += record['cpu_seconds']
+        item['rows'] += record['rows'] or 0
+        item['process_peak_rss_bytes'] = max(item['process_peak_rss_bytes'], record['process_peak_rss_bytes'])
+
+    for item in summary.values():
+        item['rows_per_sec'] = item['rows'] / item['wall_seconds'] if item['wall_seconds'] > 0 else 0.0
+    return summary
+
+
+def export_json(file_path):
+    """
+    将记录导出为JSON Lines格式（每行一个阶段）
+
+    Args:
+        file_path: 输出文件路径
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for record in get_records():
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def export_prometheus(file_path, prefix='ml_app'):
+    """
+    将按阶段汇总的结果导出为Prometheus文本格式，
+    可由node_exporter的textfile收集器读取
+
+    Args:
+        file_path: 输出文件路径
+        prefix: 指标名前缀
+    """
+    summary = summarize()
+    metrics = (
+        ('stage_calls_total', 'counter', '阶段调用次数', 'calls'),
+        ('stage_errors_total', 'counter', '阶段异常次数', 'errors'),
+        ('stage_wall_seconds_total', 'counter', '阶段累计墙钟时间（秒）', 'wall_seconds'),
+        ('stage_cpu_seconds_total', 'counter', '阶段累计CPU时间（秒）', 'cpu_seconds'),
+        ('stage_rows_total', 'counter', '阶段累计处理行数', 'rows'),
+        ('stage_rows_per_second', 'gauge', '阶段平均每秒处理行数', 'rows_per_sec'),
+        ('stage_process_peak_rss_bytes', 'gauge', '阶段结束时进程生命周期内的峰值RSS（字节），不是阶段自身的峰值',
+         'process_peak_rss_bytes'),
+    )
+
+    lines = []
+    for metric, metric_type, help_text, key in metrics:
+        full_name = f'{prefix}_{metric}'
+        lines.append(f'# HELP {full_name} {help_text}')
+        lines.append(f'# TYPE {full_name} {metric_type}')
+        for stage, item in sorted(summary.items()):
+            lines.append(f'{full_name}{{stage="{stage}"}} {item[key]}')
+
+    # 先写临时文件再替换，收集器不会读到写了一半的文件
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, file_path)
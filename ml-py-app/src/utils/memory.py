@@ -0,0 +1,67 @@
+"""
+进程内存读取
+
+读取当前进程的常驻内存（RSS）和峰值常驻内存，并支持重置峰值。
+只依赖标准库，埋点和基准测试共用。
+"""
+
+import resource
+import sys
+
+
+def _read_status_kb(field):
+    """
+    读取 /proc/self/status 中以KB为单位的字段，不支持时返回None
+    """
+    try:
+        with open('/proc/self/status', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_bytes():
+    """
+    获取当前进程的峰值常驻内存，即进程启动（或上次 reset_peak_rss）以来的最大值
+
+    Returns:
+        int: 峰值RSS（字节）
+    """
+    # Linux下优先读取VmHWM：ru_maxrss会在exec时继承父进程的峰值，
+    # 由大内存父进程启动的子进程会得到偏大的结果
+    peak_kb = _read_status_kb('VmHWM')
+    if peak_kb is not None:
+        return peak_kb * 1024
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux下单位为KB，macOS下为字节
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def current_rss_bytes():
+    """
+    获取当前进程的常驻内存
+
+    Returns:
+        int: 当前RSS（字节），无法读取时返回0
+    """
+    rss_kb = _read_status_kb('VmRSS')
+    return rss_kb * 1024 if rss_kb is not None else 0
+
+
+def reset_peak_rss():
+    """
+    将峰值RSS重置为当前RSS，使之后的 peak_rss_bytes 只反映重置后的阶段
+
+    Returns:
+        bool: 是否重置成功（仅Linux支持）
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='utf-8') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
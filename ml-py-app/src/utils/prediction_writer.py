@@ -0,0 +1,78 @@
+"""
+预测结果的增量写入
+
+按块追加写入CSV或Parquet文件，写入过程中只持有当前数据块
+"""
+
+import os
+
+import pandas as pd
+
+
+class PredictionWriter:
+    """
+    预测结果写入器，根据文件扩展名选择CSV或Parquet格式
+    """
+
+    def __init__(self, file_path):
+        """
+        初始化写入器
+
+        Args:
+            file_path: 输出文件路径，扩展名为 .csv 或 .parquet
+        """
+        if file_path.endswith('.csv'):
+            self.format = 'csv'
+        elif file_path.endswith('.parquet'):
+            self.format = 'parquet'
+        else:
+            raise ValueError(f"不支持的输出格式: {file_path}")
+
+        self.file_path = file_path
+        self.rows_written = 0
+        self._parquet_writer = None
+        self._header_written = False
+
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, frame: pd.DataFrame):
+        """
+        追加写入一个数据块
+
+        Args:
+            frame: 预测结果数据块
+        """
+        if self.format == 'csv':
+            frame.to_csv(self.file_path, mode='a' if self._header_written else 'w',
+                         header=not self._header_written, index=False, encoding='utf-8')
+            self._header_written = True
+        else:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("写入Parquet需要安装pyarrow") from e
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.file_path, table.schema)
+            self._parquet_writer.write_table(table)
+
+        self.rows_written += len(frame)
+
+    def close(self):
+        """
+        关闭写入器
+        """
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,251 @@
+"""
+无界面的评估报告渲染
+
+直接使用 matplotlib 的面向对象接口和 Agg 画布把图表写入文件，
+不经过 pyplot，不修改全局后端，也不调用 plt.show，可以在无显示的服务器
+和多进程中使用。每份报告包含混淆矩阵、ROC曲线（降采样到有限点数）、
+预测概率分布和特征重要性（可选），以及指标JSON。
+多份报告（如按供电区域）可以在进程池中并行渲染。
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from ..models.evaluation import evaluate_scores
+
+# ROC曲线默认保留的最大点数
+DEFAULT_ROC_POINTS = 500
+
+
+def _new_figure(figsize):
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _save(figure, file_path, dpi):
+    figure.tight_layout()
+    figure.savefig(file_path, dpi=dpi)
+    return file_path
+
+
+def downsample_curve(x, y, max_points=DEFAULT_ROC_POINTS):
+    """
+    按曲线弧长均匀选取不超过 max_points 个点，保留首尾和拐弯处的形状
+
+    Args:
+        x: 横坐标
+        y: 纵坐标
+        max_points: 最大点数
+
+    Returns:
+        tuple: (降采样后的x, 降采样后的y)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= max_points:
+        return x, y
+
+    arc_length = np.r_[0.0, np.cumsum(np.hypot(np.diff(x), np.diff(y)))]
+    targets = np.linspace(0.0, arc_length[-1], max_points)
+    index = np.unique(np.searchsorted(arc_length, targets).clip(0, len(x) - 1))
+    return x[index], y[index]
+
+
+def render_confusion_matrix(confusion, file_path, class_names=('无投诉', '投诉'), figsize=(8, 6), dpi=100):
+    """
+    绘制混淆矩阵并保存
+
+    Args:
+        confusion: 2x2混淆矩阵，行为真实类别，列为预测类别
+        file_path: 输出文件路径
+        class_names: 类别名称
+        figsize: 图表大小
+        dpi: 分辨率
+
+    Returns:
+        str: 输出文件路径
+    """
+    confusion = np.asarray(confusion)
+    figure = _new_figure(figsize)
+    ax = figure.add_subplot()
+    image = ax.imshow(confusion, cmap='Blues')
+    figure.colorbar(image, ax=ax)
+
+    # 深色格子用白色文字
+    middle = confusion.max() / 2
+    for (row, column), value in np.ndenumerate(confusion):
+        ax.text(column, row, f'{value:d}', ha='center', va='center',
+                color='white' if value > middle else 'black')
+
+    ax.set_xticks(range(len(class_names)), labels=class_names)
+    ax.set_yticks(range(len(class_names)), labels=class_names)
+    ax.set_xlabel('预测类别')
+    ax.set_ylabel('真实类别')
+    ax.set_title('混淆矩阵')
+    return _save(figure, file_path, dpi)
+
+
+def render_roc_curve(fpr, tpr, roc_auc, file_path, max_points=DEFAULT_ROC_POINTS, figsize=(8, 6), dpi=100):
+    """
+    绘制ROC曲线并保存
+
+    Args:
+        fpr: 假阳性率
+        tpr: 真阳性率
+        roc_auc: AUC
+        file_path: 输出文件路径
+        max_points: 曲线最多保留的点数
+        figsize: 图表大小
+        dpi: 分辨率
+
+    Returns:
+        str: 输出文件路径
+    """
+    fpr, tpr = downsample_curve(np.r_[0.0, fpr], np.r_[0.0, tpr], max_points)
+
+    figure = _new_figure(figsize)
+    ax = figure.add_subplot()
+    ax.plot(fpr, tpr, color='blue', lw=2, label=f'ROC曲线 (面积 = {roc_auc:.3f})')
+    ax.plot([0, 1], [0, 1], color='red', lw=2, linestyle='--')
+    ax.set_xlim([0.0, 1.0])
+    ax.set_ylim([0.0, 1.05])
+    ax.set_xlabel('假阳性率')
+    ax.set_ylabel('真阳性率')
+    ax.set_title('受试者工作特征 (ROC) 曲线')
+    ax.legend(loc='lower right')
+    return _save(figure, file_path, dpi)
+
+
+def render_score_distribution(y_true, y_score, file_path, bins=30, figsize=(10, 6), dpi=100):
+    """
+    绘制两类样本的预测概率分布并保存
+
+    Args:
+        y_true: 真实标签
+        y_score: 预测概率
+        file_path: 输出文件路径
+        bins: 直方图分箱数
+        figsize: 图表大小
+        dpi: 分辨率
+
+    Returns:
+        str: 输出文件路径
+    """
+    y_true = np.asarray(y_true)
+    y_score = np.asarray(y_score)
+    edges = np.linspace(0.0, 1.0, bins + 1)
+
+    figure = _new_figure(figsize)
+    ax = figure.add_subplot()
+    # 先用numpy分箱再画柱状图，绘图成本与样本数无关
+    for label, name in ((0, '无投诉'), (1, '投诉')):
+        counts, _ = np.histogram(y_score[y_true == label], bins=edges)
+        ax.stairs(counts, edges, fill=True, alpha=0.5, label=name)
+    ax.set_xlabel('预测概率')
+    ax.set_ylabel('频率')
+    ax.set_title('预测概率分布')
+    ax.legend()
+    return _save(figure, file_path, dpi)
+
+
+def render_feature_importance(feature_names, importances, file_path, max_num_features=10,
+                              figsize=(10, 6), dpi=100):
+    """
+    绘制特征重要性（增益）并保存
+
+    Args:
+        feature_names: 特征名称
+        importances: 各特征的重要性
+        file_path: 输出文件路径
+        max_num_features: 显示的最大特征数量
+        figsize: 图表大小
+        dpi: 分辨率
+
+    Returns:
+        str: 输出文件路径
+    """
+    importances = np.asarray(importances, dtype=np.float64)
+    order = np.argsort(importances)[-max_num_features:]
+
+    figure = _new_figure(figsize)
+    ax = figure.add_subplot()
+    ax.barh([feature_names[i] for i in order], importances[order])
+    ax.set_xlabel('重要性 (增益)')
+    ax.set_title('LightGBM 特征重要性')
+    return _save(figure, file_path, dpi)
+
+
+def render_report(y_true, y_score, output_dir, threshold=0.5, feature_names=None,
+                  importances=None, image_format='png', dpi=100, max_roc_points=DEFAULT_ROC_POINTS):
+    """
+    渲染一份完整的评估报告
+
+    Args:
+        y_true: 真实标签
+        y_score: 预测概率
+        output_dir: 输出目录
+        threshold: 分类阈值
+        feature_names: 特征名称（与importances同时提供时绘制特征重要性）
+        importances: 各特征的重要性
+        image_format: 图片格式，如 'png'、'svg'
+        dpi: 分辨率
+        max_roc_points: ROC曲线最多保留的点数
+
+    Returns:
+        Dict: 输出文件路径和评估指标
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    evaluation = evaluate_scores(y_true, y_score, threshold=threshold)
+    metrics = evaluation['metrics']
+
+    def path(name):
+        return os.path.join(output_dir, f'{name}.{image_format}')
+
+    files = {
+        'confusion_matrix': render_confusion_matrix(metrics['confusion_matrix'], path('confusion_matrix'), dpi=dpi),
+        'roc_curve': render_roc_curve(evaluation['curve']['fpr'], evaluation['curve']['tpr'],
+                                      metrics['roc_auc'], path('roc_curve'), max_roc_points, dpi=dpi),
+        'score_distribution': render_score_distribution(y_true, y_score, path('score_distribution'), dpi=dpi)
+    }
+    if feature_names is not None and importances is not None:
+        files['feature_importance'] = render_feature_importance(
+            feature_names, importances, path('feature_importance'), dpi=dpi)
+
+    summary = dict(metrics, best_threshold=evaluation['best_threshold'], rows=len(y_score))
+    files['metrics'] = os.path.join(output_dir, 'metrics.json')
+    with open(files['metrics'], 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    return {'output_dir': output_dir, 'files': files, 'metrics': summary}
+
+
+def _render_job(job):
+    return render_report(**job)
+
+
+def render_reports(jobs, n_workers=None):
+    """
+    在进程池中并行渲染多份报告
+
+    Args:
+        jobs: 报告参数字典列表，每个字典为 render_report 的关键字参数
+        n_workers: 进程数，默认为CPU核数
+
+    Returns:
+        List[Dict]: 与jobs顺序一致的 render_report 结果
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    n_workers = min(n_workers or os.cpu_count() or 1, len(jobs))
+    if n_workers == 1:
+        return [render_report(**job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(_render_job, jobs))
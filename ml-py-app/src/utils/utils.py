@@ -2,11 +2,17 @@ import os
 import json
 import logging
 from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import confusion_matrix, roc_curve, auc
+from functools import lru_cache
 import numpy as np
 
+# matplotlib、seaborn和sklearn.metrics只在绘图函数中按需导入，
+# 预测路径只使用风险等级等轻量函数
+
+# 风险等级划分点及对应的等级名称和样式类别
+RISK_LEVEL_BINS = (0.3, 0.7)
+RISK_LEVEL_LABELS = ('低风险', '中风险', '高风险')
+RISK_LEVEL_CLASSES = ('risk-low', 'risk-medium', 'risk-high')
+
 def setup_logging(log_dir='logs', log_level=logging.INFO):
     """
     设置日志记录
@@ -81,6 +87,10 @@ def plot_confusion_matrix(y_true, y_pred, class_names=['无投诉', '投诉'], f
         class_names: 类别名称
         figsize: 图表大小
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.metrics import confusion_matrix
+    
     # 计算混淆矩阵
     cm = confusion_matrix(y_true, y_pred)
     
@@ -103,6 +113,9 @@ def plot_roc_curve(y_true, y_score, figsize=(8, 6)):
         y_score: 预测概率
         figsize: 图表大小
     """
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import roc_curve, auc
+    
     # 计算ROC曲线数据
     fpr, tpr, _ = roc_curve(y_true, y_score)
     roc_auc = auc(fpr, tpr)
@@ -129,6 +142,9 @@ def plot_prediction_distribution(y_true, y_score, figsize=(10, 6)):
         y_score: 预测概率
         figsize: 图表大小
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     plt.figure(figsize=figsize)
     
     # 绘制两类的概率分布
@@ -149,15 +165,16 @@ def save_figures(figures_dir='figures'):
     Args:
         figures_dir: 保存目录
     """
+    import matplotlib.pyplot as plt
+    
     # 创建保存目录
     os.makedirs(figures_dir, exist_ok=True)
     
-    # 保存所有图表
-    for i in range(plt.gcf().number):
-        plt.figure(i + 1)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        file_path = os.path.join(figures_dir, f'figure_{i+1}_{timestamp}.png')
-        plt.savefig(file_path, dpi=300, bbox_inches='tight')
+    # 保存所有图表，按实际打开的图表编号遍历
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    for number in plt.get_fignums():
+        file_path = os.path.join(figures_dir, f'figure_{number}_{timestamp}.png')
+        plt.figure(number).savefig(file_path, dpi=300, bbox_inches='tight')
         print(f"图表已保存至: {file_path}")
 
 def create_directory_structure(base_dir):
@@ -219,6 +236,82 @@ def format_percentage(value, decimals=1):
     """
     return f"{value:.{decimals}%}"
 
+def risk_level_codes(probabilities, bins=RISK_LEVEL_BINS):
+    """
+    批量计算风险等级编码
+    
+    Args:
+        probabilities: 预测概率数组
+        bins: 递增的划分点，概率小于bins[0]为等级0，依此类推
+        
+    Returns:
+        np.ndarray: int8类型的风险等级编码
+    """
+    return np.digitize(np.asarray(probabilities), bins).astype(np.int8)
+
+def calculate_risk_levels(probabilities, bins=RISK_LEVEL_BINS,
+                          labels=RISK_LEVEL_LABELS, classes=RISK_LEVEL_CLASSES):
+    """
+    批量计算风险等级，calculate_risk_level的向量化版本
+    
+    Args:
+        probabilities: 预测概率数组，如LightGBMComplaintPredictor.predict返回的概率
+        bins: 递增的划分点
+        labels: 各等级名称，长度为len(bins) + 1
+        classes: 各等级样式类别，长度为len(bins) + 1
+        
+    Returns:
+        tuple: (风险等级数组, 风险类别数组)
+    """
+    if len(labels) != len(bins) + 1 or len(classes) != len(bins) + 1:
+        raise ValueError("labels和classes的长度必须比bins多1")
+    
+    codes = risk_level_codes(probabilities, bins)
+    return np.asarray(labels, dtype=object)[codes], np.asarray(classes, dtype=object)[codes]
+
+# 查找表最多使用的小数位数，3位时为100001个字符串
+PERCENTAGE_TABLE_MAX_DECIMALS = 3
+
+@lru_cache(maxsize=None)
+def _percentage_table(decimals):
+    """
+    [0, 1]内按 10**-(decimals+2) 步长的全部百分比字符串，每个小数位数只生成一次
+    """
+    steps = 10 ** (decimals + 2)
+    return np.array([f"{k / steps:.{decimals}%}" for k in range(steps + 1)], dtype=object)
+
+def format_percentages(values, decimals=1):
+    """
+    批量将小数格式化为百分比，format_percentage的向量化版本
+    
+    小数位数不超过3位、值都在[0, 1]内且元素数多于查找表时，按索引从缓存的查找表取值；
+    恰好落在舍入边界附近的值退回逐元素格式化。其他情况先乘以100再用np.char.mod格式化，
+    与format_percentage相同（'%'格式同样先乘以100，再按二进制精确值舍入）。
+    两种方式的结果都与format_percentage一致
+    
+    Args:
+        values: 小数数组
+        decimals: 小数位数
+        
+    Returns:
+        np.ndarray: 格式化的百分比字符串数组
+    """
+    values = np.asarray(values, dtype=np.float64)
+    
+    if (decimals <= PERCENTAGE_TABLE_MAX_DECIMALS and values.size > 10 ** (decimals + 2)
+            and np.all((values >= 0) & (values <= 1))):
+        table = _percentage_table(decimals)
+        scaled = values * (len(table) - 1)
+        result = table[np.rint(scaled).astype(np.int64)]
+        
+        # 乘法误差可能让接近x.5的值舍入方向与Python格式化不同
+        ambiguous = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+        for i in ambiguous:
+            result[i] = format_percentage(values[i], decimals)
+        return result
+    
+    return np.char.mod(f'%.{decimals}f%%', values * 100).astype(object)
+
 def create_sample_config(config_path='config/config.json'):
     """
     创建示例配置文件
@@ -0,0 +1,70 @@
+"""
+流水线阶段埋点测试
+"""
+
+import time
+
+import pytest
+
+from src.data.data_processor import PowerGridDataProcessor
+from src.utils import instrumentation
+
+
+@pytest.fixture
+def enabled():
+    previous = instrumentation.is_enabled()
+    instrumentation.enable()
+    instrumentation.clear()
+    yield
+    instrumentation.enable(previous)
+    instrumentation.clear()
+
+
+def test_chunked_pipeline_records_full_duration_and_rows(enabled, tmp_path):
+    processor = PowerGridDataProcessor()
+    data = processor.generate_sample_data(n_samples=5000)
+    file_path = str(tmp_path / 'data.csv')
+    data.to_csv(file_path, index=False)
+    processor.fit(data)
+    instrumentation.clear()
+
+    chunks = processor.preprocess_features(processor.clean_data(processor.load_data(file_path, chunksize=1000)))
+    # 迭代器消费完之前不应产生记录
+    assert instrumentation.get_records() == []
+    start = time.perf_counter()
+    rows = sum(len(features) for features, _ in chunks)
+    elapsed = time.perf_counter() - start
+
+    summary = instrumentation.summarize()
+    assert set(summary) == {'load_data', 'clean_data', 'preprocess_features'}
+    assert summary['load_data']['rows'] == len(data)
+    assert summary['clean_data']['rows'] == rows
+    assert summary['preprocess_features']['rows'] == rows
+    for item in summary.values():
+        assert item['calls'] == 1
+        assert item['errors'] == 0
+        # 读取5000行CSV至少需要毫秒级时间，而不是只记录创建迭代器的开销
+        assert 1e-3 < item['wall_seconds'] <= elapsed
+
+
+def test_partially_consumed_iterator_is_not_an_error(enabled):
+    processor = PowerGridDataProcessor()
+    data = processor.generate_sample_data(n_samples=3000)
+    chunks = processor.clean_data(iter([data.iloc[:1000], data.iloc[1000:2000], data.iloc[2000:]]))
+    first = next(chunks)
+    chunks.close()
+
+    record, = instrumentation.get_records()
+    assert record['stage'] == 'clean_data'
+    assert record['status'] == 'ok'
+    assert record['rows'] == len(first)
+
+
+def test_eager_call_records_result_rows(enabled):
+    processor = PowerGridDataProcessor()
+    data = processor.generate_sample_data(n_samples=2000)
+    cleaned = processor.clean_data(data)
+
+    record, = instrumentation.get_records()
+    assert record['stage'] == 'clean_data'
+    assert record['rows'] == len(cleaned)